@@ -0,0 +1,230 @@
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+# Module de logging commun aux services (document-processor, transaction-analyzer, orchestrator).
+# Installé dans chaque service (pip install libs/cashflow-logger), qui le réexporte sous son
+# chemin habituel (core/logger.py ou app/core/logger.py).
+#
+# Variables d'environnement :
+#   LOG_LEVEL   niveau minimal de la console (INFO par défaut)
+#   LOG_FORMAT  "text" (lisible, par défaut) ou "json" (une ligne JSON par message)
+#   LOG_DIR     dossier des fichiers app.log et error.log ("logs" par défaut)
+
+TEXT_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
+    "<level>{message}</level>"
+)
+
+
+def _json_format(record: Dict[str, Any]) -> str:
+    """Loguru format function writing one compact JSON object per record"""
+    entry = {
+        'time': record['time'].isoformat(timespec='milliseconds'),
+        'level': record['level'].name,
+        'logger': record['name'],
+        'function': record['function'],
+        'line': record['line'],
+        'process': record['process'].id,
+        'message': record['message'],
+    }
+    entry.update((key, value) for key, value in record['extra'].items() if key != '_json')
+    if record['exception'] is not None:
+        entry['exception'] = ''.join(traceback.format_exception(*record['exception']))
+    # Les accolades du JSON ne doivent pas être réinterprétées par loguru
+    record['extra']['_json'] = json.dumps(entry, ensure_ascii=False, default=str, separators=(',', ':'))
+    return "{extra[_json]}\n"
+
+
+class _CallSite:
+    __slots__ = ('calls', 'tokens', 'last', 'suppressed')
+
+    def __init__(self, rate: float):
+        self.calls = 0
+        self.tokens = max(1.0, rate)
+        self.last = time.monotonic()
+        self.suppressed = 0
+
+
+class StructuredLogger:
+    def __init__(self, level: Optional[str] = None, fmt: Optional[str] = None,
+                 log_dir: Optional[str] = None, console=None):
+        """Loguru wrapper shared by the services
+
+        Sinks are queue-backed (enqueue=True): the calling thread formats
+        the record and a background thread does the I/O. Levels are checked
+        before anything is formatted, and positional arguments are only
+        formatted when the record is kept:
+
+            log.debug("Parsed {} lines", count)          # rien n'est formaté au niveau INFO
+            log.info("Job done", job_id=job.id)           # champ structuré (JSON)
+            log.debug("Page {} OCR", page, sample=50)     # un appel sur 50 de ce site
+            log.warning("Queue full", rate=0.2)           # au plus un message toutes les 5 s
+
+        Args:
+            level: Console level (LOG_LEVEL, default INFO)
+            fmt: "text" or "json" (LOG_FORMAT, default text)
+            log_dir: Directory of app.log and error.log (LOG_DIR, default logs), "" for no files
+            console: Console stream (sys.stdout)
+        """
+        self._sites: Dict[Any, _CallSite] = {}
+        self._sites_lock = threading.Lock()
+        self.configure(level, fmt, log_dir, console)
+
+    def configure(self, level: Optional[str] = None, fmt: Optional[str] = None,
+                  log_dir: Optional[str] = None, console=None) -> None:
+        """(Re)configure the sinks, see __init__"""
+        self.level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+        self.json = (fmt or os.getenv("LOG_FORMAT", "text")).lower() == "json"
+        log_dir = os.getenv("LOG_DIR", "logs") if log_dir is None else log_dir
+
+        # Supprimer les handlers existants (et vider leurs files)
+        logger.remove()
+
+        sink_format = _json_format if self.json else TEXT_FORMAT
+        logger.add(
+            console or sys.stdout,
+            format=sink_format,
+            level=self.level,
+            colorize=None if not self.json else False,
+            backtrace=False,
+            diagnose=False,
+            enqueue=True,
+        )
+
+        # Fichiers avec rotation, INFO et erreurs séparées
+        file_levels = []
+        if log_dir:
+            Path(log_dir).mkdir(parents=True, exist_ok=True)
+            for name, file_level in (("app.log", "INFO"), ("error.log", "ERROR")):
+                logger.add(
+                    str(Path(log_dir) / name),
+                    format=sink_format,
+                    level=file_level,
+                    rotation="10 MB",
+                    compression="zip",
+                    retention="30 days",
+                    backtrace=False,
+                    diagnose=False,
+                    enqueue=True,
+                )
+                file_levels.append(file_level)
+
+        # Niveau minimal de tous les sinks : en dessous, un appel ne coûte qu'une comparaison
+        self._min_level = min(logger.level(name).no for name in [self.level] + file_levels)
+
+    def is_enabled(self, level: str) -> bool:
+        """True when a record of this level reaches at least one sink"""
+        return logger.level(level).no >= self._min_level
+
+    def complete(self) -> None:
+        """Wait until the queued records are written"""
+        logger.complete()
+
+    def _log(self, level: str, level_no: int, message: str, args: tuple, fields: Dict[str, Any],
+             sample: int = 1, rate: float = 0, exception: bool = False, depth: int = 2) -> None:
+        if level_no < self._min_level:
+            return
+        if sample > 1 or rate > 0:
+            # Site d'appel : appelant de info()/debug()...
+            frame = sys._getframe(depth)
+            suppressed = self._throttle((frame.f_code, frame.f_lineno), sample, rate)
+            if suppressed is None:
+                return
+            if suppressed:
+                fields['suppressed'] = suppressed
+        bound = logger.bind(**fields) if fields else logger
+        bound.opt(depth=depth, exception=exception).log(level, message, *args)
+
+    def _throttle(self, key, sample: int, rate: float) -> Optional[int]:
+        """Sampling and rate limiting of one call site
+
+        Returns:
+            None when the record is dropped, else the number of records
+            dropped at this call site since the last one kept
+        """
+        with self._sites_lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = _CallSite(rate)
+            site.calls += 1
+            if sample > 1 and (site.calls - 1) % sample:
+                site.suppressed += 1
+                return None
+            if rate > 0:
+                now = time.monotonic()
+                site.tokens = min(max(1.0, rate), site.tokens + (now - site.last) * rate)
+                site.last = now
+                if site.tokens < 1:
+                    site.suppressed += 1
+                    return None
+                site.tokens -= 1
+            suppressed, site.suppressed = site.suppressed, 0
+            return suppressed
+
+    def debug(self, message: str, *args, sample: int = 1, rate: float = 0, **fields) -> None:
+        self._log("DEBUG", 10, message, args, fields, sample, rate)
+
+    def info(self, message: str, *args, sample: int = 1, rate: float = 0, **fields) -> None:
+        self._log("INFO", 20, message, args, fields, sample, rate)
+
+    def warning(self, message: str, *args, sample: int = 1, rate: float = 0, **fields) -> None:
+        self._log("WARNING", 30, message, args, fields, sample, rate)
+
+    def error(self, message: str, *args, sample: int = 1, rate: float = 0, **fields) -> None:
+        self._log("ERROR", 40, message, args, fields, sample, rate)
+
+    def critical(self, message: str, *args, sample: int = 1, rate: float = 0, **fields) -> None:
+        self._log("CRITICAL", 50, message, args, fields, sample, rate)
+
+    def exception(self, message: str, *args, **fields) -> None:
+        self._log("ERROR", 40, message, args, fields, exception=True)
+
+    def log_request(self, request_data: Dict[str, Any]) -> None:
+        """Log a request on one line (its data as a field in JSON mode)"""
+        self._log_data("📥 Request", 'request', request_data)
+
+    def log_result(self, result_data: Dict[str, Any]) -> None:
+        """Log a result on one line (its data as a field in JSON mode)"""
+        self._log_data("📤 Result", 'result', result_data)
+
+    log_response = log_result
+
+    def _log_data(self, title: str, field: str, data: Dict[str, Any]) -> None:
+        if self._min_level > 20:
+            return
+        if self.json:
+            self._log("INFO", 20, title, (), {field: data}, depth=3)
+        else:
+            # {} formaté par loguru : les accolades du JSON ne sont pas réinterprétées
+            compact = json.dumps(data, ensure_ascii=False, default=str, separators=(',', ':'))
+            self._log("INFO", 20, title + " {}", (compact,), {}, depth=3)
+
+    def log_process_start(self, filename: str) -> None:
+        self._log("INFO", 20, "🚀 Starting processing of: {}", (filename,), {'filename': filename})
+
+    def log_process_end(self, filename: str, duration: float) -> None:
+        self._log("INFO", 20, "✨ Finished processing {} in {:.2f} seconds", (filename, duration),
+                  {'filename': filename, 'duration': round(duration, 3)})
+
+    def log_error(self, error: Exception, context: str = "") -> None:
+        if context:
+            self._log("ERROR", 40, "❌ Error in {}: {}", (context, error), {}, exception=True)
+        else:
+            self._log("ERROR", 40, "❌ Error: {}", (error,), {}, exception=True)
+
+
+# Alias des anciens noms de classe des services
+CustomLogger = Logger = StructuredLogger
+
+# Instance globale du logger
+log = StructuredLogger()
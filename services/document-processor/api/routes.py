@@ -1,14 +1,16 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from pathlib import Path
-import tempfile
-import shutil
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import re
+import cv2
 from core.logger import log
-from services.processor.processor import DocumentProcessor
-from core.config import ServiceConfig
+from services.jobs import Job, QueueFullError, WorkersUnavailableError, job_manager
 from services.ocr.extractor import OcrExtractor
-from services.tableau.extractor import TableauExtractor
-from doctr.models import ocr_predictor
-from time import time
+from services.ocr.models import Line
+from services.processor.models import ProcessedDocument
+from services.tableau.models import TableBox
+from services.tableau.visualizer import TableVisualizer
+from .uploads import UPLOAD_OPENAPI, PdfUpload, receive_pdf
 
 
 router = APIRouter(
@@ -16,78 +18,137 @@ router = APIRouter(
     tags=["Document"]
 )
 
-config = ServiceConfig()
 
-class PDFProcessor:
-    def __init__(self):
-        log.info("📦 Initializing PDFProcessor...")
-        device = config.tableau.torch_device
-        self.ocr_model = ocr_predictor(pretrained=True).to(device)
-        log.info(f"✅ OCR model loaded successfully on device: {device}")
+def _queue_full() -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Too many documents being processed, retry later",
+        headers={"Retry-After": str(job_manager.config.jobs.retry_after_seconds)}
+    )
 
-    def process_pdf(self, pdf_path: Path):
-        log.log_process_start(pdf_path.name)
-        start_time = time()
 
+async def _receive_upload(request: Request) -> Job:
+    """Stream the upload into a new job workspace and queue the job"""
+    document = job_manager.config.document
+    upload = PdfUpload(document.max_file_size, document.supported_formats, job_manager.create_job)
+
+    try:
         try:
-            tableau_extractor = TableauExtractor(config)
-            ocr_extractor = OcrExtractor(
-                ocr_model=self.ocr_model,
-                config=config
-            )
-            log.debug("🔧 Extractors initialized successfully")
-
-            processor = DocumentProcessor(
-                tableau_extractor=tableau_extractor,
-                ocr_extractor=ocr_extractor,
-                config=config
-            )
-
-            results = processor.process_document(pdf_path)
-            duration = time() - start_time
-            log.log_process_end(pdf_path.name, duration)
-
-            return results
-
-        except Exception as e:
-            log.log_error(e, f"processing {pdf_path.name}")
+            await receive_pdf(request, upload)
+            log.info("📝 Received file: {} ({} bytes)", upload.filename, upload.size)
+            job = await run_in_threadpool(job_manager.submit, upload.job, upload.content_hash)
+        except BaseException:
+            # Fichier refusé, file pleine ou client déconnecté : rien ne reste sur disque
+            if upload.job is not None:
+                job_manager.discard(upload.job)
             raise
+    except HTTPException as e:
+        log.warning("⚠️ Upload rejected ({}): {}", e.status_code, e.detail, rate=1)
+        raise
+    except QueueFullError:
+        log.warning("⚠️ Job queue full, rejecting: {}", upload.filename, rate=1)
+        raise _queue_full()
+    except WorkersUnavailableError:
+        raise HTTPException(status_code=503, detail="Models are not ready yet")
+
+    log.info(f"🗄️ Cache {job.cache_status} for {upload.filename} ({upload.content_hash[:12]})")
+    return job
+
+
+def _document_response(results: ProcessedDocument) -> dict:
+    response_data = {
+        "message": "PDF processed successfully",
+        "transactions": [t.__dict__ for t in results.transactions],
+        "transaction_count": len(results.transactions),
+        "page_count": results.page_count,
+        "processing_time": results.processing_time,
+        "timings": results.timings.to_dict() if results.timings is not None else None,
+    }
+    if results.artifacts_id:
+        response_data["artifacts_id"] = results.artifacts_id
+    return response_data
+
+
+@router.post("/jobs/", status_code=202, openapi_extra=UPLOAD_OPENAPI)
+async def create_job(request: Request, response: Response):
+    """Queue a PDF for processing, poll the returned job for its result"""
+    job = await _receive_upload(request)
+    response.headers["X-Cache"] = job.cache_status
+    response.headers["Location"] = f"{router.prefix}/jobs/{job.id}"
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status of a job, with its transactions once done"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+
+    job_data = job.to_dict()
+    if job.status == "done":
+        job_data["result"] = _document_response(job.result)
+    return job_data
+
+
+@router.post("/process/", openapi_extra=UPLOAD_OPENAPI)
+async def process_pdf(request: Request, response: Response):
+    job = await _receive_upload(request)
 
-@router.post("/process/")
-async def process_pdf(file: UploadFile = File(...)):
-    log.info(f"📝 Received file: {file.filename}")
+    try:
+        # Le traitement tourne dans un worker : la boucle d'événements reste libre
+        await asyncio.wrap_future(job.completed)
+    except Exception as e:
+        log.log_error(e, "API endpoint")
+        raise HTTPException(status_code=500)
 
-    if not file.filename.endswith('.pdf'):
-        log.warning(f"⚠️ Invalid file type: {file.filename}")
-        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    response.headers["X-Cache"] = job.cache_status
+    results = job.result
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-        shutil.copyfileobj(file.file, tmp)
-        pdf_path = Path(tmp.name)
+    if job.status == "done":
+        log.log_result({
+            "filename": job.filename,
+            "transaction_count": len(results.transactions)
+        })
+        return _document_response(results)
 
-    try:
+    if results is not None:
+        log.warning(f"⚠️ No transactions found in: {job.filename}")
+        raise HTTPException(status_code=400, detail="No transactions found in PDF",
+                            headers={"X-Cache": job.cache_status})
 
-        processor = PDFProcessor()
-        results = processor.process_pdf(pdf_path)
+    raise HTTPException(status_code=500)
 
-        if results and results.transactions:
-            response_data = {
-                "message": "PDF processed successfully",
-                "transactions": [t.__dict__ for t in results.transactions],
-                "transaction_count": len(results.transactions),
-            }
-            log.log_result({
-                "filename": file.filename,
-                "transaction_count": len(results.transactions)
-            })
-            return response_data
 
-        log.warning(f"⚠️ No transactions found in: {file.filename}")
-        raise HTTPException(status_code=400, detail="No transactions found in PDF")
+def _load_debug_page(artifacts_id: str, page_num: int):
+    """Open the saved artifacts of a page, 404 when they were not kept"""
+    if not re.fullmatch(r"[\w-]+", artifacts_id):
+        raise HTTPException(status_code=404, detail="Unknown artifacts id")
+
+    artifacts = job_manager.debug_artifacts(artifacts_id)
+    image = artifacts.load_page(page_num)
+    if image is None:
+        raise HTTPException(status_code=404, detail="No debug artifacts for this page")
+    return artifacts, image
+
+
+def _png_response(image) -> Response:
+    """Encode a BGR image the same way the page artifacts are written"""
+    _, png = cv2.imencode('.png', cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    return Response(content=png.tobytes(), media_type="image/png")
+
+
+@router.get("/debug/{artifacts_id}/pages/{page_num}/tables.png")
+async def debug_tables(artifacts_id: str, page_num: int):
+    """Draw the detected tables on a saved page, on demand"""
+    artifacts, image = _load_debug_page(artifacts_id, page_num)
+    boxes = [TableBox.from_coordinates(box) for box in artifacts.load_boxes(page_num) or []]
+    return _png_response(TableVisualizer().draw_detections(image, boxes))
 
-    except Exception as e:
-        log.log_error(e, "API endpoint")
-        raise HTTPException(status_code=500)
-    finally:
-        pdf_path.unlink()
 
+@router.get("/debug/{artifacts_id}/pages/{page_num}/lines.png")
+async def debug_lines(artifacts_id: str, page_num: int):
+    """Draw the OCR lines on a saved page, on demand"""
+    artifacts, image = _load_debug_page(artifacts_id, page_num)
+    lines = [Line.from_dict(line) for line in artifacts.load_lines(page_num) or []]
+    return _png_response(OcrExtractor.visualize_lines(image, lines))
@@ -0,0 +1,184 @@
+import hashlib
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from services.jobs import Job
+
+# Un PDF commence par "%PDF-" suivi de la version
+PDF_MAGIC = b"%PDF-"
+# Marge pour les en-têtes multipart autour du fichier, dans le Content-Length déclaré
+MULTIPART_OVERHEAD = 16 * 1024
+# Champ du formulaire portant le fichier
+FILE_FIELD = "file"
+
+# Schéma OpenAPI du corps lu en flux (les routes ne déclarent plus de paramètre UploadFile)
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": [FILE_FIELD],
+                    "properties": {FILE_FIELD: {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+def too_large(max_size: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File exceeds {max_size // (1024 * 1024)} MB")
+
+
+class PdfUpload:
+    def __init__(self, max_size: int, supported_formats: List[str], create_job: Callable[[str], Job]):
+        """Receive an uploaded PDF chunk by chunk
+
+        The name is checked from the part headers and the %PDF magic from
+        the first bytes, before the job and its file exist: nothing is
+        written for a rejected file. The size limit is enforced and the
+        SHA-256 computed as the chunks arrive.
+
+        Args:
+            max_size: Largest accepted file, in bytes
+            supported_formats: Accepted file extensions
+            create_job: Allocates the job the file is written to, from the file name
+        """
+        self.max_size = max_size
+        self.supported_formats = supported_formats
+        self.create_job = create_job
+        self.filename: Optional[str] = None
+        self.job: Optional[Job] = None
+        self.size = 0
+        self.complete = False
+        self._digest = hashlib.sha256()
+        self._head = b""
+        self._file: Optional[BinaryIO] = None
+
+    @property
+    def content_hash(self) -> str:
+        return self._digest.hexdigest()
+
+    def start(self, filename: str) -> None:
+        """Check the name of the uploaded file"""
+        if self.filename is not None:
+            raise HTTPException(status_code=400, detail="Only one file per upload")
+        if Path(filename).suffix.lower() not in self.supported_formats:
+            raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+        self.filename = filename
+
+    def write(self, data: bytes) -> None:
+        """Add a chunk of the file"""
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise too_large(self.max_size)
+        self._digest.update(data)
+
+        if self._file is None:
+            # Garder les premiers octets tant que la signature n'est pas complète
+            self._head += data
+            if len(self._head) < len(PDF_MAGIC):
+                return
+            self._open()
+            data, self._head = self._head, b""
+        self._file.write(data)
+
+    def finish(self) -> None:
+        """End of the file part"""
+        if self._file is None:
+            # Fichier plus court que la signature
+            self._open()
+            self._file.write(self._head)
+        self.close()
+        self.complete = True
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+    def _open(self) -> None:
+        if not self._head.startswith(PDF_MAGIC):
+            raise HTTPException(status_code=400, detail="File is not a PDF")
+        self.job = self.create_job(self.filename)
+        self._file = open(self.job.pdf_path, 'wb')
+
+
+async def receive_pdf(request: Request, upload: PdfUpload) -> None:
+    """Stream the file field of a multipart request into an upload
+
+    The body is parsed as it arrives from the client, nothing is spooled
+    before the checks of PdfUpload: an oversized or invalid file is
+    rejected before any byte hits disk. A Content-Length that cannot fit
+    the limit is rejected before the body is read.
+
+    Raises:
+        HTTPException: 400 for a malformed request or an invalid file,
+                       413 for a file over the size limit
+    """
+    declared = request.headers.get('content-length', '')
+    if declared.isdigit() and int(declared) > upload.max_size + MULTIPART_OVERHEAD:
+        raise too_large(upload.max_size)
+
+    content_type, params = parse_options_header(request.headers.get('content-type', ''))
+    if content_type != b'multipart/form-data' or b'boundary' not in params:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+    part: Dict[str, object] = {}
+    header_field = bytearray()
+    header_value = bytearray()
+
+    def on_part_begin() -> None:
+        part.clear()
+        part['headers'] = {}
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        header_field.extend(data[start:end])
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        header_value.extend(data[start:end])
+
+    def on_header_end() -> None:
+        part['headers'][bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished() -> None:
+        _, disposition = parse_options_header(part['headers'].get(b'content-disposition', b''))
+        part['is_file'] = disposition.get(b'name') == FILE_FIELD.encode() and b'filename' in disposition
+        if part['is_file']:
+            upload.start(disposition[b'filename'].decode('utf-8', 'replace'))
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        if part.get('is_file'):
+            upload.write(data[start:end])
+
+    def on_part_end() -> None:
+        if part.get('is_file'):
+            upload.finish()
+
+    parser = MultipartParser(params[b'boundary'], {
+        'on_part_begin': on_part_begin,
+        'on_header_field': on_header_field,
+        'on_header_value': on_header_value,
+        'on_header_end': on_header_end,
+        'on_headers_finished': on_headers_finished,
+        'on_part_data': on_part_data,
+        'on_part_end': on_part_end,
+    })
+
+    try:
+        async for chunk in request.stream():
+            # Hachage et écriture hors de la boucle d'événements
+            await run_in_threadpool(parser.write, chunk)
+        parser.finalize()
+    finally:
+        upload.close()
+
+    if not upload.complete:
+        raise HTTPException(status_code=400, detail=f"Missing '{FILE_FIELD}' PDF file")
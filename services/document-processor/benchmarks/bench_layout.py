@@ -0,0 +1,61 @@
+"""Micro-benchmark of the OCR layout analysis
+
+Usage (from services/document-processor):
+    python -m benchmarks.bench_layout --lines 40 80 160 --repeat 20
+"""
+import argparse
+import random
+import timeit
+from typing import List
+
+from core.config import ServiceConfig
+from services.ocr.layout import LayoutAnalyzer
+from services.ocr.models import BoundingBox, Word
+
+
+def make_table(line_count: int, seed: int = 0) -> List[Word]:
+    """Words of a synthetic statement table: date, two label words, amount per line"""
+    rng = random.Random(seed)
+    words = [Word("DEBIT", 0.99, BoundingBox(1500, 20, 1600, 45))]
+    for line in range(line_count):
+        y = 60 + line * 30 + rng.randint(-3, 3)
+        cells = [
+            (f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}", 40),
+            ("PAIEMENT", 300),
+            ("CB", 420),
+            (f"{rng.randint(1, 999)},{rng.randint(0, 99):02d}", 1500 + rng.randint(-5, 5)),
+        ]
+        for text, x in cells:
+            words.append(Word(text, rng.uniform(0.8, 1.0), BoundingBox(x, y, x + 12 * len(text), y + 22)))
+    rng.shuffle(words)
+    return words
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, nargs="+", default=[40, 80, 160], help="Lines per table")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per measure")
+    args = parser.parse_args()
+
+    layout = LayoutAnalyzer(ServiceConfig())
+    print(f"{'lines':>6} {'words':>6} {'analyze ms':>11} {'group_lines ms':>15} {'merge_words ms':>15}")
+    for line_count in args.lines:
+        words = make_table(line_count)
+        texts, boxes, confidences = layout.to_arrays(words)
+        assert len(layout.build_lines(texts, boxes, confidences)) == line_count + 1
+
+        timings = [
+            min(timeit.repeat(call, number=1, repeat=args.repeat)) * 1000
+            for call in (
+                lambda: layout.analyze(words),
+                lambda: layout.group_lines(words),
+                lambda: layout.merge_words(words),
+            )
+        ]
+        print(f"{line_count:>6} {len(words):>6} " + " ".join(
+            f"{timing:>{width}.3f}" for timing, width in zip(timings, (11, 15, 15))
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Logging cost per processed page, previous logger against core.logger
+
+The previous logger wrote synchronously (enqueue=False) to a colourised
+DEBUG console and two files, every message formatted eagerly, one debug line
+per transaction and results dumped with json.dumps(indent=2). The current one
+queues the records, checks levels before formatting and samples transactions.
+
+Both write to a temporary directory, the console going to /dev/null. The
+"caller" column is the time spent in the processing thread, "drained" adds
+the wait for the queued records to be written.
+
+Usage (from services/document-processor):
+    python -m benchmarks.bench_logging --pages 50 --transactions 40
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from loguru import logger
+
+from core.logger import TEXT_FORMAT, StructuredLogger
+
+
+def make_page(transaction_count: int) -> List[Dict]:
+    """Transactions of a synthetic page"""
+    return [
+        {'date': date(2024, 1, 1 + index % 28), 'description': f"PAIEMENT CB MAGASIN {index}",
+         'amount': -12.5 - index}
+        for index in range(transaction_count)
+    ]
+
+
+def configure_legacy(log_dir: Path, console) -> None:
+    """Sinks of the previous CustomLogger"""
+    logger.remove()
+    logger.add(console, format=TEXT_FORMAT, level="DEBUG", colorize=True)
+    for name, level in (("app.log", "INFO"), ("error.log", "ERROR")):
+        logger.add(str(log_dir / name), format=TEXT_FORMAT, level=level, rotation="10 MB",
+                   compression="zip", retention="30 days", backtrace=False, diagnose=False, enqueue=False)
+
+
+def legacy_page(page_num: int, transactions: List[Dict]) -> None:
+    """Calls made for one page with the previous logger"""
+    logger.info(f"📄 Processing page {page_num}")
+    for transaction in transactions:
+        logger.debug(f"Transaction trouvée: Date={transaction['date'].strftime('%d.%m.%Y')}, "
+                     f"Libellé={transaction['description']}, Montant={transaction['amount']}")
+    logger.debug(f"Pipeline stats: {{'ocr': {{'items': {page_num}}}}}")
+    logger.info("\n" + "=" * 50 + " RESULT " + "=" * 50 + "\n{}".format(
+        json.dumps({'page': page_num, 'transactions': transactions}, indent=2, default=str)
+    ))
+
+
+def current_page(log: StructuredLogger, sample_every: int) -> Callable[[int, List[Dict]], None]:
+    """Calls made for one page with core.logger"""
+    def page(page_num: int, transactions: List[Dict]) -> None:
+        log.info("📄 Processing page {}", page_num)
+        if log.is_enabled("DEBUG"):
+            for transaction in transactions[::sample_every]:
+                log.debug("Transaction trouvée: Date={:%d.%m.%Y}, Libellé={}, Montant={}",
+                          transaction['date'], transaction['description'], transaction['amount'])
+        log.debug("Pipeline stats: {}", {'ocr': {'items': page_num}})
+        log.log_result({'page': page_num, 'transactions': transactions})
+    return page
+
+
+def measure(page: Callable[[int, List[Dict]], None], pages: int, transactions: List[Dict]):
+    """Caller and drained time per page, in milliseconds"""
+    start = time.perf_counter()
+    for page_num in range(pages):
+        page(page_num, transactions)
+    caller = time.perf_counter() - start
+    logger.complete()
+    drained = time.perf_counter() - start
+    return caller * 1000 / pages, drained * 1000 / pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=50, help="Pages per run")
+    parser.add_argument("--transactions", type=int, default=40, help="Transactions per page")
+    parser.add_argument("--sample-every", type=int, default=100, help="parser.log_sample_every")
+    args = parser.parse_args()
+
+    transactions = make_page(args.transactions)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w') as devnull:
+        (Path(tmp) / "legacy").mkdir()
+        configure_legacy(Path(tmp) / "legacy", devnull)
+        results.append(("previous (sync, DEBUG)", *measure(legacy_page, args.pages, transactions)))
+
+        log = StructuredLogger(level="INFO", fmt="text", log_dir=str(Path(tmp) / "text"), console=devnull)
+        results.append(("core.logger text INFO", *measure(current_page(log, args.sample_every),
+                                                         args.pages, transactions)))
+        log.configure(level="INFO", fmt="json", log_dir=str(Path(tmp) / "json"), console=devnull)
+        results.append(("core.logger json INFO", *measure(current_page(log, args.sample_every),
+                                                         args.pages, transactions)))
+        log.configure(level="DEBUG", fmt="text", log_dir=str(Path(tmp) / "debug"), console=devnull)
+        results.append(("core.logger text DEBUG", *measure(current_page(log, args.sample_every),
+                                                          args.pages, transactions)))
+        logger.remove()
+
+    print(f"{args.pages} pages, {args.transactions} transactions per page", file=sys.stderr)
+    print(f"{'logger':<24} {'caller ms/page':>15} {'drained ms/page':>16}")
+    for name, caller, drained in results:
+        print(f"{name:<24} {caller:>15.3f} {drained:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
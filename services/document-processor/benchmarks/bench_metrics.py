@@ -0,0 +1,39 @@
+"""Cost of one metrics observation, to keep /metrics collection on in production
+
+Usage (from services/document-processor):
+    python -m benchmarks.bench_metrics --number 200000
+"""
+import argparse
+import timeit
+
+from core.metrics import MetricsRegistry
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200000, help="Calls per measure")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measure")
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    histogram = registry.histogram("bench_seconds", "Benchmark histogram", ("stage",)).labels("ocr")
+    counter = registry.counter("bench", "Benchmark counter")
+
+    def timed_block():
+        with histogram.time():
+            pass
+
+    calls = {
+        "histogram.observe": lambda: histogram.observe(0.3),
+        "counter.inc": counter.inc,
+        "histogram.time block": timed_block,
+        "empty call": lambda: None,
+    }
+    print(f"{'call':<22} {'ns/call':>8}")
+    for name, call in calls.items():
+        seconds = min(timeit.repeat(call, number=args.number, repeat=args.repeat))
+        print(f"{name:<22} {seconds / args.number * 1e9:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
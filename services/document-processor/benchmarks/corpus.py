@@ -0,0 +1,280 @@
+"""Synthetic bank statements with their ground truth, for benchmarks.score
+
+Each statement is a PDF rendered with reportlab (pip install reportlab):
+a header with the statement period, then a DATE / LIBELLE / DEBIT / CREDIT
+table over several pages, with dd.mm dates, French formatted amounts
+("1 234,56") and balance lines. Noise pages without transactions (terms
+and conditions, advertising) are inserted among them, and a share of the
+statements is degraded to look scanned: pages turned into noisy, slightly
+rotated and blurred JPEG images, with no text layer left.
+
+Next to each statement, <name>.json holds the transactions it contains;
+manifest.json lists the statements of the corpus.
+
+Usage (from services/document-processor):
+    python -m benchmarks.corpus --out /tmp/corpus --documents 20 --pages 4 --scanned 0.5
+"""
+import argparse
+import calendar
+import io
+import json
+import random
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+import pypdfium2 as pdfium
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+
+# Colonnes du tableau, en points depuis la gauche (montants alignés à droite)
+DATE_X = 50
+LABEL_X = 110
+DEBIT_RIGHT_X = 450
+CREDIT_RIGHT_X = 540
+ROW_HEIGHT = 17
+TABLE_TOP = 160
+TABLE_BOTTOM = 780
+
+DEBITS = [
+    ("PAIEMENT CB CARREFOUR {city}", 8, 180), ("PAIEMENT CB MONOPRIX {city}", 5, 90),
+    ("PAIEMENT CB SNCF INTERNET", 20, 240), ("PAIEMENT CB PHARMACIE {city}", 4, 60),
+    ("PRLV SEPA EDF", 40, 160), ("PRLV SEPA FREE MOBILE", 10, 30), ("PRLV SEPA ASSURANCE HABITATION", 15, 45),
+    ("RETRAIT DAB {city}", 20, 200), ("VIREMENT LOYER", 600, 1400), ("CHEQUE {cheque}", 30, 900),
+    ("FRAIS TENUE DE COMPTE", 2, 9),
+]
+CREDITS = [
+    ("VIREMENT SALAIRE", 1600, 3800), ("VIREMENT CAF", 90, 400), ("REMBOURSEMENT CPAM", 10, 120),
+    ("VIREMENT RECU {name}", 20, 500), ("REMISE CHEQUE {cheque}", 30, 600),
+]
+CITIES = ["PARIS", "LYON", "NANTES", "LILLE", "RENNES", "BORDEAUX"]
+NAMES = ["DUPONT", "MARTIN", "BERNARD", "PETIT", "DURAND"]
+NOISE_LINES = [
+    "CONDITIONS GENERALES DE BANQUE",
+    "Les operations sont portees au compte selon les dates de valeur en vigueur.",
+    "Toute reclamation doit etre adressee a votre agence dans un delai de 2 mois.",
+    "Taux annuel effectif global du decouvert autorise : 16,50 %",
+    "Votre conseiller est joignable du lundi au vendredi de 9h a 18h.",
+    "Offre epargne : jusqu'a 3,00 % brut pendant 3 mois sur votre livret.",
+    "Garantie des depots : 100 000 euros par deposant et par etablissement.",
+]
+
+
+@dataclass
+class TruthTransaction:
+    page: int
+    date: str
+    description: str
+    amount: float
+
+
+def format_amount(amount: float) -> str:
+    """French formatted amount, without sign: 1234.5 -> "1 234,50" """
+    whole, cents = f"{abs(amount):.2f}".split(".")
+    groups = []
+    while len(whole) > 3:
+        whole, group = whole[:-3], whole[-3:]
+        groups.insert(0, group)
+    return " ".join([whole] + groups) + "," + cents
+
+
+def make_transactions(rng: random.Random, count: int, year: int, month: int) -> List[Tuple[date, str, float]]:
+    """Transactions of one month, sorted by date (about one credit for four debits)"""
+    days = calendar.monthrange(year, month)[1]
+    transactions = []
+    for _ in range(count):
+        is_credit = rng.random() < 0.2
+        template, low, high = rng.choice(CREDITS if is_credit else DEBITS)
+        description = template.format(city=rng.choice(CITIES), name=rng.choice(NAMES),
+                                      cheque=rng.randint(1000000, 9999999))
+        amount = round(rng.uniform(low, high), 2)
+        transactions.append((date(year, month, rng.randint(1, days)), description, amount if is_credit else -amount))
+    return sorted(transactions, key=lambda transaction: transaction[0])
+
+
+def draw_header(pdf: canvas.Canvas, page: int, year: int, month: int) -> None:
+    """Bank, page number and period lines at the top of a page"""
+    last_day = calendar.monthrange(year, month)[1]
+    pdf.setFont("Helvetica-Bold", 12)
+    pdf.drawString(DATE_X, 60, "BANQUE EXEMPLE")
+    pdf.setFont("Helvetica", 10)
+    pdf.drawRightString(CREDIT_RIGHT_X, 60, f"Page {page + 1}")
+    pdf.drawString(DATE_X, 80, f"Releve de compte du 01.{month:02d}.{year} au {last_day}.{month:02d}.{year}")
+    pdf.drawString(DATE_X, 96, "Compte courant n 00012345678")
+
+
+def draw_table_header(pdf: canvas.Canvas, y: float) -> None:
+    pdf.setFont("Helvetica-Bold", 10)
+    pdf.drawString(DATE_X, y, "DATE")
+    pdf.drawString(LABEL_X, y, "LIBELLE")
+    pdf.drawRightString(DEBIT_RIGHT_X, y, "DEBIT")
+    pdf.drawRightString(CREDIT_RIGHT_X, y, "CREDIT")
+    pdf.setFont("Helvetica", 10)
+
+
+def draw_noise_page(pdf: canvas.Canvas, rng: random.Random) -> None:
+    """A page without transactions: terms, rates and advertising"""
+    pdf.setFont("Helvetica-Bold", 12)
+    pdf.drawString(DATE_X, 80, NOISE_LINES[0])
+    pdf.setFont("Helvetica", 10)
+    y = 120
+    for _ in range(rng.randint(15, 35)):
+        pdf.drawString(DATE_X, y, rng.choice(NOISE_LINES[1:]))
+        y += ROW_HEIGHT
+
+
+def render_statement(path: Path, rng: random.Random, pages: int, noise_pages: int,
+                     year: int, month: int) -> List[TruthTransaction]:
+    """Write one statement and return its transactions
+
+    Args:
+        path: PDF to write
+        rng: Random generator of the statement
+        pages: Pages carrying transactions
+        noise_pages: Pages without transactions, inserted at random positions
+        year: Statement year
+        month: Statement month
+
+    Returns:
+        The transactions, in reading order
+    """
+    rows_per_page = int((TABLE_BOTTOM - TABLE_TOP) // ROW_HEIGHT) - 3
+    counts = [rng.randint(rows_per_page // 2, rows_per_page) for _ in range(pages)]
+    transactions = make_transactions(rng, sum(counts), year, month)
+    layout = ["table"] * pages
+    for _ in range(noise_pages):
+        layout.insert(rng.randint(1, len(layout)), "noise")
+
+    # Coordonnées reportlab depuis le bas de la page : les lignes sont placées depuis le haut
+    pdf = canvas.Canvas(str(path), pagesize=A4, bottomup=0)
+    truth = []
+    balance = round(rng.uniform(200, 5000), 2)
+    next_transaction = 0
+    table_page = 0
+    for page, kind in enumerate(layout):
+        draw_header(pdf, page, year, month)
+        if kind == "noise":
+            draw_noise_page(pdf, rng)
+            pdf.showPage()
+            continue
+
+        draw_table_header(pdf, TABLE_TOP - ROW_HEIGHT)
+        y = TABLE_TOP
+        label = "SOLDE PRECEDENT" if table_page == 0 else "REPORT"
+        pdf.drawString(LABEL_X, y, label)
+        pdf.drawRightString(CREDIT_RIGHT_X, y, format_amount(balance))
+        y += ROW_HEIGHT
+
+        for transaction_date, description, amount in transactions[next_transaction:next_transaction + counts[table_page]]:
+            pdf.drawString(DATE_X, y, transaction_date.strftime("%d.%m"))
+            pdf.drawString(LABEL_X, y, description)
+            pdf.drawRightString(DEBIT_RIGHT_X if amount < 0 else CREDIT_RIGHT_X, y, format_amount(amount))
+            truth.append(TruthTransaction(page, transaction_date.isoformat(), description, amount))
+            balance = round(balance + amount, 2)
+            y += ROW_HEIGHT
+
+        pdf.setFont("Helvetica-Bold", 10)
+        pdf.drawString(LABEL_X, y + ROW_HEIGHT, "NOUVEAU SOLDE" if table_page == pages - 1 else "A REPORTER")
+        pdf.drawRightString(CREDIT_RIGHT_X, y + ROW_HEIGHT, format_amount(balance))
+        next_transaction += counts[table_page]
+        table_page += 1
+        pdf.showPage()
+
+    pdf.save()
+    return truth
+
+
+def degrade(image: np.ndarray, rng: random.Random) -> np.ndarray:
+    """Scanned look: grayscale, slight rotation, blur and sensor noise"""
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    height, width = gray.shape
+    rotation = cv2.getRotationMatrix2D((width / 2, height / 2), rng.uniform(-0.8, 0.8), 1.0)
+    gray = cv2.warpAffine(gray, rotation, (width, height), borderValue=255)
+    gray = cv2.GaussianBlur(gray, (3, 3), rng.uniform(0.3, 0.9))
+    noise = np.random.default_rng(rng.randint(0, 2 ** 32 - 1)).normal(0, 12, gray.shape)
+    return np.clip(gray.astype(np.float32) + noise - 8, 0, 255).astype(np.uint8)
+
+
+def scan(path: Path, rng: random.Random, dpi: int = 150, quality: int = 60) -> None:
+    """Replace a PDF by degraded JPEG images of its pages, without text layer"""
+    source = pdfium.PdfDocument(str(path))
+    try:
+        images = [np.asarray(page.render(scale=dpi / 72).to_pil().convert("RGB")) for page in source]
+    finally:
+        source.close()
+
+    pdf = canvas.Canvas(str(path), pagesize=A4)
+    for image in images:
+        _, jpeg = cv2.imencode(".jpg", degrade(image, rng), [cv2.IMWRITE_JPEG_QUALITY, quality])
+        pdf.drawImage(ImageReader(io.BytesIO(jpeg.tobytes())), 0, 0, PAGE_WIDTH, PAGE_HEIGHT)
+        pdf.showPage()
+    pdf.save()
+
+
+def generate(out_dir: Path, documents: int, pages: int, noise_pages: int = 1,
+             scanned: float = 0.0, seed: int = 0) -> Dict:
+    """Write a corpus of statements, their ground truth and the manifest
+
+    Args:
+        out_dir: Corpus folder (created if needed)
+        documents: Number of statements
+        pages: Pages with transactions per statement
+        noise_pages: Pages without transactions per statement
+        scanned: Share of the statements degraded to look scanned
+        seed: Seed of the corpus, the same seed gives the same corpus
+
+    Returns:
+        The manifest
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    entries = []
+    for index in range(documents):
+        name = f"statement_{index:03d}"
+        year, month = rng.randint(2022, 2025), rng.randint(1, 12)
+        pdf_path = out_dir / f"{name}.pdf"
+        transactions = render_statement(pdf_path, rng, pages, noise_pages, year, month)
+        is_scanned = rng.random() < scanned
+        if is_scanned:
+            scan(pdf_path, rng)
+
+        truth = {
+            'pdf': pdf_path.name,
+            'pages': pages + noise_pages,
+            'scanned': is_scanned,
+            'transactions': [asdict(transaction) for transaction in transactions],
+        }
+        (out_dir / f"{name}.json").write_text(json.dumps(truth, indent=1, ensure_ascii=False))
+        entries.append({'name': name, 'pdf': pdf_path.name, 'truth': f"{name}.json",
+                        'pages': truth['pages'], 'transactions': len(transactions), 'scanned': is_scanned})
+
+    manifest = {'seed': seed, 'documents': entries}
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=1))
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", type=Path, required=True, help="Corpus folder")
+    parser.add_argument("--documents", type=int, default=20, help="Number of statements")
+    parser.add_argument("--pages", type=int, default=4, help="Pages with transactions per statement")
+    parser.add_argument("--noise-pages", type=int, default=1, help="Pages without transactions per statement")
+    parser.add_argument("--scanned", type=float, default=0.0, help="Share of scanned-looking statements (0-1)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    args = parser.parse_args()
+
+    manifest = generate(args.out, args.documents, args.pages, args.noise_pages, args.scanned, args.seed)
+    documents = manifest['documents']
+    print(f"{len(documents)} statements, {sum(entry['pages'] for entry in documents)} pages, "
+          f"{sum(entry['transactions'] for entry in documents)} transactions "
+          f"({sum(entry['scanned'] for entry in documents)} scanned) in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
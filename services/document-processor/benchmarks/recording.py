@@ -0,0 +1,200 @@
+"""Recorded YOLO and doctr outputs, replayed by stub models in the benchmarks
+
+A recording holds, for each page of a PDF, the table boxes found by the
+detection model and the words the OCR model read in each table crop, so the
+pipeline around the models runs without downloading them.
+
+Record from the real models (needs the model weights):
+    python -m benchmarks.recording --pdf statement.pdf --out benchmarks/fixtures/statement.json --models
+
+Without --models, detections and words are derived from the PDF text layer
+(one table around the words of each page), in the same format.
+"""
+import argparse
+import json
+import os
+import random
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from core.config import ServiceConfig
+from services.ocr.text_layer import TextLayerExtractor
+from services.tableau.rasterizer import PdfiumRasterizer
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+class _Tensor:
+    """The part of a torch tensor the detection post-processing uses"""
+
+    def __init__(self, array: np.ndarray):
+        self.array = array
+
+    def cpu(self) -> '_Tensor':
+        return self
+
+    def numpy(self) -> np.ndarray:
+        return self.array
+
+
+class RecordedTableModel:
+    def __init__(self, detections: Sequence[Sequence[Sequence[float]]]):
+        """Stand-in for the YOLO model, replaying recorded boxes
+
+        Each call returns the boxes of the next recorded pages, in order,
+        starting over after the last one.
+
+        Args:
+            detections: Table boxes [x1, y1, x2, y2] of each page
+        """
+        self.results = [
+            SimpleNamespace(boxes=SimpleNamespace(xyxy=_Tensor(np.asarray(boxes, dtype=np.float32).reshape(-1, 4))))
+            for boxes in detections
+        ]
+        self._next = 0
+
+    def __call__(self, images) -> List[Any]:
+        count = len(images) if isinstance(images, list) else 1
+        results = [self.results[(self._next + index) % len(self.results)] for index in range(count)]
+        self._next = (self._next + count) % len(self.results)
+        return results
+
+
+class RecordedOcrModel:
+    def __init__(self, crops: Sequence[Sequence[Dict[str, Any]]]):
+        """Stand-in for the doctr predictor, replaying recorded words
+
+        Each crop sent to the model gets the words of the next recorded
+        crop, in order, starting over after the last one.
+
+        Args:
+            crops: Words of each crop: value, confidence and geometry
+                   [x1, y1, x2, y2] relative to the crop
+        """
+        self.pages = [
+            SimpleNamespace(blocks=[SimpleNamespace(lines=[SimpleNamespace(words=[
+                SimpleNamespace(value=word['value'], confidence=word['confidence'],
+                                geometry=(tuple(word['geometry'][:2]), tuple(word['geometry'][2:])))
+                for word in words
+            ])])])
+            for words in crops
+        ]
+        self._next = 0
+
+    def __call__(self, crops: List[np.ndarray]) -> SimpleNamespace:
+        pages = [self.pages[(self._next + index) % len(self.pages)] for index in range(len(crops))]
+        self._next = (self._next + len(crops)) % len(self.pages)
+        return SimpleNamespace(pages=pages)
+
+
+def load(path: Path) -> Dict[str, Any]:
+    """Load a recording, the PDF path resolved next to it"""
+    recording = json.loads(Path(path).read_text())
+    recording['pdf_path'] = Path(path).parent / recording['pdf']
+    return recording
+
+
+def table_model(recording: Dict[str, Any]) -> RecordedTableModel:
+    return RecordedTableModel([page['tables'] for page in recording['pages']])
+
+
+def ocr_model(recording: Dict[str, Any]) -> RecordedOcrModel:
+    return RecordedOcrModel([crop for page in recording['pages'] for crop in page['crops']])
+
+
+def record(pdf_path: Path, config: ServiceConfig, table_model: Optional[Any] = None,
+           ocr_model: Optional[Any] = None, seed: int = 0) -> Dict[str, Any]:
+    """Record the detections and OCR words of every page of a PDF
+
+    Args:
+        pdf_path: Document to record
+        config: Service configuration (rendering dpi)
+        table_model: YOLO model, None to derive the tables from the text layer
+        ocr_model: doctr predictor, None to derive the words from the text layer
+        seed: Seed of the synthetic OCR confidences
+    """
+    rasterizer = PdfiumRasterizer(config.rasterizer)
+    images = rasterizer.render_range(pdf_path, 1, rasterizer.page_count(pdf_path))
+    text_pages = TextLayerExtractor(config).extract_document(pdf_path)
+    rng = random.Random(seed)
+
+    pages = []
+    for image, text_page in zip(images, text_pages):
+        height, width = image.shape[:2]
+        if table_model is not None:
+            tables = table_model(image)[0].boxes.xyxy.cpu().numpy().tolist()
+        elif text_page is not None:
+            tables = [_words_extent(text_page.words, width, height)]
+        else:
+            tables = []
+
+        crops = []
+        for x1, y1, x2, y2 in tables:
+            x1, y1, x2, y2 = map(int, (x1, y1, x2, y2))
+            if ocr_model is not None:
+                crops.append(_export_words(ocr_model([image[y1:y2, x1:x2]]).pages[0]))
+                continue
+            crops.append([
+                {'value': word.text, 'confidence': round(rng.uniform(0.85, 1.0), 4),
+                 'geometry': [round((word.bbox.x1 - x1) / (x2 - x1), 6), round((word.bbox.y1 - y1) / (y2 - y1), 6),
+                              round((word.bbox.x2 - x1) / (x2 - x1), 6), round((word.bbox.y2 - y1) / (y2 - y1), 6)]}
+                for word in (text_page.words if text_page is not None else [])
+                if x1 <= word.bbox.x1 and word.bbox.x2 <= x2 and y1 <= word.bbox.y1 and word.bbox.y2 <= y2
+            ])
+        pages.append({'size': [height, width], 'tables': tables, 'crops': crops})
+
+    return {
+        'pdf': Path(pdf_path).name,
+        'dpi': config.rasterizer.dpi,
+        'source': "models" if table_model is not None or ocr_model is not None else "text_layer",
+        'pages': pages,
+    }
+
+
+def _words_extent(words, width: int, height: int, margin: int = 10) -> List[float]:
+    """Box around the words of a page, as a table detection"""
+    return [
+        float(max(0, min(word.bbox.x1 for word in words) - margin)),
+        float(max(0, min(word.bbox.y1 for word in words) - margin)),
+        float(min(width, max(word.bbox.x2 for word in words) + margin)),
+        float(min(height, max(word.bbox.y2 for word in words) + margin)),
+    ]
+
+
+def _export_words(page) -> List[Dict[str, Any]]:
+    """Words of a doctr page in the recording format"""
+    return [
+        {'value': word.value, 'confidence': float(word.confidence),
+         'geometry': [float(word.geometry[0][0]), float(word.geometry[0][1]),
+                      float(word.geometry[1][0]), float(word.geometry[1][1])]}
+        for block in page.blocks for line in block.lines for word in line.words
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", type=Path, default=FIXTURES_DIR / "statement.pdf", help="Document to record")
+    parser.add_argument("--out", type=Path, default=FIXTURES_DIR / "statement.json", help="Recording to write")
+    parser.add_argument("--models", action="store_true", help="Record the real YOLO and doctr outputs")
+    args = parser.parse_args()
+
+    config = ServiceConfig()
+    table, ocr = None, None
+    if args.models:
+        from doctr.models import ocr_predictor
+        from services.tableau.model_handler import ModelHandler
+
+        table = ModelHandler(config).model
+        ocr = ocr_predictor(pretrained=True).to(config.tableau.torch_device)
+
+    recording = record(args.pdf, config, table, ocr)
+    recording['pdf'] = os.path.relpath(args.pdf, args.out.parent)
+    args.out.write_text(json.dumps(recording, separators=(',', ':')))
+    print(f"Recorded {len(recording['pages'])} pages ({recording['source']}) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
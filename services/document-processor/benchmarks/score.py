@@ -0,0 +1,167 @@
+"""End-to-end throughput and extraction quality on a synthetic corpus
+
+Runs DocumentProcessor.process_document on every statement of a corpus
+written by benchmarks.corpus and reports, together, the throughput
+(pages/s and transactions/s, transactions of the ground truth) and the
+quality of the extraction (precision and recall). An extracted transaction
+is correct when a transaction of the ground truth has the same date and
+amount; each one is matched once. Descriptions of the matched transactions
+are compared separately, spaces and case ignored.
+
+The models are loaded as in the service (model weights required).
+--min-precision and --min-recall fail the run (exit code 1) below a level.
+
+Usage (from services/document-processor):
+    python -m benchmarks.corpus --out /tmp/corpus --documents 20 --scanned 0.5
+    python -m benchmarks.score /tmp/corpus --min-recall 0.95
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from core.logger import log
+from services.processor.models import Transaction
+
+
+def _key(transaction_date: str, amount: float) -> Tuple[str, float]:
+    return transaction_date, round(amount, 2)
+
+
+def _normalize(description: str) -> str:
+    return "".join(description.split()).upper()
+
+
+def match(expected: List[Dict[str, Any]], found: List[Transaction]) -> Dict[str, int]:
+    """Count the extracted transactions matching the ground truth
+
+    Args:
+        expected: Ground truth transactions (date as ISO text, amount)
+        found: Extracted transactions
+
+    Returns:
+        Counts: expected, found, matched, and descriptions equal among the matched
+    """
+    remaining = Counter(_key(transaction['date'], transaction['amount']) for transaction in expected)
+    descriptions: Dict[Tuple[str, float], List[str]] = {}
+    for transaction in expected:
+        descriptions.setdefault(_key(transaction['date'], transaction['amount']), []).append(
+            _normalize(transaction['description'])
+        )
+
+    matched = 0
+    same_description = 0
+    for transaction in found:
+        key = _key(transaction.date.isoformat(), transaction.amount)
+        if remaining[key] <= 0:
+            continue
+        remaining[key] -= 1
+        matched += 1
+        if _normalize(transaction.description) in descriptions[key]:
+            same_description += 1
+
+    return {'expected': len(expected), 'found': len(found), 'matched': matched,
+            'same_description': same_description}
+
+
+def score(processor, corpus_dir: Path) -> Dict[str, Any]:
+    """Process every statement of a corpus and score the extraction
+
+    Args:
+        processor: DocumentProcessor to benchmark
+        corpus_dir: Folder written by benchmarks.corpus
+
+    Returns:
+        Totals of the corpus and one row per document
+    """
+    manifest = json.loads((corpus_dir / "manifest.json").read_text())
+    documents = []
+    for entry in manifest['documents']:
+        truth = json.loads((corpus_dir / entry['truth']).read_text())
+        start = time.perf_counter()
+        document = processor.process_document(corpus_dir / entry['pdf'])
+        seconds = time.perf_counter() - start
+        documents.append({
+            'name': entry['name'], 'scanned': entry['scanned'], 'pages': document.page_count,
+            'seconds': seconds, **match(truth['transactions'], document.transactions),
+        })
+
+    totals = {key: sum(document[key] for document in documents)
+              for key in ('pages', 'seconds', 'expected', 'found', 'matched', 'same_description')}
+    seconds = totals['seconds'] or float('nan')
+    totals.update({
+        'documents': len(documents),
+        'pages_per_sec': totals['pages'] / seconds,
+        'transactions_per_sec': totals['expected'] / seconds,
+        'precision': totals['matched'] / totals['found'] if totals['found'] else 0.0,
+        'recall': totals['matched'] / totals['expected'] if totals['expected'] else 0.0,
+        'description_accuracy': totals['same_description'] / totals['matched'] if totals['matched'] else 0.0,
+    })
+    return {'totals': totals, 'documents': documents}
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{'document':<16} {'scanned':>7} {'pages':>5} {'s':>7} {'expected':>8} {'found':>6} "
+          f"{'precision':>9} {'recall':>7}")
+    for document in report['documents']:
+        precision = document['matched'] / document['found'] if document['found'] else 0.0
+        recall = document['matched'] / document['expected'] if document['expected'] else 0.0
+        print(f"{document['name']:<16} {'yes' if document['scanned'] else 'no':>7} {document['pages']:>5} "
+              f"{document['seconds']:>7.2f} {document['expected']:>8} {document['found']:>6} "
+              f"{precision:>9.3f} {recall:>7.3f}")
+
+    totals = report['totals']
+    print(f"\n{totals['documents']} documents, {totals['pages']} pages in {totals['seconds']:.2f} s")
+    print(f"pages/s              {totals['pages_per_sec']:.2f}")
+    print(f"transactions/s       {totals['transactions_per_sec']:.1f}")
+    print(f"precision            {totals['precision']:.4f}")
+    print(f"recall               {totals['recall']:.4f}")
+    print(f"description accuracy {totals['description_accuracy']:.4f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", type=Path, help="Folder written by benchmarks.corpus")
+    parser.add_argument("--min-precision", type=float, default=0.0, help="Fail below this precision")
+    parser.add_argument("--min-recall", type=float, default=0.0, help="Fail below this recall")
+    parser.add_argument("--json", type=Path, help="Also write the report to this file")
+    args = parser.parse_args()
+
+    # Import tardif : charge torch, doctr et YOLO
+    from services.registry.model_registry import ModelRegistry
+
+    corpus_dir = args.corpus.resolve()
+    json_path = args.json.resolve() if args.json else None
+    log.configure(level="WARNING", log_dir="")
+
+    # Les dossiers de sortie de la configuration sont relatifs : les créer hors du dépôt
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            registry = ModelRegistry()
+            registry.config.artifacts.mode = "off"
+            registry.initialize()
+            if not registry.is_ready:
+                sys.exit(f"Models could not be loaded: {registry.error}")
+            report = score(registry.create_processor(), corpus_dir)
+        finally:
+            os.chdir(cwd)
+
+    print_report(report)
+    if json_path is not None:
+        json_path.write_text(json.dumps(report, indent=2))
+
+    totals = report['totals']
+    if totals['precision'] < args.min_precision or totals['recall'] < args.min_recall:
+        print(f"\nBelow the required precision {args.min_precision} / recall {args.min_recall}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
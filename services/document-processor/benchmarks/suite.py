@@ -0,0 +1,227 @@
+"""Stage benchmarks of the document processor on recorded model outputs
+
+Every stage around the models runs on the recording in
+benchmarks/fixtures (see benchmarks.recording): rasterization, YOLO
+post-processing, OCR post-processing, layout analysis, transaction parsing
+and validation. No model is downloaded or run.
+
+Each case reports pages/s (best of --repeat runs) and the peak memory
+allocated per page (tracemalloc, on a separate run). Results are compared
+with benchmarks/baseline.json: a case slower or allocating more than
+--threshold (relative) fails the run. Baselines depend on the machine,
+refresh them with --update-baseline when the reference machine changes.
+
+Usage (from services/document-processor):
+    python -m benchmarks.suite
+    python -m benchmarks.suite --update-baseline
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from core.config import ServiceConfig
+from core.logger import log
+from services.ocr.extractor import OcrExtractor
+from services.ocr.layout import LayoutAnalyzer
+from services.processor.parser import HAS_ARROW_STRINGS
+from services.processor.transaction_extractor import TransactionExtractor
+from services.processor.validator import TransactionValidator
+from services.tableau.extractor import TableauExtractor
+from services.tableau.model_handler import ModelHandler
+from services.tableau.rasterizer import PdfiumRasterizer, PopplerRasterizer
+from . import recording as recordings
+
+BENCHMARKS_DIR = Path(__file__).parent
+DEFAULT_RECORDING = BENCHMARKS_DIR / "fixtures" / "statement.json"
+DEFAULT_BASELINE = BENCHMARKS_DIR / "baseline.json"
+
+# Année de référence fixe : les résultats ne dépendent pas de la date du jour
+REFERENCE_YEAR = 2024
+
+# Durée minimale d'une mesure, et nombre de mesures des allocations (la plus basse est gardée)
+MIN_RUN_SECONDS = 0.05
+ALLOC_RUNS = 3
+
+
+def build_cases(recording: Dict[str, Any], config: ServiceConfig) -> Dict[str, Callable[[], Any]]:
+    """One callable per benchmarked stage, each processing the whole recorded document
+
+    The inputs of each stage are computed once here, from the recording,
+    so a case only times its own stage.
+
+    Args:
+        recording: Loaded recording (benchmarks.recording.load)
+        config: Service configuration
+    """
+    pdf_path = recording['pdf_path']
+    page_count = len(recording['pages'])
+    cases: Dict[str, Callable[[], Any]] = {}
+
+    pdfium = PdfiumRasterizer(config.rasterizer)
+    cases['rasterize_pdfium'] = lambda: pdfium.render_range(pdf_path, 1, page_count)
+    if shutil.which("pdftoppm"):
+        poppler = PopplerRasterizer(config.rasterizer)
+        cases['rasterize_poppler'] = lambda: poppler.render_range(pdf_path, 1, page_count)
+
+    window = list(enumerate(pdfium.render_range(pdf_path, 1, page_count)))
+    tableau = TableauExtractor(config, model_handler=ModelHandler(config, model=recordings.table_model(recording)))
+    cases['detect_postprocess'] = lambda: tableau.detect_window(window)
+
+    tables = [table for page_tables in tableau.detect_window(window) for table in page_tables]
+    ocr = OcrExtractor(recordings.ocr_model(recording), config)
+    cases['ocr_postprocess'] = lambda: ocr.extract_text_from_tables(tables)
+
+    table_lines = ocr.extract_text_from_tables(tables)
+    words = [[word for line in lines for word in line.words] for lines in table_lines]
+    layout = LayoutAnalyzer(config)
+    cases['layout_group_lines'] = lambda: [layout.group_lines(table_words) for table_words in words]
+    cases['layout_merge_words'] = lambda: [layout.merge_words(table_words) for table_words in words]
+
+    extractor = TransactionExtractor(config)
+
+    def start_parser():
+        parser = extractor.start_document(REFERENCE_YEAR)
+        for table, lines in zip(tables, table_lines):
+            parser.add_lines(lines, table.page_number)
+        return parser
+
+    cases['parse_lines'] = lambda: start_parser().finish()
+    if HAS_ARROW_STRINGS:
+        cases['parse_bulk'] = lambda: start_parser().finish_frame()
+
+    validator = TransactionValidator(config)
+    transactions = start_parser().finish()
+    frame = extractor.to_dataframe(transactions)
+    cases['validate_transactions'] = lambda: validator.validate_transactions(transactions)
+    cases['validate_frame'] = lambda: validator.validate_frame(frame)
+    return cases
+
+
+def measure(cases: Dict[str, Callable[[], Any]], pages: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Pages per second (best run) and peak allocated bytes per page of each case
+
+    A timed run loops over a case for at least MIN_RUN_SECONDS, so the
+    fastest stages are not measured at the timer resolution. The runs of
+    the cases are interleaved, round after round: a slow phase of the
+    machine slows one run of every case instead of every run of one case.
+    Allocations are measured on separate runs, under tracemalloc.
+    """
+    timers = {name: timeit.Timer(call) for name, call in cases.items()}
+    numbers = {name: max(1, math.ceil(MIN_RUN_SECONDS / timer.timeit(number=1))) for name, timer in timers.items()}
+    best = {name: math.inf for name in cases}
+    for _ in range(repeat):
+        for name, timer in timers.items():
+            best[name] = min(best[name], timer.timeit(number=numbers[name]) / numbers[name])
+
+    results = {}
+    for name, call in cases.items():
+        peaks = []
+        for _ in range(ALLOC_RUNS):
+            tracemalloc.start()
+            try:
+                call()
+                peaks.append(tracemalloc.get_traced_memory()[1])
+            finally:
+                tracemalloc.stop()
+        results[name] = {'pages_per_sec': pages / best[name], 'alloc_bytes_per_page': min(peaks) / pages}
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> List[str]:
+    """Regressions of the results against the baseline, beyond the relative threshold"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result['pages_per_sec'] < reference['pages_per_sec'] * (1 - threshold):
+            regressions.append(f"{name}: {result['pages_per_sec']:.1f} pages/s, "
+                               f"baseline {reference['pages_per_sec']:.1f}")
+        if result['alloc_bytes_per_page'] > reference['alloc_bytes_per_page'] * (1 + threshold):
+            regressions.append(f"{name}: {result['alloc_bytes_per_page'] / 1024:.1f} KiB/page allocated, "
+                               f"baseline {reference['alloc_bytes_per_page'] / 1024:.1f}")
+    return regressions
+
+
+def run(recording_path: Path, repeat: int, only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Run the benchmark cases on a recording
+
+    Args:
+        recording_path: Recording to replay
+        repeat: Timed runs per case
+        only: Names of the cases to run (all if None)
+    """
+    recording = recordings.load(recording_path)
+    config = ServiceConfig()
+    config.rasterizer.dpi = recording['dpi']
+    config.artifacts.mode = "off"
+    config.ocr.save_debug_images = False
+
+    cases = build_cases(recording, config)
+    if only is not None:
+        cases = {name: call for name, call in cases.items() if name in only}
+    return measure(cases, len(recording['pages']), repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recording", type=Path, default=DEFAULT_RECORDING, help="Recorded model outputs")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Relative regression that fails the run")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per case")
+    parser.add_argument("--case", action="append", help="Run only this case (repeatable)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    args = parser.parse_args()
+
+    recording_path = args.recording.resolve()
+    baseline_path = args.baseline.resolve()
+    log.configure(level="WARNING", log_dir="")
+
+    # Les dossiers de sortie de la configuration sont relatifs : les créer hors du dépôt
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            results = run(recording_path, args.repeat, args.case)
+        finally:
+            os.chdir(cwd)
+
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    reference = baseline.get('cases', {})
+    print(f"{'case':<24} {'pages/s':>10} {'baseline':>10} {'KiB/page':>10} {'baseline':>10}")
+    for name, result in results.items():
+        base = reference.get(name, {})
+        print(f"{name:<24} {result['pages_per_sec']:>10.1f} {base.get('pages_per_sec', float('nan')):>10.1f} "
+              f"{result['alloc_bytes_per_page'] / 1024:>10.1f} "
+              f"{base.get('alloc_bytes_per_page', float('nan')) / 1024:>10.1f}")
+
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps({
+            'machine': f"{platform.machine()} {platform.processor() or platform.system()}, "
+                       f"Python {platform.python_version()}, {os.cpu_count()} CPUs",
+            'recording': os.path.relpath(recording_path, baseline_path.parent),
+            'cases': {**reference, **results},
+        }, indent=2) + "\n")
+        print(f"Baseline written to {baseline_path}")
+        return
+
+    regressions = compare(results, reference, args.threshold)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%}:", file=sys.stderr)
+        for regression in regressions:
+            print(f"  {regression}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from core.config import OutputFoldersConfig, ServiceConfig
+from core.logger import log
+from core.metrics import stage_seconds
+
+artifact_seconds = stage_seconds.labels("artifact_write")
+
+
+class ArtifactWriter:
+    def __init__(self, config: Optional[ServiceConfig] = None):
+        """Write debug artifacts from a background thread
+
+        Writes are queued in a bounded queue; when it is full the artifact
+        is dropped rather than slowing the request down. The thread is only
+        started on the first write, so nothing runs when artifacts are off.
+
+        Args:
+            config: Service configuration (artifacts section)
+        """
+        self.config = config or ServiceConfig()
+        self._queue: queue.Queue = queue.Queue(maxsize=self.config.artifacts.queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def session(self, document_id: str, folders: Optional[OutputFoldersConfig] = None) -> 'ArtifactSession':
+        """Start writing the artifacts of one document
+
+        Args:
+            document_id: Name of the document folder
+            folders: Output folders (the writer configuration if None)
+        """
+        return ArtifactSession(self, document_id, self._is_selected(document_id),
+                               folders or self.config.output_folders)
+
+    def _is_selected(self, document_id: str) -> bool:
+        """Apply the artifact policy to a document"""
+        mode = self.config.artifacts.mode
+        if mode == "always":
+            return True
+        if mode == "sampled":
+            # Décision stable par document : toutes ses pages sont gardées ou aucune
+            bucket = int(hashlib.sha1(document_id.encode()).hexdigest()[:8], 16) / 0xFFFFFFFF
+            return bucket < self.config.artifacts.sample_rate
+        return False
+
+    def submit(self, path: Path, write: Callable[[Path], None]) -> bool:
+        """Queue a write, return False if the artifact was dropped"""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((path, write))
+            return True
+        except queue.Full:
+            log.warning("⚠️ Artifact queue full, dropping {}", path.name, rate=1)
+            return False
+
+    def flush(self) -> None:
+        """Wait until every queued artifact is written"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _ensure_thread(self) -> None:
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            path, write = self._queue.get()
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with artifact_seconds.time():
+                    write(path)
+            except Exception as e:
+                log.error(f"Error writing artifact {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+
+class ArtifactSession:
+    def __init__(self, writer: ArtifactWriter, document_id: str, enabled: bool, folders: OutputFoldersConfig):
+        """Artifacts of one document, stored under a folder named after its id"""
+        self.writer = writer
+        self.document_id = document_id
+        self.enabled = enabled
+        self.folders = folders
+
+    def save_page(self, page_num: int, image: np.ndarray, boxes: List) -> None:
+        """Save the page image and its detected table boxes"""
+        if not self.enabled:
+            return
+        folder = Path(self.folders.pages) / self.document_id
+        self.writer.submit(
+            folder / f"page_{page_num}.png",
+            lambda path: cv2.imwrite(str(path), cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        )
+        boxes = [box.to_list() for box in boxes]
+        self.writer.submit(
+            Path(self.folders.tables) / self.document_id / f"page_{page_num}_tables.json",
+            lambda path: path.write_text(json.dumps(boxes))
+        )
+
+    def save_lines(self, page_num: int, table_index: int, lines: List) -> None:
+        """Save the OCR lines of a table, as text and as JSON for visualisation"""
+        if not self.enabled:
+            return
+        folder = Path(self.folders.text) / self.document_id
+        name = f"page_{page_num}_table_{table_index}_lines"
+        self.writer.submit(
+            folder / f"{name}.txt",
+            lambda path: path.write_text(
+                ''.join(line.text + '\n' for line in lines)
+            )
+        )
+        self.writer.submit(
+            folder / f"{name}.json",
+            lambda path: path.write_text(json.dumps([line.to_dict() for line in lines]))
+        )
+
+    def save_transactions(self, transactions: List, suffix: str = "") -> None:
+        """Save the validated transactions as CSV
+
+        Args:
+            transactions: Validated transactions
+            suffix: Added to the file name, e.g. the page range of a shard
+        """
+        if not self.enabled:
+            return
+        self.writer.submit(
+            Path(self.folders.transactions) / f"{self.document_id}{suffix}_transactions.csv",
+            lambda path: pd.DataFrame([t.__dict__ for t in transactions]).to_csv(path, index=False)
+        )
+
+    def load_page(self, page_num: int) -> Optional[np.ndarray]:
+        """Read back a saved page image (BGR), None if it was not saved"""
+        path = Path(self.folders.pages) / self.document_id / f"page_{page_num}.png"
+        if not path.exists():
+            return None
+        return cv2.cvtColor(cv2.imread(str(path)), cv2.COLOR_RGB2BGR)
+
+    def load_boxes(self, page_num: int) -> Optional[List[List[int]]]:
+        """Read back the saved table boxes of a page"""
+        path = Path(self.folders.tables) / self.document_id / f"page_{page_num}_tables.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def load_lines(self, page_num: int) -> Optional[List[Dict]]:
+        """Read back the saved OCR lines of every table of a page"""
+        paths = sorted((Path(self.folders.text) / self.document_id).glob(f"page_{page_num}_table_*_lines.json"))
+        if not paths:
+            return None
+        return [line for path in paths for line in json.loads(path.read_text())]
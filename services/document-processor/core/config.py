@@ -1,4 +1,6 @@
-from dataclasses import dataclass
+import copy
+import os
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import List, Optional
 import yaml
@@ -10,6 +12,8 @@ class OCRConfig:
     debit_x_tolerance: int
     y_tolerance: int
     min_confidence: float
+    batch_size: int
+    save_debug_images: bool
     temp_dir: str
     date_formats: List[str]
 
@@ -17,11 +21,17 @@ class OCRConfig:
     def temp_path(self) -> Path:
         return Path(self.temp_dir)
 
+@dataclass
+class TextLayerConfig:
+    enabled: bool
+    min_chars: int
+
 @dataclass
 class TableauConfig:
     model_repo_id: str
     model_filename: str
     device: str
+    batch_size: int
 
     @property
     def torch_device(self) -> torch.device:
@@ -33,16 +43,98 @@ class TableauConfig:
             return torch.device("cpu")
         return torch.device(self.device)
 
+@dataclass
+class RasterizerConfig:
+    backend: str
+    dpi: int
+    grayscale: bool
+    workers: int
+    pool: str
+    shared_memory: bool
+    shared_slots: int
+    shared_slot_mb: int
+
+@dataclass
+class PipelineConfig:
+    enabled: bool
+    queue_size: int
+
+@dataclass
+class ModelsConfig:
+    warmup: bool
+    warmup_image_size: int
+
 @dataclass
 class DocumentConfig:
     max_file_size_mb: int
     supported_formats: List[str]
     output_dir: str
+    page_window: int
 
     @property
     def max_file_size(self) -> int:
         return self.max_file_size_mb * 1024 * 1024
 
+@dataclass
+class CacheConfig:
+    enabled: bool
+    dir: str
+    max_size_mb: int
+    ttl_hours: float
+    page_cache_enabled: bool
+    page_cache_max_size_mb: int
+
+    @property
+    def max_size(self) -> int:
+        return self.max_size_mb * 1024 * 1024
+
+    @property
+    def page_cache_max_size(self) -> int:
+        return self.page_cache_max_size_mb * 1024 * 1024
+
+    @property
+    def ttl(self) -> float:
+        return self.ttl_hours * 3600
+
+@dataclass
+class ArtifactConfig:
+    mode: str
+    sample_rate: float
+    queue_size: int
+
+# Threads torch par worker quand ni le nombre de workers ni le budget ne sont fixés
+DEFAULT_THREADS_PER_WORKER = 4
+
+@dataclass
+class JobsConfig:
+    workers: int
+    threads_per_worker: int
+    dispatch: str
+    pages_per_shard: int
+    max_pending: int
+    retry_after_seconds: int
+    keep_finished: int
+    workspace_dir: str
+
+    @property
+    def worker_count(self) -> int:
+        """Number of worker processes, 0 in the config means one per thread budget"""
+        if self.workers > 0:
+            return self.workers
+        return max(1, (os.cpu_count() or 1) // (self.threads_per_worker or DEFAULT_THREADS_PER_WORKER))
+
+    @property
+    def thread_budget(self) -> int:
+        """torch threads of each worker, 0 in the config shares the cores between workers"""
+        if self.threads_per_worker > 0:
+            return self.threads_per_worker
+        return max(1, (os.cpu_count() or 1) // self.worker_count)
+
+@dataclass
+class ParserConfig:
+    log_sample_every: int
+    bulk_min_lines: int
+
 @dataclass
 class ValidationConfig:
     min_transaction_amount: float
@@ -80,22 +172,91 @@ class ServiceConfig:
             debit_x_tolerance=config['ocr']['debit_x_tolerance'],
             y_tolerance=config['ocr']['y_tolerance'],
             min_confidence=config['ocr']['min_confidence'],
+            batch_size=config['ocr']['batch_size'],
+            save_debug_images=config['ocr']['save_debug_images'],
             temp_dir=config['ocr']['temp_dir'],
             date_formats=config['ocr']['date_formats']
         )
 
+        # Initialize Text layer configuration
+        self.text_layer = TextLayerConfig(
+            enabled=config['text_layer']['enabled'],
+            min_chars=config['text_layer']['min_chars']
+        )
+
         # Initialize Tableau configuration
         self.tableau = TableauConfig(
             model_repo_id=config['tableau']['model']['repo_id'],
             model_filename=config['tableau']['model']['filename'],
-            device=config['tableau']['model']['device']
+            device=config['tableau']['model']['device'],
+            batch_size=config['tableau']['model']['batch_size']
+        )
+
+        # Initialize Rasterizer configuration
+        self.rasterizer = RasterizerConfig(
+            backend=config['rasterizer']['backend'],
+            dpi=config['rasterizer']['dpi'],
+            grayscale=config['rasterizer']['grayscale'],
+            workers=config['rasterizer']['workers'],
+            pool=config['rasterizer']['pool'],
+            shared_memory=config['rasterizer']['shared_memory'],
+            shared_slots=config['rasterizer']['shared_slots'],
+            shared_slot_mb=config['rasterizer']['shared_slot_mb']
+        )
+
+        # Initialize Pipeline configuration
+        self.pipeline = PipelineConfig(
+            enabled=config['pipeline']['enabled'],
+            queue_size=config['pipeline']['queue_size']
+        )
+
+        # Initialize Models configuration
+        self.models = ModelsConfig(
+            warmup=config['models']['warmup'],
+            warmup_image_size=config['models']['warmup_image_size']
         )
 
         # Initialize Document configuration
         self.document = DocumentConfig(
             max_file_size_mb=config['document']['max_file_size_mb'],
             supported_formats=config['document']['supported_formats'],
-            output_dir=config['document']['output_dir']
+            output_dir=config['document']['output_dir'],
+            page_window=config['document']['page_window']
+        )
+
+        # Initialize Cache configuration
+        self.cache = CacheConfig(
+            enabled=config['cache']['enabled'],
+            dir=config['cache']['dir'],
+            max_size_mb=config['cache']['max_size_mb'],
+            ttl_hours=config['cache']['ttl_hours'],
+            page_cache_enabled=config['cache']['page_cache_enabled'],
+            page_cache_max_size_mb=config['cache']['page_cache_max_size_mb']
+        )
+
+        # Initialize Artifact configuration
+        self.artifacts = ArtifactConfig(
+            mode=config['artifacts']['mode'],
+            sample_rate=config['artifacts']['sample_rate'],
+            queue_size=config['artifacts']['queue_size']
+        )
+
+        # Initialize Jobs configuration
+        self.jobs = JobsConfig(
+            workers=config['jobs']['workers'],
+            threads_per_worker=config['jobs']['threads_per_worker'],
+            dispatch=config['jobs']['dispatch'],
+            pages_per_shard=config['jobs']['pages_per_shard'],
+            max_pending=config['jobs']['max_pending'],
+            retry_after_seconds=config['jobs']['retry_after_seconds'],
+            keep_finished=config['jobs']['keep_finished'],
+            workspace_dir=config['jobs']['workspace_dir']
+        )
+
+        # Initialize Parser configuration
+        self.parser = ParserConfig(
+            log_sample_every=config['parser']['log_sample_every'],
+            bulk_min_lines=config['parser']['bulk_min_lines']
         )
 
         # Initialize Validation configuration
@@ -112,6 +273,25 @@ class ServiceConfig:
             transactions=config['output_folders']['transactions']
         )
 
+    def for_workspace(self, workspace: Path) -> 'ServiceConfig':
+        """Copy of the configuration writing its outputs under a job workspace
+
+        Args:
+            workspace: Job workspace directory
+
+        Returns:
+            ServiceConfig sharing every setting but the output folders
+        """
+        config = copy.copy(self)
+        config.document = replace(self.document, output_dir=str(workspace))
+        config.output_folders = OutputFoldersConfig(
+            pages=str(workspace / "pages"),
+            tables=str(workspace / "tables"),
+            text=str(workspace / "text"),
+            transactions=str(workspace / "transactions")
+        )
+        return config
+
     def validate_file(self, file_path: Path) -> bool:
         """Validate if a file can be processed
 
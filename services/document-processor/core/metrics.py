@@ -0,0 +1,280 @@
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Métriques au format texte Prometheus, sans dépendance : une observation coûte une
+# recherche dichotomique et une addition (quelques centaines de ns), elles restent actives
+# en production. Les mises à jour ne prennent pas de verrou (un verrou doublerait le coût) :
+# chaque étage tourne dans son propre thread, et une incrémentation perdue lors d'un
+# changement de thread au mauvais moment est acceptable pour du monitoring. Seuls drain
+# et merge, rares, prennent le verrou de la métrique.
+#
+# Les workers renvoient leurs métriques (drain) avec chaque résultat de job, le
+# processus de l'API les fusionne (merge) et les expose sur /metrics.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Secondes, de la page rendue en quelques millisecondes au lot OCR de plusieurs secondes
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Counter:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def _drain(self) -> float:
+        with self._lock:
+            value, self.value = self.value, 0.0
+        return value
+
+    def _merge(self, value: float) -> None:
+        with self._lock:
+            self.value += value
+
+
+class Gauge:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: 'Histogram'):
+        self.histogram = histogram
+
+    def __enter__(self) -> '_Timer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Histogram:
+    __slots__ = ('bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        # Un compteur par intervalle (non cumulés), le dernier pour +Inf
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self) -> _Timer:
+        """Context manager observing the duration of its block, in seconds"""
+        return _Timer(self)
+
+    def _drain(self) -> Tuple[List[int], float]:
+        with self._lock:
+            counts, total = self.counts, self.sum
+            self.counts, self.sum = [0] * len(counts), 0.0
+        return counts, total
+
+    def _merge(self, value: Tuple[List[int], float]) -> None:
+        counts, total = value
+        with self._lock:
+            self.counts = [mine + theirs for mine, theirs in zip(self.counts, counts)]
+            self.sum += total
+
+
+class MetricFamily:
+    def __init__(self, kind: str, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """A metric and its children, one per set of label values
+
+        Args:
+            kind: "counter", "gauge" or "histogram"
+            name: Metric name
+            help_text: HELP line
+            labelnames: Label names, the values are given to labels()
+            buckets: Upper bounds of the histogram buckets
+        """
+        self.kind = kind
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        # Jauges des autres processus, par pid
+        self._remote: Dict[int, Dict[Tuple[str, ...], float]] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """Child metric of these label values (created on first use)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        if self.kind == "histogram":
+            return Histogram(self.buckets)
+        return Counter() if self.kind == "counter" else Gauge()
+
+    # Métriques sans label : la famille se comporte comme son unique enfant
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self) -> _Timer:
+        return self.labels().time()
+
+    def drain(self) -> Dict[Tuple[str, ...], Any]:
+        """Values of the children, counters and histograms reset to zero"""
+        children = list(self._children.items())
+        if self.kind == "gauge":
+            return {labels: child.value for labels, child in children}
+        return {labels: child._drain() for labels, child in children}
+
+    def merge(self, values: Dict[Tuple[str, ...], Any], pid: int) -> None:
+        """Add values drained in another process (gauges replace that process's values)"""
+        if self.kind == "gauge":
+            if pid != os.getpid():
+                self._remote[pid] = dict(values)
+            return
+        for labels, value in values.items():
+            self.labels(*labels)._merge(value)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """(name, labels, value) of each exposed sample"""
+        samples = []
+        if self.kind == "gauge":
+            totals = {labels: child.value for labels, child in list(self._children.items())}
+            for values in list(self._remote.values()):
+                for labels, value in values.items():
+                    totals[labels] = totals.get(labels, 0.0) + value
+            for labels, value in sorted(totals.items()):
+                samples.append((self.name, dict(zip(self.labelnames, labels)), value))
+            return samples
+
+        for labels, child in sorted(self._children.items()):
+            label_dict = dict(zip(self.labelnames, labels))
+            if self.kind == "counter":
+                samples.append((self.name + "_total", label_dict, child.value))
+                continue
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(child.bounds + (math.inf,), counts):
+                cumulative += count
+                samples.append((self.name + "_bucket", {**label_dict, 'le': _format_value(bound)}, cumulative))
+            samples.append((self.name + "_sum", label_dict, total))
+            samples.append((self.name + "_count", label_dict, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """Metrics of the service, rendered in the Prometheus text format"""
+        self._families: Dict[str, MetricFamily] = {}
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(MetricFamily("counter", name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(MetricFamily("gauge", name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> MetricFamily:
+        return self._register(MetricFamily("histogram", name, help_text, labelnames, buckets))
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        if family.name in self._families:
+            raise ValueError(f"Metric {family.name} already registered")
+        self._families[family.name] = family
+        return family
+
+    def drain(self) -> Dict[str, Any]:
+        """Take the observations of this process since the last drain
+
+        Returns:
+            A picklable snapshot for merge(), e.g. sent back by a worker process
+        """
+        return {
+            'pid': os.getpid(),
+            'families': {name: family.drain() for name, family in self._families.items()},
+        }
+
+    def merge(self, snapshot: Optional[Dict[str, Any]]) -> None:
+        """Add a snapshot drained in a worker process"""
+        if not snapshot:
+            return
+        for name, values in snapshot['families'].items():
+            family = self._families.get(name)
+            if family is not None:
+                family.merge(values, snapshot['pid'])
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        for family in self._families.values():
+            lines.append(f"# HELP {family.name} {family.help_text}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for name, labels, value in family.samples():
+                if labels:
+                    label_text = ",".join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+                    name = f"{name}{{{label_text}}}"
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Registre global et métriques du service
+metrics = MetricsRegistry()
+
+stage_seconds = metrics.histogram(
+    "document_processor_stage_seconds", "Duration of each processing stage call", ("stage",)
+)
+pages_processed = metrics.counter("document_processor_pages", "Pages processed")
+tables_detected = metrics.counter("document_processor_tables", "Tables detected and OCR'd")
+words_read = metrics.counter("document_processor_words", "Words read by OCR or from the text layer")
+transactions_extracted = metrics.counter("document_processor_transactions", "Valid transactions extracted")
+jobs_in_flight = metrics.gauge("document_processor_jobs_in_flight", "Jobs queued or running")
+model_memory_bytes = metrics.gauge(
+    "document_processor_model_memory_bytes", "Parameters and buffers of the loaded models, all workers",
+    ("model",)
+)
@@ -1,10 +1,13 @@
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.routes import router as document_router
 from core.config import ServiceConfig
 from core.logger import log
+from core.metrics import CONTENT_TYPE, jobs_in_flight, metrics
+from services.jobs import job_manager
 
 # Création de l'application FastAPI
 app = FastAPI(
@@ -34,12 +37,15 @@ async def startup_event():
     log.info("🚀 Starting Document Processor Service...")
     # Création des dossiers nécessaires
     config.create_directories()
+    # Démarrage des workers : chacun charge et chauffe ses modèles
+    job_manager.start()
     log.info("✅ Service initialized successfully")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Événement d'arrêt de l'application"""
     log.info("👋 Shutting down Document Processor Service...")
+    job_manager.shutdown()
 
 @app.get("/", tags=["health"])
 async def root():
@@ -50,6 +56,22 @@ async def root():
         "version": "1.0.0"
     }
 
+@app.get("/ready", tags=["health"])
+async def ready():
+    """Endpoint de readiness : prêt une fois les modèles chargés et chauds"""
+    if not job_manager.is_ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "not ready", "error": job_manager.error}
+        )
+    return {"status": "ready"}
+
+@app.get("/metrics", tags=["monitoring"], response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Métriques au format texte Prometheus, workers compris"""
+    jobs_in_flight.set(job_manager.pending_count)
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -0,0 +1,7 @@
+from .document_cache import DocumentCache, hash_file
+
+from .page_cache import PageCache
+from .store import DiskCache
+from .versions import PIPELINE_REVISION, pipeline_version
+
+__all__ = ['DocumentCache', 'PageCache', 'DiskCache', 'hash_file', 'pipeline_version', 'PIPELINE_REVISION']
@@ -0,0 +1,58 @@
+import hashlib
+from dataclasses import replace
+from pathlib import Path
+from typing import Optional
+
+from core.config import ServiceConfig
+from services.processor.models import ProcessedDocument
+from .store import DiskCache
+from .versions import pipeline_version
+
+
+def hash_file(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file content"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DocumentCache:
+    def __init__(self, config: Optional[ServiceConfig] = None):
+        """Content-addressed cache of processed documents
+
+        Args:
+            config: Service configuration
+        """
+        self.config = config or ServiceConfig()
+        self.pipeline_version = pipeline_version(self.config)
+        self.store = DiskCache(
+            Path(self.config.cache.dir) / "documents",
+            max_size_bytes=self.config.cache.max_size,
+            ttl_seconds=self.config.cache.ttl
+        )
+
+    def key(self, content_hash: str) -> str:
+        """Cache key for a PDF content hash and the current pipeline version"""
+        return hashlib.sha256(f"{content_hash}:{self.pipeline_version}".encode()).hexdigest()
+
+    def get(self, content_hash: str) -> Optional[ProcessedDocument]:
+        """Return the cached result for a PDF, None on miss
+
+        The artifacts and timings of the run that filled the cache are left
+        out: its workspace may have been pruned since, and nothing was
+        measured for this request.
+        """
+        if not self.config.cache.enabled:
+            return None
+        document = self.store.get(self.key(content_hash))
+        if document is None:
+            return None
+        return replace(document, artifacts_id=None, timings=None)
+
+    def set(self, content_hash: str, document: ProcessedDocument) -> None:
+        """Store a successful result"""
+        if not self.config.cache.enabled or document.error is not None:
+            return
+        self.store.set(self.key(content_hash), document)
@@ -0,0 +1,75 @@
+import hashlib
+from pathlib import Path
+from typing import Any, List, Optional
+
+import numpy as np
+
+from core.config import ServiceConfig
+from services.ocr.models import Line
+from .store import DiskCache
+from .versions import PIPELINE_REVISION
+
+
+def _version(*parts) -> str:
+    return hashlib.sha256('|'.join(map(str, parts)).encode()).hexdigest()[:16]
+
+
+class PageCache:
+    def __init__(self, config: Optional[ServiceConfig] = None):
+        """Cache of per-page stage results, keyed by a hash of the rendered page
+
+        Stores the table detections of a page and the OCR lines of each
+        table, so unchanged pages skip inference and TransactionExtractor
+        can be replayed over cached lines without running any model.
+
+        Args:
+            config: Service configuration
+        """
+        self.config = config or ServiceConfig()
+        self.detection_version = _version(
+            PIPELINE_REVISION, self.config.tableau.model_repo_id, self.config.tableau.model_filename
+        )
+        self.ocr_version = _version(
+            PIPELINE_REVISION, self.config.ocr.x_tolerance, self.config.ocr.debit_x_tolerance,
+            self.config.ocr.y_tolerance, self.config.ocr.min_confidence
+        )
+        self.store = DiskCache(
+            Path(self.config.cache.dir) / "pages",
+            max_size_bytes=self.config.cache.page_cache_max_size,
+            ttl_seconds=self.config.cache.ttl
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.cache.enabled and self.config.cache.page_cache_enabled
+
+    @staticmethod
+    def page_hash(image: np.ndarray) -> str:
+        """Hash of the rendered page pixels"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{image.shape}:{image.dtype}".encode())
+        digest.update(np.ascontiguousarray(image).data)
+        return digest.hexdigest()
+
+    def _key(self, *parts) -> str:
+        return hashlib.sha256(':'.join(map(str, parts)).encode()).hexdigest()
+
+    def get_detections(self, page_hash: str) -> Optional[List[Any]]:
+        """Return the cached table boxes of a page, None on miss"""
+        if not self.enabled:
+            return None
+        return self.store.get(self._key("detect", self.detection_version, page_hash))
+
+    def set_detections(self, page_hash: str, boxes: List[Any]) -> None:
+        if self.enabled:
+            self.store.set(self._key("detect", self.detection_version, page_hash), boxes)
+
+    def get_lines(self, page_hash: str, box: List[int]) -> Optional[List[Line]]:
+        """Return the cached OCR lines of a table region, None on miss"""
+        if not self.enabled:
+            return None
+        return self.store.get(self._key("ocr", self.ocr_version, page_hash, list(box)))
+
+    def set_lines(self, page_hash: str, box: List[int], lines: List[Line]) -> None:
+        if self.enabled:
+            self.store.set(self._key("ocr", self.ocr_version, page_hash, list(box)), lines)
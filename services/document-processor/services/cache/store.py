@@ -0,0 +1,158 @@
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from core.logger import log
+
+# Écritures entre deux parcours complets du dossier : resynchronise la taille avec les
+# entrées écrites par les autres processus et supprime les entrées expirées jamais relues
+SCAN_EVERY_WRITES = 256
+# Une éviction descend sous cette part de la taille max, pour ne pas reparcourir le
+# dossier à chaque écriture une fois le cache plein
+EVICT_TO_RATIO = 0.9
+# En-tête de chaque entrée : format et date de création, lisibles sans désérialiser la valeur
+HEADER = struct.Struct('<4sd')
+HEADER_MAGIC = b'DC02'
+
+
+class DiskCache:
+    def __init__(self, directory: Path, max_size_bytes: int, ttl_seconds: float):
+        """Size-bounded LRU cache of pickled values on local disk
+
+        Entries are stored one file per key. The file modification time is
+        the last access time and drives the LRU eviction; the creation time
+        is stored in a header before the value and drives the TTL, both on
+        read and on eviction.
+
+        The total size is tracked in memory and updated on each write and
+        removal. The directory is only scanned (and entries evicted) when
+        that size goes over the limit, or every SCAN_EVERY_WRITES writes to
+        catch up with the other processes sharing the directory.
+
+        Args:
+            directory: Cache directory
+            max_size_bytes: Max total size of the entries
+            ttl_seconds: Lifetime of an entry
+        """
+        self.directory = Path(directory)
+        self.max_size_bytes = max_size_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # Taille totale suivie en mémoire, None tant que le dossier n'a pas été parcouru
+        self._size: Optional[int] = None
+        self._writes = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, None on miss or expiry"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                created_at = self._read_created_at(f)
+                if created_at is None:
+                    raise ValueError("unknown entry format")
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning(f"⚠️ Dropping unreadable cache entry {path.name}: {e}")
+            self._remove(path)
+            return None
+
+        if time.time() - created_at > self.ttl_seconds:
+            self._remove(path)
+            return None
+
+        # Mark as recently used
+        os.utime(path)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, then evict the least recently used entries if needed"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Écriture atomique : un lecteur ne voit jamais un fichier partiel
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(HEADER.pack(HEADER_MAGIC, time.time()))
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            replaced = self._file_size(path)
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            self._writes += 1
+            if self._size is not None:
+                self._size += size - replaced
+            if self._size is None or self._size > self.max_size_bytes or self._writes >= SCAN_EVERY_WRITES:
+                self._evict()
+
+    def _remove(self, path: Path) -> None:
+        """Delete an entry and its size from the tracked total"""
+        size = self._file_size(path)
+        path.unlink(missing_ok=True)
+        with self._lock:
+            if self._size is not None:
+                self._size = max(0, self._size - size)
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _read_created_at(f) -> Optional[float]:
+        """Creation time from the header of an entry, None for an unknown format"""
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return None
+        magic, created_at = HEADER.unpack(header)
+        return created_at if magic == HEADER_MAGIC else None
+
+    def _evict(self) -> None:
+        """Scan the directory, remove expired entries, then the least recently used until under the size limit
+
+        Called with the lock held.
+        """
+        now = time.time()
+        entries = []
+        total_size = 0
+        for path in self.directory.glob('*/*.pkl'):
+            try:
+                stat = path.stat()
+                with open(path, 'rb') as f:
+                    created_at = self._read_created_at(f)
+            except FileNotFoundError:
+                continue
+            # Expiration sur la date de création, comme get : une entrée relue souvent expire aussi
+            if created_at is None or now - created_at > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        target_size = self.max_size_bytes if total_size <= self.max_size_bytes \
+            else int(self.max_size_bytes * EVICT_TO_RATIO)
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= target_size:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+
+        self._size = total_size
+        self._writes = 0
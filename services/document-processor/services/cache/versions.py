@@ -0,0 +1,19 @@
+import hashlib
+
+from core.config import ServiceConfig
+
+# À incrémenter quand un changement de code modifie les résultats du pipeline
+PIPELINE_REVISION = 3
+
+
+def pipeline_version(config: ServiceConfig) -> str:
+    """Identify everything that changes the output of the pipeline for the same PDF"""
+    parts = [
+        f"rev={PIPELINE_REVISION}",
+        f"model={config.tableau.model_repo_id}/{config.tableau.model_filename}",
+        f"ocr={config.ocr.x_tolerance},{config.ocr.debit_x_tolerance},"
+        f"{config.ocr.y_tolerance},{config.ocr.min_confidence}",
+        f"raster={config.rasterizer.backend},{config.rasterizer.dpi},{config.rasterizer.grayscale}",
+        f"text_layer={config.text_layer.enabled},{config.text_layer.min_chars}",
+    ]
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()[:16]
@@ -0,0 +1,4 @@
+from .manager import JobManager, QueueFullError, WorkersUnavailableError, job_manager
+from .models import Job
+
+__all__ = ['Job', 'JobManager', 'QueueFullError', 'WorkersUnavailableError', 'job_manager']
@@ -0,0 +1,336 @@
+import multiprocessing
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+from core.artifacts import ArtifactSession, ArtifactWriter
+from core.config import ServiceConfig
+from core.logger import log
+from core.metrics import metrics
+from services.cache.document_cache import DocumentCache
+from services.processor.models import ProcessedDocument
+from services.tableau.rasterizer import PdfiumRasterizer
+from . import worker
+from .models import Job
+
+
+class QueueFullError(Exception):
+    """Raised when too many jobs are already pending"""
+
+
+class WorkersUnavailableError(Exception):
+    """Raised when the workers could not load their models"""
+
+
+class JobManager:
+    def __init__(self, config: Optional[ServiceConfig] = None, executor: Optional[Executor] = None,
+                 document_cache: Optional[DocumentCache] = None):
+        """Run document processing jobs in a pool of worker processes
+
+        Each worker process loads its own models once (pool initializer) and
+        runs torch with its own thread budget. Documents are dispatched whole
+        to a worker, or split in page shards spread over the workers
+        (jobs.dispatch). Jobs are kept in memory, their files in a per-job
+        workspace.
+
+        Args:
+            config: Service configuration
+            executor: Executor running the jobs (a process pool if None)
+            document_cache: Cache of processed documents (a new one if None)
+        """
+        self.config = config or ServiceConfig()
+        self.document_cache = document_cache or DocumentCache(self.config)
+        self.artifacts = ArtifactWriter(self.config)
+        self._executor = executor
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._status_futures: List[Future] = []
+
+    def start(self) -> None:
+        """Start the worker pool and ask every worker to report its models status
+
+        One status request per worker is submitted right away, so every
+        process is forked and loads its models before the first job.
+        """
+        if self._executor is None:
+            self._executor = self._create_executor()
+        self._start_workers()
+
+    def _create_executor(self) -> Executor:
+        return ProcessPoolExecutor(
+            max_workers=self.config.jobs.worker_count,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=worker.init_worker,
+            initargs=(self.config,)
+        )
+
+    def _start_workers(self) -> None:
+        workers = self.config.jobs.worker_count
+        self._status_futures = [self._executor.submit(worker.worker_status) for _ in range(workers)]
+        log.info(f"👷 Started {workers} processing workers, {self.config.jobs.thread_budget} threads each")
+
+    def _restart(self, broken: Executor) -> None:
+        """Replace a pool broken by the death of a worker process (killed, out of memory)"""
+        with self._lock:
+            if self._executor is not broken:
+                # Déjà remplacé par un autre thread
+                return
+            log.warning("♻️ Worker pool is broken, starting a new one")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._create_executor()
+            self._start_workers()
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, cancelling the jobs not started yet"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def is_ready(self) -> bool:
+        """True once at least one worker has its models loaded"""
+        return any(
+            future.done() and not future.exception() and future.result()[0]
+            for future in self._status_futures
+        )
+
+    @property
+    def error(self) -> Optional[str]:
+        """Model loading error reported by a worker, if any"""
+        for future in self._status_futures:
+            if future.done():
+                if future.exception():
+                    return str(future.exception())
+                if future.result()[1]:
+                    return future.result()[1]
+        return None
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(not job.is_finished for job in self._jobs.values())
+
+    def create_job(self, filename: str) -> Job:
+        """Allocate a job and its workspace, the upload is written to job.pdf_path
+
+        Raises:
+            QueueFullError: If max_pending jobs are already queued or running
+        """
+        if self.pending_count >= self.config.jobs.max_pending:
+            raise QueueFullError()
+
+        job_id = uuid.uuid4().hex
+        workspace = Path(self.config.jobs.workspace_dir) / job_id
+        workspace.mkdir(parents=True, exist_ok=True)
+        return Job(id=job_id, filename=filename, workspace=workspace)
+
+    def discard(self, job: Job) -> None:
+        """Remove the workspace of a job that will not be submitted, e.g. a rejected upload"""
+        shutil.rmtree(job.workspace, ignore_errors=True)
+
+    def submit(self, job: Job, content_hash: str) -> Job:
+        """Queue a job, or complete it at once from the document cache
+
+        Raises:
+            QueueFullError: If max_pending jobs are already queued or running
+            WorkersUnavailableError: If the workers failed to load their models
+                                     or the job could not be handed to them
+        """
+        cached = self.document_cache.get(content_hash)
+        if cached is not None:
+            job.cache_status = "HIT"
+            job.pdf_path.unlink(missing_ok=True)
+            self._register(job)
+            self._finish(job, cached)
+            return job
+
+        if self.error is not None:
+            shutil.rmtree(job.workspace, ignore_errors=True)
+            raise WorkersUnavailableError(self.error)
+
+        with self._lock:
+            pending = sum(not other.is_finished for other in self._jobs.values())
+            if pending >= self.config.jobs.max_pending:
+                shutil.rmtree(job.workspace, ignore_errors=True)
+                raise QueueFullError()
+            self._jobs[job.id] = job
+
+        try:
+            job.future = self._dispatch(job)
+        except Exception as e:
+            # Un job jamais confié aux workers resterait "queued" et compterait dans max_pending
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            shutil.rmtree(job.workspace, ignore_errors=True)
+            log.log_error(e, f"dispatch of job {job.id}")
+            raise WorkersUnavailableError(str(e)) from e
+        job.future.add_done_callback(lambda future: self._on_done(job, content_hash, future))
+        log.info(f"📥 Queued job {job.id} for {job.filename}")
+        return job
+
+    def _dispatch(self, job: Job) -> Future:
+        """Send a job to the workers, whole or as page shards merged in one future
+
+        Before a document is split, a worker resolves its statement period,
+        which every shard is then parsed with. The future resolves to
+        (document, metrics snapshot of the worker).
+        """
+        shards = self._shards(job.pdf_path)
+        if len(shards) <= 1:
+            return self._submit(worker.process_job, job.pdf_path, job.workspace)
+
+        log.info(f"🔀 Splitting job {job.id} in {len(shards)} shards")
+        merged = Future()
+        merged.set_running_or_notify_cancel()
+        period = self._submit(worker.read_period, job.pdf_path, job.workspace)
+        period.add_done_callback(lambda future: self._dispatch_shards(job, shards, future, merged))
+        return merged
+
+    def _dispatch_shards(self, job: Job, shards: List[Optional[Sequence[int]]],
+                         period_future: Future, merged: Future) -> None:
+        """Submit the shards of a job with its statement period, their merged result set on `merged`"""
+        if period_future.cancelled():
+            merged.set_exception(CancelledError())
+            return
+
+        period = None
+        if period_future.exception() is not None:
+            # Chaque shard résoudra alors la période de ses propres pages
+            log.warning(f"⚠️ Could not read the statement period of job {job.id}: {period_future.exception()}")
+        else:
+            period = period_future.result()
+
+        futures = []
+        try:
+            for pages in shards:
+                futures.append(self._submit(worker.process_job, job.pdf_path, job.workspace, pages, period))
+        except BaseException as e:
+            for future in futures:
+                future.cancel()
+            merged.set_exception(e)
+            return
+
+        remaining = [len(futures)]
+        remaining_lock = threading.Lock()
+
+        def on_shard_done(_):
+            with remaining_lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            try:
+                # Métriques de chaque shard fusionnées ici, aucune à fusionner ensuite
+                merged.set_result((ProcessedDocument.merge([self._collect(future.result()) for future in futures]),
+                                   None))
+            except BaseException as e:
+                merged.set_exception(e)
+
+        for future in futures:
+            future.add_done_callback(on_shard_done)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        """Submit to the worker pool, replacing it once if a dead worker broke it"""
+        executor = self._executor
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._restart(executor)
+            return self._executor.submit(fn, *args)
+
+    def _shards(self, pdf_path: Path) -> List[Optional[Sequence[int]]]:
+        """Page ranges of a document in 'pages' dispatch mode, one range otherwise"""
+        if self.config.jobs.dispatch != "pages":
+            return [None]
+
+        try:
+            page_count = PdfiumRasterizer(self.config.rasterizer).page_count(pdf_path)
+        except Exception as e:
+            log.warning(f"⚠️ Could not count pages of {pdf_path.name}, not splitting it: {e}")
+            return [None]
+
+        size = max(1, self.config.jobs.pages_per_shard)
+        return [range(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def debug_artifacts(self, job_id: str) -> ArtifactSession:
+        """Artifacts saved in the workspace of a job"""
+        workspace = Path(self.config.jobs.workspace_dir) / job_id
+        return self.artifacts.session(job_id, self.config.for_workspace(workspace).output_folders)
+
+    def _register(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+
+    def _on_done(self, job: Job, content_hash: str, future: Future) -> None:
+        """Record the outcome of a job run by a worker"""
+        job.pdf_path.unlink(missing_ok=True)
+        if future.cancelled():
+            self._fail(job, "Job cancelled")
+            return
+
+        error = future.exception()
+        if error is not None:
+            log.log_error(error, f"job {job.id}")
+            self._fail(job, str(error))
+            return
+
+        result = self._collect(future.result())
+        try:
+            self.document_cache.set(content_hash, result)
+        except Exception as e:
+            log.warning(f"⚠️ Could not cache result of job {job.id}: {e}")
+        self._finish(job, result)
+
+    @staticmethod
+    def _collect(outcome) -> ProcessedDocument:
+        """Merge the metrics a worker sent back with its document"""
+        document, snapshot = outcome
+        metrics.merge(snapshot)
+        return document
+
+    def _fail(self, job: Job, error: str) -> None:
+        job.status, job.error = "failed", error
+        job.finished_at = time.time()
+        self._complete(job)
+
+    def _finish(self, job: Job, result: ProcessedDocument) -> None:
+        job.result = result
+        if result.error is not None:
+            self._fail(job, result.error)
+        elif not result.transactions:
+            self._fail(job, "No transactions found in PDF")
+        else:
+            job.status = "done"
+            job.finished_at = time.time()
+            log.info(f"✅ Job {job.id} done")
+            self._complete(job)
+
+    def _complete(self, job: Job) -> None:
+        """Wake up whoever waits for the job, once its outcome is recorded"""
+        self._prune()
+        if not job.completed.done():
+            job.completed.set_result(job)
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond keep_finished, with their workspace"""
+        with self._lock:
+            finished = [job for job in self._jobs.values() if job.is_finished]
+            expired = finished[:max(0, len(finished) - self.config.jobs.keep_finished)]
+            for job in expired:
+                del self._jobs[job.id]
+
+        for job in expired:
+            shutil.rmtree(job.workspace, ignore_errors=True)
+
+
+# Instance globale du gestionnaire de jobs
+job_manager = JobManager()
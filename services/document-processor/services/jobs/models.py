@@ -0,0 +1,48 @@
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from services.processor.models import ProcessedDocument
+
+
+@dataclass
+class Job:
+    id: str
+    filename: str
+    workspace: Path
+    status: str = "queued"  # queued, running, done, failed
+    cache_status: str = "MISS"
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    result: Optional[ProcessedDocument] = None
+    error: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False)
+    # Résolu une fois le résultat ou l'erreur enregistrés sur le job (après `future`)
+    completed: Future = field(default_factory=Future, repr=False)
+
+    @property
+    def pdf_path(self) -> Path:
+        """Uploaded PDF, named after the job so its artifacts are too"""
+        return self.workspace / f"{self.id}.pdf"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def current_status(self) -> str:
+        """Status, reporting queued jobs already picked up by a worker as running"""
+        if self.status == "queued" and self.future is not None and self.future.running():
+            return "running"
+        return self.status
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.current_status(),
+            "filename": self.filename,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
@@ -0,0 +1,56 @@
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import torch
+
+from core.config import ServiceConfig
+from core.logger import log
+from core.metrics import metrics
+from services.processor.models import ProcessedDocument
+from services.processor.parser import StatementPeriod
+from services.registry.model_registry import ModelRegistry
+
+# Registre des modèles du processus worker, chargé par init_worker
+_registry: Optional[ModelRegistry] = None
+
+
+def init_worker(config: ServiceConfig) -> None:
+    """Pool initializer: pin the thread budget, then load and warm up the models"""
+    global _registry
+    # Sans budget, chaque worker prendrait tous les cœurs et ils se marcheraient dessus
+    torch.set_num_threads(config.jobs.thread_budget)
+    torch.set_num_interop_threads(1)
+    log.info(f"🧵 Worker using {config.jobs.thread_budget} torch threads")
+
+    _registry = ModelRegistry(config)
+    _registry.initialize()
+
+
+def worker_status() -> Tuple[bool, Optional[str]]:
+    """Return (ready, error) for the models of this worker process"""
+    return _registry.is_ready, _registry.error
+
+
+def read_period(pdf_path: Path, workspace: Path) -> StatementPeriod:
+    """Resolve the statement period of an uploaded PDF, before its shards are dispatched"""
+    processor = _registry.create_processor(_registry.config.for_workspace(workspace))
+    return processor.read_period(pdf_path)
+
+
+def process_job(pdf_path: Path, workspace: Path, pages: Optional[Sequence[int]] = None,
+                period: Optional[StatementPeriod] = None) -> Tuple[ProcessedDocument, Dict[str, Any]]:
+    """Process one uploaded PDF, or a shard of its pages, writing its outputs in the job workspace
+
+    Args:
+        pdf_path: Uploaded PDF
+        workspace: Workspace of the job
+        pages: Pages of the shard (every page if None)
+        period: Statement period of the whole document, for a shard
+
+    Returns:
+        The document and the metrics observed by this worker since its
+        previous job, merged by the API process
+    """
+    processor = _registry.create_processor(_registry.config.for_workspace(workspace))
+    document = processor.process_document(pdf_path, pages=pages, period=period)
+    return document, metrics.drain()
@@ -1,5 +1,7 @@
 from .extractor import OcrExtractor
+from .layout import LayoutAnalyzer
+from .text_layer import TextLayerExtractor, TextLayerPage
 
 from .models import BoundingBox, Word, Line
 
-__all__ = ['OcrExtractor', 'BoundingBox', 'Word', 'Line']
\ No newline at end of file
+__all__ = ['OcrExtractor', 'LayoutAnalyzer', 'TextLayerExtractor', 'TextLayerPage', 'BoundingBox', 'Word', 'Line']
\ No newline at end of file
@@ -0,0 +1,192 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.config import ServiceConfig
+from .models import BoundingBox, Line, Word
+
+
+class LayoutAnalyzer:
+    def __init__(self, config: Optional[ServiceConfig] = None):
+        """Turn positioned words into lines of merged cells
+
+        The only implementation of the layout rules, shared by the OCR and
+        text layer paths:
+        - lines: words sorted by y center are swept into lines, a line takes
+          every following word within ocr.y_tolerance of its first word
+        - cells: inside a line, words sorted by x center are merged while the
+          gap to the previous word is within ocr.x_tolerance and both are of
+          the same type (number or text)
+        - debit: amounts aligned with the DEBIT header are made negative
+
+        Everything works on sorted NumPy arrays; Python only loops over lines
+        and over the output cells.
+
+        Args:
+            config: Service configuration (ocr section)
+        """
+        self.config = config or ServiceConfig()
+
+    def analyze(self, words: Sequence[Word], region_x: int = 0) -> List[Line]:
+        """Words in page pixels in, lines of merged cells out (debit amounts marked)
+
+        Args:
+            words: Words of one region
+            region_x: Left edge of the region, the debit column is located relative to it
+        """
+        if not words:
+            return []
+        texts, boxes, confidences = self.to_arrays(words)
+        texts = self.mark_debit_column(texts, boxes[:, 0] - region_x)
+        return self.build_lines(texts, boxes, confidences)
+
+    def build_lines(self, texts: List[str], boxes: np.ndarray, confidences: np.ndarray) -> List[Line]:
+        """Group words into sorted lines of merged cells
+
+        Args:
+            texts: Word texts
+            boxes: Word boxes (n, 4) as x1, y1, x2, y2 in page pixels
+            confidences: Word confidences
+
+        Returns:
+            Lines sorted by y position, their cells sorted by x center
+        """
+        if len(texts) == 0:
+            return []
+        order, line_starts = self._order(boxes, cluster=True)
+        return self._merge(texts, boxes, confidences, order, line_starts)
+
+    def group_lines(self, words: Sequence[Word]) -> List[Line]:
+        """Group words into sorted lines, without merging them"""
+        if not words:
+            return []
+        _, boxes, _ = self.to_arrays(words)
+        order, line_starts = self._order(boxes, cluster=True)
+        y_centers = ((boxes[:, 1] + boxes[:, 3]) / 2)[order].tolist()
+        order = order.tolist()
+
+        lines = [
+            Line(words=[words[index] for index in order[start:end]],
+                 y_position=sum(y_centers[start:end]) / (end - start))
+            for start, end in zip(line_starts, line_starts[1:] + [len(order)])
+        ]
+        lines.sort(key=lambda line: line.y_position)
+        return lines
+
+    def merge_words(self, words: Sequence[Word]) -> List[Word]:
+        """Merge the close words of a single line, sorted by x center"""
+        if not words:
+            return []
+        texts, boxes, confidences = self.to_arrays(words)
+        order, line_starts = self._order(boxes, cluster=False)
+        return self._merge(texts, boxes, confidences, order, line_starts)[0].words
+
+    def mark_debit_column(self, texts: List[str], x_positions: np.ndarray) -> List[str]:
+        """Mark the amounts aligned with the DEBIT header as negative
+
+        Args:
+            texts: Word texts
+            x_positions: Left edge of each word, relative to its region
+
+        Returns:
+            The texts, a new list when some amounts were marked
+        """
+        debit_index = next((index for index, text in enumerate(texts) if text.upper() == "DEBIT"), None)
+        if debit_index is None:
+            return texts
+
+        in_column = np.abs(x_positions - x_positions[debit_index]) < self.config.ocr.debit_x_tolerance
+        texts = list(texts)
+        for index in np.flatnonzero(in_column):
+            texts[index] = self.mark_debit_amount(texts[index])
+        return texts
+
+    @staticmethod
+    def mark_debit_amount(text: str) -> str:
+        """Turn an amount of the debit column into a negative number"""
+        try:
+            number = float(text.replace(',', '.').replace(' ', ''))
+            return f"-{abs(number)}"
+        except ValueError:
+            return text
+
+    @staticmethod
+    def to_arrays(words: Sequence[Word]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Texts, boxes (n, 4) and confidences of words"""
+        boxes = np.array([(w.bbox.x1, w.bbox.y1, w.bbox.x2, w.bbox.y2) for w in words], dtype=np.int64)
+        return [w.text for w in words], boxes.reshape(-1, 4), np.array([w.confidence for w in words])
+
+    def _order(self, boxes: np.ndarray, cluster: bool) -> Tuple[np.ndarray, List[int]]:
+        """Reading order of the words and index of the first word of each line
+
+        Args:
+            boxes: Word boxes (n, 4)
+            cluster: Split the words into lines, or keep them on one line
+
+        Returns:
+            Word indexes sorted by line then x center, start of each line in that order
+        """
+        count = len(boxes)
+        x_centers = (boxes[:, 0] + boxes[:, 2]) / 2
+        if not cluster:
+            return np.argsort(x_centers, kind='stable'), [0]
+
+        # Balayage des mots triés par centre y : une recherche dichotomique par ligne
+        y_centers = (boxes[:, 1] + boxes[:, 3]) / 2
+        by_y = np.argsort(y_centers, kind='stable')
+        y_sweep = y_centers[by_y]
+        line_starts = []
+        start = 0
+        while start < count:
+            line_starts.append(start)
+            start = int(np.searchsorted(y_sweep, y_sweep[start] + self.config.ocr.y_tolerance, side='right'))
+        line_ids = np.repeat(np.arange(len(line_starts)), np.diff(line_starts + [count]))
+
+        # Ordre par ligne puis par centre x (lexsort est stable)
+        return by_y[np.lexsort((x_centers[by_y], line_ids))], line_starts
+
+    def _merge(self, texts: List[str], boxes: np.ndarray, confidences: np.ndarray,
+               order: np.ndarray, line_starts: List[int]) -> List[Line]:
+        """Merge consecutive close words of each line into cells
+
+        A new cell starts at each line change, large gap or type change.
+        Averages are summed in word order, so results do not depend on
+        NumPy's pairwise summation.
+        """
+        count = len(order)
+        line_ends = line_starts[1:] + [count]
+        word_lines = np.repeat(np.arange(len(line_starts)), np.diff(line_starts + [count]))
+
+        is_number = np.array([Word.is_number(texts[index]) for index in order])
+        breaks = (
+            (boxes[order[1:], 0] - boxes[order[:-1], 2] > self.config.ocr.x_tolerance)
+            | (is_number[1:] != is_number[:-1])
+            | (word_lines[1:] != word_lines[:-1])
+        )
+        group_starts = np.flatnonzero(np.concatenate(([True], breaks)))
+        group_ends = np.append(group_starts[1:], count)
+
+        sorted_boxes = boxes[order]
+        merged_x1 = np.minimum.reduceat(sorted_boxes[:, 0], group_starts).tolist()
+        merged_y1 = np.minimum.reduceat(sorted_boxes[:, 1], group_starts).tolist()
+        merged_x2 = np.maximum.reduceat(sorted_boxes[:, 2], group_starts).tolist()
+        merged_y2 = np.maximum.reduceat(sorted_boxes[:, 3], group_starts).tolist()
+        group_lines = word_lines[group_starts].tolist()
+        order = order.tolist()
+
+        sorted_y = ((sorted_boxes[:, 1] + sorted_boxes[:, 3]) / 2).tolist()
+        sorted_confidences = confidences[order].tolist()
+        line_words = [[] for _ in line_starts]
+        for group, (start, end) in enumerate(zip(group_starts.tolist(), group_ends.tolist())):
+            line_words[group_lines[group]].append(Word(
+                text=''.join(texts[index] for index in order[start:end]).replace(' ', ''),
+                confidence=sum(sorted_confidences[start:end]) / (end - start),
+                bbox=BoundingBox(merged_x1[group], merged_y1[group], merged_x2[group], merged_y2[group])
+            ))
+
+        lines = [
+            Line(words=words, y_position=sum(sorted_y[start:end]) / (end - start))
+            for words, start, end in zip(line_words, line_starts, line_ends)
+        ]
+        lines.sort(key=lambda line: line.y_position)
+        return lines
@@ -1,7 +1,10 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List
 
-@dataclass
+# Modèles compacts (slots, immuables) : un document produit des dizaines de
+# milliers de mots, sans __dict__ par instance ni conversion en dictionnaires
+
+@dataclass(frozen=True, slots=True)
 class BoundingBox:
     x1: int
     y1: int
@@ -16,12 +19,15 @@ class BoundingBox:
     def y_center(self) -> float:
         return (self.y1 + self.y2) / 2
 
-@dataclass
+    def to_dict(self) -> Dict[str, int]:
+        return {'x1': self.x1, 'y1': self.y1, 'x2': self.x2, 'y2': self.y2}
+
+@dataclass(frozen=True, slots=True)
 class Word:
     text: str
     confidence: float
     bbox: BoundingBox
-    
+
     @property
     def x_center(self) -> float:
         return self.bbox.x_center
@@ -37,7 +43,33 @@ class Word:
     def is_same_type(self, other: 'Word') -> bool:
         return self.is_number(self.text) == self.is_number(other.text)
 
-@dataclass
+    def to_dict(self) -> Dict:
+        return {
+            'text': self.text,
+            'confidence': self.confidence,
+            'bbox': self.bbox.to_dict(),
+            'y_center': self.y_center,
+            'x_center': self.x_center
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Word':
+        return cls(text=data['text'], confidence=data.get('confidence', 0.0), bbox=BoundingBox(**data['bbox']))
+
+@dataclass(frozen=True, slots=True)
 class Line:
     words: List[Word]
-    y_position: float
\ No newline at end of file
+    y_position: float
+
+    @property
+    def text(self) -> str:
+        """Words of the line joined by spaces"""
+        return ' '.join(word.text for word in self.words)
+
+    def to_dict(self) -> Dict:
+        """JSON form of the line, as saved in the debug artifacts"""
+        return {'words': [word.to_dict() for word in self.words], 'y_position': self.y_position}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Line':
+        return cls(words=[Word.from_dict(word) for word in data['words']], y_position=data['y_position'])
@@ -0,0 +1,162 @@
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+
+from core.config import ServiceConfig
+from core.logger import log
+from .models import Word, BoundingBox
+
+# Écart horizontal (en hauteurs de caractère) au-delà duquel deux caractères
+# consécutifs appartiennent à deux mots différents
+WORD_GAP_RATIO = 0.5
+# Part de la page couverte par une image au-delà de laquelle la page est traitée comme un scan
+SCAN_IMAGE_COVERAGE = 0.5
+# Mots d'une ligne de relevé : date (02.01, 02.01.2024) et montant (1.234,56, -42,50, 2500.00)
+_DATE_WORD = re.compile(r'\d{1,2}\.\d{1,2}(?:\.\d{4})?')
+_AMOUNT_WORD = re.compile(r'[+-]?\d[\d.]*,\d{2}|[+-]?\d+\.\d{2}')
+
+
+@dataclass
+class TextLayerPage:
+    words: List[Word]
+    box: List[float]
+
+
+class TextLayerExtractor:
+    def __init__(self, config: Optional[ServiceConfig] = None):
+        """Initialize TextLayerExtractor
+
+        Args:
+            config: Service configuration
+        """
+        self.config = config or ServiceConfig()
+        # Same pixel space as the rasterized pages, so OCR tolerances apply as is
+        self.scale = self.config.rasterizer.dpi / 72
+
+    def extract_document(self, pdf_path: Path,
+                         page_numbers: Optional[Sequence[int]] = None) -> List[Optional[TextLayerPage]]:
+        """Read the embedded text layer of every page
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_numbers: 0-based pages to read (all pages if None)
+
+        Returns:
+            One entry per page read: the page words, or None when the page
+            has no usable text layer and needs OCR
+        """
+        pdf = pdfium.PdfDocument(str(pdf_path))
+        try:
+            pages = []
+            for page_index in (range(len(pdf)) if page_numbers is None else page_numbers):
+                page = pdf[page_index]
+                pages.append(self._extract_page(page))
+                page.close()
+
+            usable = sum(page is not None for page in pages)
+            log.info(f"📝 Text layer found on {usable}/{len(pages)} pages")
+            return pages
+        finally:
+            pdf.close()
+
+    def _extract_page(self, page) -> Optional[TextLayerPage]:
+        """Build words from the text layer of one page
+
+        A page mostly covered by an image is a scan: its text layer is only
+        used when it holds statement lines (a searchable scan), not when it
+        is a small overlay such as a bank header or page numbers.
+        """
+        textpage = page.get_textpage()
+        try:
+            char_count = textpage.count_chars()
+            if char_count < self.config.text_layer.min_chars:
+                return None
+
+            width, height = page.get_size()
+            words = self._extract_words(textpage, char_count, height)
+            if not words:
+                return None
+            if self._is_scanned(page, width * height) and not self._has_statement_lines(words):
+                return None
+
+            return TextLayerPage(
+                words=words,
+                box=[0, 0, int(width * self.scale), int(height * self.scale)]
+            )
+        finally:
+            textpage.close()
+
+    @staticmethod
+    def _is_scanned(page, page_area: float) -> bool:
+        """True when an image covers most of the page"""
+        for image in page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_IMAGE]):
+            left, bottom, right, top = image.get_bounds()
+            if (right - left) * (top - bottom) >= SCAN_IMAGE_COVERAGE * page_area:
+                return True
+        return False
+
+    @staticmethod
+    def _has_statement_lines(words: List[Word]) -> bool:
+        """True when the words hold both transaction dates and amounts"""
+        dates = [_DATE_WORD.fullmatch(word.text) is not None for word in words]
+        has_amount = any(
+            not is_date and _AMOUNT_WORD.fullmatch(word.text) for word, is_date in zip(words, dates)
+        )
+        return any(dates) and has_amount
+
+    def _extract_words(self, textpage, char_count: int, page_height: float) -> List[Word]:
+        """Group the characters of a text page into words"""
+        words = []
+        chars = []
+        boxes = []
+
+        for index in range(char_count):
+            char = chr(pdfium_c.FPDFText_GetUnicode(textpage.raw, index))
+            if not char.strip():
+                self._flush_word(chars, boxes, words, page_height)
+                continue
+
+            box = textpage.get_charbox(index, loose=True)
+            if boxes and self._is_new_word(boxes[-1], box):
+                self._flush_word(chars, boxes, words, page_height)
+
+            chars.append(char)
+            boxes.append(box)
+
+        self._flush_word(chars, boxes, words, page_height)
+        return words
+
+    @staticmethod
+    def _is_new_word(previous, box) -> bool:
+        """Check if a character starts a new word (gap or new line)"""
+        char_height = max(previous[3] - previous[1], 1e-6)
+        gap = box[0] - previous[2]
+        return gap > WORD_GAP_RATIO * char_height or abs(box[1] - previous[1]) > char_height / 2
+
+    def _flush_word(self, chars: List[str], boxes: List, words: List[Word], page_height: float) -> None:
+        """Turn the pending characters into a Word, in page pixel coordinates"""
+        if not chars:
+            return
+
+        # Les coordonnées PDF partent du bas de la page
+        left = min(box[0] for box in boxes)
+        bottom = min(box[1] for box in boxes)
+        right = max(box[2] for box in boxes)
+        top = max(box[3] for box in boxes)
+
+        words.append(Word(
+            text=''.join(chars),
+            confidence=1.0,
+            bbox=BoundingBox(
+                x1=int(left * self.scale),
+                y1=int((page_height - top) * self.scale),
+                x2=int(right * self.scale),
+                y2=int((page_height - bottom) * self.scale)
+            )
+        ))
+        chars.clear()
+        boxes.clear()
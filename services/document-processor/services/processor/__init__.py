@@ -1,5 +1,6 @@
 from .processor import DocumentProcessor
 
-from .models import ProcessedDocument, Transaction
+from .models import DocumentTimings, ProcessedDocument, Transaction
+from .parser import StatementParser, StatementPeriod
 
-__all__ = ['DocumentProcessor','ProcessedDocument', 'Transaction']
\ No newline at end of file
+__all__ = ['DocumentProcessor', 'DocumentTimings', 'ProcessedDocument', 'Transaction', 'StatementParser', 'StatementPeriod']
\ No newline at end of file
@@ -1,5 +1,7 @@
-from dataclasses import dataclass
-from typing import Optional
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 from datetime import date
 from decimal import Decimal
 
@@ -18,13 +20,90 @@ class Transaction:
             date=current_date or date.today(),
             description=line_data.get('description', ''),
             amount=float(str(line_data.get('amount', 0))),
-            raw_text=' '.join(w['text'] for w in line_data.get('words', []))
+            raw_text=' '.join(w.text for w in line_data.get('words', []))
         )
 
+@dataclass
+class DocumentTimings:
+    """Where the processing time of a document went
+
+    Stage times are wall-clock seconds summed over the calls of each stage.
+    A call working on several pages (a rendered window, a detection batch,
+    an OCR batch) is shared evenly between them in `pages`.
+    """
+    stages: Dict[str, float] = field(default_factory=dict)
+    pages: Dict[int, Dict[str, float]] = field(default_factory=dict)
+    cpu_time: float = 0.0
+    # Croissance du pic de mémoire résidente du worker pendant le traitement
+    peak_rss_delta: int = 0
+
+    def add(self, stage: str, seconds: float, pages: Sequence[int] = ()) -> None:
+        """Add the duration of one stage call, shared between the pages it worked on
+
+        Each pipeline stage records from its own thread, under its own stage
+        name, so no two threads update the same entry.
+        """
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        if pages:
+            share = seconds / len(pages)
+            for page in pages:
+                page_stages = self.pages.setdefault(page, {})
+                page_stages[stage] = page_stages.get(stage, 0.0) + share
+
+    @contextmanager
+    def measure(self, stage: str, pages: Sequence[int] = ()) -> Iterator[None]:
+        """Time the block as one call of a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start, pages)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON form, pages in page order with their total time"""
+        return {
+            'stages': {stage: round(seconds, 4) for stage, seconds in self.stages.items()},
+            'pages': [
+                {'page': page, 'total': round(sum(stages.values()), 4),
+                 **{stage: round(seconds, 4) for stage, seconds in stages.items()}}
+                for page, stages in sorted(self.pages.items())
+            ],
+            'cpu_time': round(self.cpu_time, 4),
+            'peak_rss_delta_bytes': self.peak_rss_delta,
+        }
+
+    @classmethod
+    def merge(cls, parts: List['DocumentTimings']) -> 'DocumentTimings':
+        """Combine the timings of the page shards of one document"""
+        merged = cls()
+        for part in parts:
+            for stage, seconds in part.stages.items():
+                merged.stages[stage] = merged.stages.get(stage, 0.0) + seconds
+            merged.pages.update(part.pages)
+            merged.cpu_time += part.cpu_time
+            merged.peak_rss_delta = max(merged.peak_rss_delta, part.peak_rss_delta)
+        return merged
+
 @dataclass
 class ProcessedDocument:
     transactions: list[Transaction]
     page_count: int
     filename: str
     processing_time: float
-    error: Optional[str] = None
\ No newline at end of file
+    error: Optional[str] = None
+    # Identifiant des fichiers de debug, quand le document a été retenu par la politique d'artefacts
+    artifacts_id: Optional[str] = None
+    timings: Optional[DocumentTimings] = None
+
+    @classmethod
+    def merge(cls, parts: List['ProcessedDocument']) -> 'ProcessedDocument':
+        """Combine the results of the page shards of one document, in page order"""
+        return cls(
+            transactions=[transaction for part in parts for transaction in part.transactions],
+            page_count=sum(part.page_count for part in parts),
+            filename=parts[0].filename,
+            processing_time=max(part.processing_time for part in parts),
+            error=next((part.error for part in parts if part.error is not None), None),
+            artifacts_id=parts[0].artifacts_id,
+            timings=DocumentTimings.merge([part.timings for part in parts if part.timings is not None])
+        )
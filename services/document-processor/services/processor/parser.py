@@ -0,0 +1,323 @@
+import importlib.util
+import re
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.config import ServiceConfig
+from core.logger import log
+from core.metrics import stage_seconds
+from services.ocr.models import Line
+from .models import Transaction
+
+# Date en début de ligne de transaction : jour et mois, année optionnelle (2.1, 02.01, 02.01.2024)
+_LINE_DATE = re.compile(r'(\d{1,2})\.(\d{1,2})(?:\.(\d{4})(?!\d))?')
+# Date complète dans l'en-tête, un solde... (02.01.2024, 02/01/2024)
+_FULL_DATE = re.compile(r'(\d{1,2})[./-](\d{1,2})[./-](\d{4})(?!\d)')
+# Période du relevé : "du 01.12.2023 au 31.01.2024" (espaces retirés par la fusion OCR acceptés)
+_PERIOD = re.compile(
+    r'du[^\S\n]*(\d{1,2})[./-](\d{1,2})[./-](\d{4})[^\S\n]*au[^\S\n]*(\d{1,2})[./-](\d{1,2})[./-](\d{4})',
+    re.IGNORECASE
+)
+# Même motif en syntaxe RE2 (chaînes Arrow, sans lookahead) : jour, mois, année sur 4 chiffres ou vide
+_LINE_DATE_RE2 = r'^(\d{1,2})\.(\d{1,2})(?:\.(\d{4})(?:\D.*)?$|.*$)'
+# Montant une fois normalisé ("1 234,56" -> "1234.56")
+_AMOUNT = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)')
+_SPACES = re.compile(r'\s')
+
+FRAME_COLUMNS = ['date', 'description', 'amount', 'raw_text']
+
+# Chaînes Arrow quand pyarrow est installé : les opérations .str de pandas tournent alors en C++
+HAS_ARROW_STRINGS = importlib.util.find_spec("pyarrow") is not None
+STRING_DTYPE = "string[pyarrow]" if HAS_ARROW_STRINGS else object
+
+
+@lru_cache(maxsize=4096)
+def _make_date(year: int, month: int, day: int) -> date:
+    """Memoized date construction, a statement reuses a few dozen dates"""
+    return date(year, month, day)
+
+
+def parse_amount(text: str) -> Optional[float]:
+    """Parse a French or English formatted amount ("1 234,56", "-12.5", "1,234.56")
+
+    The separator that comes last is the decimal one, the other is a
+    thousands separator.
+
+    Returns:
+        The amount, None if the text is not a number
+    """
+    text = _SPACES.sub('', text)
+    if text.rfind(',') > text.rfind('.'):
+        text = text.replace('.', '').replace(',', '.')
+    else:
+        text = text.replace(',', '')
+    if not _AMOUNT.fullmatch(text):
+        return None
+    return float(text)
+
+
+def parse_amounts(texts: pd.Series) -> pd.Series:
+    """Vectorized parse_amount, NaN where the text is not a number"""
+    texts = texts.str.replace(_SPACES.pattern, '', regex=True)
+    # Virgule décimale : une virgule qui n'est suivie d'aucun point
+    comma_decimal = texts.str.contains(r',[^.]*$', regex=True)
+    texts = texts.str.replace('.', '', regex=False).str.replace(',', '.', regex=False).where(
+        comma_decimal, texts.str.replace(',', '', regex=False)
+    )
+    return texts.where(texts.str.fullmatch(_AMOUNT.pattern), 'nan').astype(float)
+
+
+@dataclass(frozen=True)
+class StatementPeriod:
+    start: date
+    end: date
+
+    def year_for(self, month: int) -> int:
+        """Year of a transaction dated by day and month only
+
+        For a period spanning a new year (December to January), months from
+        the start month on belong to the first year.
+        """
+        if self.start.year == self.end.year or month >= self.start.month:
+            return self.start.year
+        return self.end.year
+
+    def years_for(self, months: np.ndarray) -> np.ndarray:
+        """Vectorized year_for"""
+        if self.start.year == self.end.year:
+            return np.full(len(months), self.start.year)
+        return np.where(months >= self.start.month, self.start.year, self.end.year)
+
+
+class StatementParser:
+    def __init__(self, config: ServiceConfig, reference_year: Optional[int] = None,
+                 period: Optional[StatementPeriod] = None):
+        """Parse the transaction lines of one document
+
+        Lines are collected page by page as columns (page, text, first and
+        last words, words in between) and parsed when the document is
+        finished, with the year of the statement: its period ("du ... au
+        ..."), else the most frequent year of the full dates found in the
+        document, else `reference_year`. A shard of a document is parsed
+        with the `period` resolved for the whole document.
+
+        finish() parses line by line into Transaction objects;
+        finish_frame() parses every line at once with pandas, for callers
+        that work on frames. Both give the same transactions. The document
+        processor only uses finish_frame() when parser.bulk_min_lines opts
+        in (see is_bulk): converted back to Transaction objects, the frame
+        is not faster than finish().
+
+        Args:
+            config: Service configuration
+            reference_year: Year used when the document gives none (current year if None)
+            period: Period of the statement, when already known (looked for in the lines if None)
+        """
+        self.config = config
+        self.reference_year = reference_year or datetime.now().year
+        self.period = period
+        self._years: Counter = Counter()
+        # Lignes collectées en colonnes : page, texte, premier mot, dernier mot, mots entre les deux
+        self._pages: List[int] = []
+        self._texts: List[str] = []
+        self._firsts: List[str] = []
+        self._lasts: List[str] = []
+        self._descriptions: List[str] = []
+
+    @property
+    def line_count(self) -> int:
+        return len(self._texts)
+
+    @property
+    def is_bulk(self) -> bool:
+        """True when bulk parsing is enabled (parser.bulk_min_lines > 0), reached and Arrow strings available"""
+        return HAS_ARROW_STRINGS and 0 < self.config.parser.bulk_min_lines <= self.line_count
+
+    def add_lines(self, lines: List[Line], page_num: int) -> None:
+        """Collect the OCR lines of a page (or of a table of the page)
+
+        Args:
+            lines: Processed OCR lines
+            page_num: Page number of the lines
+        """
+        for line in lines:
+            words = line.words
+            if not words:
+                continue
+            text = line.text
+            first, last = words[0].text, words[-1].text
+            self._pages.append(page_num)
+            self._texts.append(text)
+            self._firsts.append(first)
+            self._lasts.append(last)
+            # Libellé : mots entre la date et le montant, découpés dans le texte déjà joint
+            self._descriptions.append(text[len(first) + 1:len(text) - len(last) - 1])
+
+    def finish(self) -> List[Transaction]:
+        """Parse the collected lines and return the transactions in page order
+
+        Each line is parsed in one pass. Lines whose day and month do not
+        form a valid date are dropped.
+        """
+        with stage_seconds.labels("extract_transactions").time():
+            return self._finish()
+
+    def _finish(self) -> List[Transaction]:
+        parsed = []
+        for page_num, text, last, description in zip(self._pages, self._texts, self._lasts, self._descriptions):
+            match = _LINE_DATE.match(text)
+            amount = parse_amount(last) if match is not None else None
+            if amount is None:
+                self._observe(text)
+                continue
+
+            day, month, year = match.groups()
+            if year is not None:
+                self._years[int(year)] += 1
+            parsed.append((page_num, int(day), int(month), int(year) if year else None, description, amount, text))
+
+        period = self.resolve_period()
+        transactions = []
+        for page_num, day, month, year, description, amount, text in sorted(parsed, key=lambda row: row[0]):
+            try:
+                transaction_date = _make_date(year or period.year_for(month), month, day)
+            except ValueError:
+                continue
+            transactions.append(Transaction(
+                date=transaction_date, description=description, amount=amount, raw_text=text
+            ))
+        self._log_sample(transactions)
+        return transactions
+
+    def finish_frame(self) -> pd.DataFrame:
+        """Parse every collected line at once
+
+        Only string operations that pandas runs natively on Arrow strings
+        are used (match, replace, fullmatch, astype); the few header lines
+        are searched with `re` on one joined text.
+
+        Returns:
+            Transactions in page order, FRAME_COLUMNS plus `page`, with
+            datetime64 dates (the layout of TransactionExtractor.to_dataframe)
+        """
+        with stage_seconds.labels("extract_transactions").time():
+            return self._finish_frame()
+
+    def _finish_frame(self) -> pd.DataFrame:
+        if not self._texts:
+            return pd.DataFrame(columns=['page'] + FRAME_COLUMNS)
+
+        texts = self._texts
+        # La date ne peut couvrir que le premier mot : motifs appliqués aux mots, plus courts que les lignes
+        firsts = pd.Series(self._firsts, dtype=STRING_DTYPE)
+        lasts = pd.Series(self._lasts, dtype=STRING_DTYPE)
+
+        # Dates en début de ligne, puis montants des seules lignes datées
+        dated = firsts.str.match(_LINE_DATE_RE2).to_numpy(dtype=bool)
+        dated_firsts = firsts[dated]
+        days = dated_firsts.str.replace(_LINE_DATE_RE2, r'\1', regex=True).astype(int).to_numpy()
+        months = dated_firsts.str.replace(_LINE_DATE_RE2, r'\2', regex=True).astype(int).to_numpy()
+        years = dated_firsts.str.replace(_LINE_DATE_RE2, r'\3', regex=True)
+        years = years.where(years.str.len() == 4, '0').astype(int).to_numpy()
+        amounts = parse_amounts(lasts[dated]).to_numpy()
+
+        rows = np.flatnonzero(dated)
+        valid = ~np.isnan(amounts)
+        is_transaction = np.zeros(len(texts), dtype=bool)
+        is_transaction[rows[valid]] = True
+        rows, days, months, years, amounts = rows[valid], days[valid], months[valid], years[valid], amounts[valid]
+
+        self._observe_all([text for text, skip in zip(texts, is_transaction) if not skip],
+                          np.flatnonzero(~is_transaction), rows[years > 0], years[years > 0])
+
+        years = np.where(years > 0, years, self.resolve_period().years_for(months))
+        transaction_dates = pd.to_datetime(
+            pd.DataFrame({'year': years, 'month': months, 'day': days}), errors='coerce'
+        )
+
+        result = pd.DataFrame({
+            'page': np.asarray(self._pages)[rows],
+            'date': transaction_dates.to_numpy(),
+            'description': np.asarray(self._descriptions, dtype=object)[rows],
+            'amount': amounts,
+            'raw_text': np.asarray(texts, dtype=object)[rows],
+        })
+        result = result[result['date'].notna()].sort_values('page', kind='stable').reset_index(drop=True)
+        log.debug("Parsed {} transactions from {} lines in bulk", len(result), len(texts))
+        return result
+
+    def resolve_period(self) -> StatementPeriod:
+        """Period of the statement, resolved once for the whole document"""
+        if self.period is not None:
+            return self.period
+
+        if self._years:
+            year = self._years.most_common(1)[0][0]
+            source = "document dates"
+        else:
+            year = self.reference_year
+            source = "current year"
+        log.debug("📅 Statement year {} ({})", year, source)
+        return StatementPeriod(date(year, 1, 1), date(year, 12, 31))
+
+    def _observe(self, text: str) -> None:
+        """Look for the statement period or full dates in a non-transaction line"""
+        if self.period is not None:
+            return
+
+        match = _PERIOD.search(text)
+        if match is not None and self._set_period(match.groups()):
+            return
+
+        for _, _, year in _FULL_DATE.findall(text):
+            self._years[int(year)] += 1
+
+    def _observe_all(self, texts: List[str], text_rows: np.ndarray,
+                     explicit_rows: np.ndarray, explicit_years: np.ndarray) -> None:
+        """Bulk _observe: period and full-date years, counted in line order
+
+        Args:
+            texts: Non-transaction lines
+            text_rows: Line index of each text
+            explicit_rows: Line index of the transactions with an explicit year
+            explicit_years: Their year
+        """
+        if self.period is not None:
+            return
+
+        joined = '\n'.join(texts)
+        for match in _PERIOD.finditer(joined):
+            if self._set_period(match.groups()):
+                return
+
+        # Ligne de chaque date complète, retrouvée depuis sa position dans le texte joint
+        line_starts = np.cumsum([0] + [len(text) + 1 for text in texts[:-1]])
+        found = [(match.start(), int(match.group(3))) for match in _FULL_DATE.finditer(joined)]
+        found_rows = text_rows[np.searchsorted(line_starts, [start for start, _ in found], side='right') - 1]
+        years = [year for _, year in found] + explicit_years.tolist()
+        order = np.argsort(np.concatenate([found_rows, explicit_rows]), kind='stable')
+        self._years.update(years[index] for index in order)
+
+    def _set_period(self, groups) -> bool:
+        start_day, start_month, start_year, end_day, end_month, end_year = map(int, groups)
+        try:
+            self.period = StatementPeriod(date(start_year, start_month, start_day), date(end_year, end_month, end_day))
+        except ValueError:
+            return False
+        log.debug("📅 Statement period {} - {}", self.period.start, self.period.end)
+        return True
+
+    def _log_sample(self, transactions: List[Transaction]) -> None:
+        """Trace one transaction every parser.log_sample_every at debug level"""
+        sample_every = self.config.parser.log_sample_every
+        if not sample_every or not log.is_enabled("DEBUG"):
+            return
+        for transaction in transactions[::sample_every]:
+            log.debug("Transaction trouvée: Date={:%d.%m.%Y}, Libellé={}, Montant={}",
+                      transaction.date, transaction.description, transaction.amount)
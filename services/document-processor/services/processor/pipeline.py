@@ -0,0 +1,156 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from core.logger import log
+
+# Marqueur de fin de flux transmis d'un étage au suivant
+_DONE = object()
+
+
+class _StageError:
+    """Exception raised by a stage, forwarded to the consumer"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+@dataclass
+class StageStats:
+    name: str
+    items: int = 0
+    busy_time: float = 0.0
+    max_queue_depth: int = 0
+    queue_depth_total: int = 0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "items": self.items,
+            "busy_time": round(self.busy_time, 4),
+            "max_queue_depth": self.max_queue_depth,
+            "avg_queue_depth": round(self.queue_depth_total / self.items, 2) if self.items else 0.0,
+        }
+
+
+class StagePipeline:
+    def __init__(self, source: Iterable, stages: List[Tuple[str, Callable[[Any], Any]]],
+                 source_name: str = "source", queue_size: int = 1):
+        """Run a source and a chain of stages concurrently, one thread per stage
+
+        Stages are connected by bounded queues, so a stage blocks when the
+        next one falls behind and at most `queue_size` items wait between
+        two stages. Items keep their order.
+
+        Args:
+            source: Iterable producing the items of the first stage
+            stages: (name, function) of each stage, applied in order
+            source_name: Name of the source in the stats
+            queue_size: Capacity of each queue between two stages
+        """
+        self.source = source
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.stats = [StageStats(source_name)] + [StageStats(name) for name, _ in stages]
+        self._stop = threading.Event()
+
+    def stats_dict(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage items, busy time and depth of the queue the stage feeds"""
+        return {stats.name: stats.to_dict() for stats in self.stats}
+
+    def __iter__(self) -> Iterator[Any]:
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = [threading.Thread(target=self._run_source, args=(queues[0],), daemon=True)]
+        threads += [
+            threading.Thread(target=self._run_stage, args=(index, function, queues[index], queues[index + 1]),
+                             daemon=True)
+            for index, (_, function) in enumerate(self.stages)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _StageError):
+                    raise item.error
+                yield item
+        finally:
+            # Consumer done or failed: unblock and stop every stage
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            if log.is_enabled("DEBUG"):
+                log.debug("Pipeline stats: {}", self.stats_dict())
+
+    def _put(self, output: queue.Queue, item: Any, stats: StageStats) -> bool:
+        """Put an item downstream, giving up when the pipeline is stopped"""
+        while not self._stop.is_set():
+            try:
+                output.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            depth = output.qsize()
+            stats.max_queue_depth = max(stats.max_queue_depth, depth)
+            stats.queue_depth_total += depth
+            return True
+        return False
+
+    def _get(self, upstream: queue.Queue) -> Any:
+        """Get an item from upstream, _DONE when the pipeline is stopped"""
+        while not self._stop.is_set():
+            try:
+                return upstream.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _run_source(self, output: queue.Queue) -> None:
+        stats = self.stats[0]
+        iterator = None
+        try:
+            iterator = iter(self.source)
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                stats.busy_time += time.perf_counter() - start
+                stats.items += 1
+                if not self._put(output, item, stats):
+                    return
+                del item
+            self._put(output, _DONE, stats)
+        except BaseException as e:
+            self._put(output, _StageError(e), stats)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def _run_stage(self, index: int, function: Callable[[Any], Any],
+                   upstream: queue.Queue, output: queue.Queue) -> None:
+        stats = self.stats[index + 1]
+        while True:
+            item = self._get(upstream)
+            if item is _DONE or isinstance(item, _StageError):
+                self._put(output, item, stats)
+                return
+
+            start = time.perf_counter()
+            try:
+                result = function(item)
+            except BaseException as e:
+                self._put(output, _StageError(e), stats)
+                return
+            finally:
+                del item
+            stats.busy_time += time.perf_counter() - start
+            stats.items += 1
+            if not self._put(output, result, stats):
+                return
+            del result
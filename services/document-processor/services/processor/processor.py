@@ -1,75 +1,147 @@
+import resource
 import time
-from typing import Any
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
 from pathlib import Path
 
-from .models import ProcessedDocument, Transaction
+import numpy as np
+
+from .models import DocumentTimings, ProcessedDocument, Transaction
+from core.artifacts import ArtifactSession, ArtifactWriter
 from core.config import ServiceConfig
+from .parser import StatementPeriod
 from .transaction_extractor import TransactionExtractor
+from .pipeline import StagePipeline
 from .validator import TransactionValidator
 from core.logger import log
-import pandas as pd
+from core.metrics import pages_processed, tables_detected, transactions_extracted
+from services.ocr.text_layer import TextLayerExtractor, TextLayerPage
+from services.tableau.models import ProcessedTable
+
+def _reset_peak_rss() -> int:
+    """Reset the peak resident memory of the process where Linux allows it
+
+    Returns:
+        The peak resident memory (bytes) after the reset, the current
+        memory when it worked
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        # Sans remise à zéro, le delta ne compte que ce qui dépasse le pic précédent
+        pass
+    return _peak_rss()
+
+
+def _peak_rss() -> int:
+    """Peak resident memory of the process, in bytes (ru_maxrss is in kB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
 
 class DocumentProcessor:
-    def __init__(self, tableau_extractor: Any, ocr_extractor: Any, config: ServiceConfig = None):
+    def __init__(self, tableau_extractor: Any, ocr_extractor: Any, config: ServiceConfig = None,
+                 artifacts: Optional[ArtifactWriter] = None):
         """Initialize document processor
 
         Args:
             tableau_extractor: Table detection service
             ocr_extractor: OCR service
             config: Processor configuration
+            artifacts: Shared debug artifact writer (a new one is created if None)
         """
         self.tableau_extractor = tableau_extractor
         self.ocr_extractor = ocr_extractor
         self.config = config or ServiceConfig()
+        self.artifacts = artifacts or ArtifactWriter(self.config)
 
         # Initialize components
         self.extractor = TransactionExtractor(self.config)
         self.validator = TransactionValidator(self.config)
+        self.text_layer_extractor = TextLayerExtractor(self.config)
 
-    def process_document(self, pdf_path: Path) -> ProcessedDocument:
+    def process_document(self, pdf_path: Path, pages: Optional[Sequence[int]] = None,
+                         period: Optional[StatementPeriod] = None) -> ProcessedDocument:
         """Process a PDF document to extract transactions
 
         Args:
             pdf_path: Path to PDF file
+            pages: 0-based pages to process, e.g. one shard of a large
+                   document (all pages if None)
+            period: Statement period of the whole document (see
+                    read_period), resolved from the pages processed if None
 
         Returns:
             ProcessedDocument with extracted transactions
         """
         start_time = time.time()
+        start_cpu = time.process_time()
+        start_rss = _reset_peak_rss()
+        timings = DocumentTimings()
         log.log_process_start(pdf_path.name)
 
         try:
-            # Process PDF with table extractor
-            document_tables = self.tableau_extractor.process_document(pdf_path)
-            transactions = []
-
-            # Process each page's tables
-            for page_num, page_tables in enumerate(document_tables):
-                for table in page_tables:
-                    # Extract text from each table
-                    box_coordinates = table.coordinates.to_list()
-                    lines = self.ocr_extractor.extract_text_from_region(
-                        table.image,
-                        box_coordinates,
-                        table.page_number
-                    )
+            artifacts = self.artifacts.session(pdf_path.stem, self.config.output_folders)
+            parser = self.extractor.start_document(period=period)
+            page_count = 0 if pages is None else len(pages)
+            raster_pages = None if pages is None else list(pages)
+
+            # Fast path: pages with an embedded text layer skip rasterization and OCR
+            text_start = time.perf_counter()
+            text_pages = self._read_text_layer(pdf_path, pages)
+            if text_pages is not None:
+                page_numbers = range(len(text_pages)) if pages is None else pages
+                timings.add("text_layer", time.perf_counter() - text_start, page_numbers)
+                page_count = len(text_pages)
+                raster_pages = [page_num for page_num, page in zip(page_numbers, text_pages) if page is None]
+
+                for page_num, page in zip(page_numbers, text_pages):
+                    if page is not None:
+                        with timings.measure("layout", [page_num]):
+                            lines = self.ocr_extractor.extract_text_from_words(page.words, page.box, page_num)
+                        artifacts.save_lines(page_num, 0, lines)
+                        parser.add_lines(lines, page_num)
 
-                    # Extract transactions from text
-                    page_transactions = self.extractor.extract_transactions(lines, page_num)
-                    transactions.extend(page_transactions)
+            # Raster path, one window of pages at a time, for the pages left
+            if raster_pages is None or raster_pages:
+                for window_tables, tables, table_indexes, tables_lines in self._iter_raster(
+                        pdf_path, raster_pages, artifacts, timings):
+                    if raster_pages is None:
+                        page_count += len(window_tables)
 
-            # Validate transactions
-            valid_transactions = self.validator.validate_transactions(transactions)
-            transactions_df = pd.DataFrame([t.__dict__ for t in valid_transactions])
-            transactions_df.to_csv(f"{self.config.output_folders.transactions}/{pdf_path.stem}_transactions.csv",
-                                   index=False)
+                    tables_detected.inc(len(tables))
 
+                    # Extract transactions from each table's text
+                    for table, table_index, lines in zip(tables, table_indexes, tables_lines):
+                        artifacts.save_lines(table.page_number, table_index, lines)
+                        parser.add_lines(lines, table.page_number)
+
+                    # Release the page images before the next window is rendered
+                    del window_tables, tables, table_indexes, tables_lines
+
+            # Dates completed with the statement year, resolved once for the document
+            with timings.measure("extract_transactions"):
+                if parser.is_bulk:
+                    # Large statements: parse and validate every line at once with pandas
+                    frame = self.validator.validate_frame(parser.finish_frame())
+                    valid_transactions = self.extractor.from_dataframe(frame)
+                else:
+                    valid_transactions = self.validator.validate_transactions(parser.finish())
+            artifacts.save_transactions(
+                valid_transactions, suffix="" if pages is None else f"_pages_{pages[0] + 1}-{pages[-1] + 1}"
+            )
+
+            pages_processed.inc(page_count)
+            transactions_extracted.inc(len(valid_transactions))
+            timings.cpu_time = time.process_time() - start_cpu
+            timings.peak_rss_delta = max(0, _peak_rss() - start_rss)
             log.log_process_end(pdf_path.name, time.time() - start_time)
             return ProcessedDocument(
                 transactions=valid_transactions,
-                page_count=len(document_tables),
+                page_count=page_count,
                 filename=pdf_path.name,
-                processing_time=time.time() - start_time
+                processing_time=time.time() - start_time,
+                artifacts_id=artifacts.document_id if artifacts.enabled else None,
+                timings=timings
             )
 
         except Exception as e:
@@ -80,4 +152,99 @@ class DocumentProcessor:
                 filename=pdf_path.name,
                 processing_time=time.time() - start_time,
                 error=str(e)
-            )
\ No newline at end of file
+            )
+
+    def read_period(self, pdf_path: Path) -> StatementPeriod:
+        """Resolve the statement period of a document before it is split in shards
+
+        A shard only sees its own pages: without the period of the whole
+        document, the January pages of a December-January statement would
+        be dated with the wrong year. The period is read from the text
+        layer of every page, or from the first page, rendered and OCR'd,
+        when the document has no text layer.
+        """
+        parser = self.extractor.start_document()
+        text_pages = self._read_text_layer(pdf_path)
+        if text_pages is not None and any(page is not None for page in text_pages):
+            for page_num, page in enumerate(text_pages):
+                if page is not None:
+                    parser.add_lines(
+                        self.ocr_extractor.extract_text_from_words(page.words, page.box, page_num), page_num
+                    )
+        else:
+            # Première page seulement, sans artefacts : le shard qui la contient la traitera à nouveau
+            artifacts = ArtifactSession(self.artifacts, pdf_path.stem, False, self.config.output_folders)
+            for _, tables, _, tables_lines in self._iter_raster(pdf_path, [0], artifacts, DocumentTimings()):
+                for table, lines in zip(tables, tables_lines):
+                    parser.add_lines(lines, table.page_number)
+
+        # Parcourir les lignes relève la période ("du ... au ...") et les années des dates complètes
+        parser.finish()
+        return parser.resolve_period()
+
+    def _iter_raster(self, pdf_path: Path, pages: Optional[Sequence[int]],
+                     artifacts: ArtifactSession, timings: DocumentTimings) -> Iterator[Tuple]:
+        """Render, detect and OCR the raster pages, a window at a time
+
+        With the pipeline enabled, rendering, detection and OCR run in their
+        own threads, so the next window is rendered and detected while the
+        current one is OCR'd and parsed.
+
+        Yields:
+            (window tables per page, tables, index of each table in its page, lines of each table)
+        """
+        windows = self._timed_windows(self.tableau_extractor.iter_windows(pdf_path, pages), timings)
+
+        def detect(window: List[Tuple[int, np.ndarray]]) -> List[List[ProcessedTable]]:
+            with timings.measure("detect_tables", [page_num for page_num, _ in window]):
+                return self.tableau_extractor.detect_window(window, artifacts)
+
+        def ocr(window_tables: List[List[ProcessedTable]]) -> Tuple:
+            return self._ocr_window(window_tables, timings)
+
+        if not self.config.pipeline.enabled:
+            for window in windows:
+                yield ocr(detect(window))
+            return
+
+        pipeline = StagePipeline(
+            windows,
+            stages=[("detect", detect), ("ocr", ocr)],
+            source_name="rasterize",
+            queue_size=self.config.pipeline.queue_size
+        )
+        yield from pipeline
+        log.info(f"⏱️ Pipeline stages: {pipeline.stats_dict()}")
+
+    @staticmethod
+    def _timed_windows(windows: Iterable[List[Tuple[int, np.ndarray]]],
+                       timings: DocumentTimings) -> Iterator[List[Tuple[int, np.ndarray]]]:
+        """Time the rendering of each window, done while the next one is pulled"""
+        iterator = iter(windows)
+        while True:
+            start = time.perf_counter()
+            window = next(iterator, None)
+            if window is None:
+                return
+            timings.add("rasterize", time.perf_counter() - start, [page_num for page_num, _ in window])
+            yield window
+
+    def _ocr_window(self, window_tables: List[List[ProcessedTable]], timings: DocumentTimings) -> Tuple:
+        """OCR every table of a window in batches"""
+        tables = [table for page_tables in window_tables for table in page_tables]
+        table_indexes = [index for page_tables in window_tables for index in range(len(page_tables))]
+        with timings.measure("ocr", [table.page_number for table in tables]):
+            tables_lines = self.ocr_extractor.extract_text_from_tables(tables)
+        return window_tables, tables, table_indexes, tables_lines
+
+    def _read_text_layer(self, pdf_path: Path,
+                         pages: Optional[Sequence[int]] = None) -> Optional[List[Optional[TextLayerPage]]]:
+        """Read the PDF text layer, None when disabled or unreadable"""
+        if not self.config.text_layer.enabled:
+            return None
+
+        try:
+            return self.text_layer_extractor.extract_document(pdf_path, pages)
+        except Exception as e:
+            log.warning(f"⚠️ Could not read text layer of {pdf_path.name}, falling back to OCR: {e}")
+            return None
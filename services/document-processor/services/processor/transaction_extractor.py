@@ -1,12 +1,10 @@
-import re
-from datetime import datetime, date
-from decimal import Decimal
-from typing import List, Dict, Optional
+from typing import List, Optional
 import pandas as pd
 
 from core.config import ServiceConfig
-from core.logger import log
+from services.ocr.models import Line
 from .models import Transaction
+from .parser import StatementParser, StatementPeriod
 
 
 class TransactionExtractor:
@@ -18,9 +16,22 @@ class TransactionExtractor:
         """
         self.config = config
 
-    def extract_transactions(self, lines: List[Dict], page_num: int) -> List[Transaction]:
+    def start_document(self, reference_year: Optional[int] = None,
+                       period: Optional[StatementPeriod] = None) -> StatementParser:
+        """Start parsing a document, lines are added page by page
+
+        Args:
+            reference_year: Year used when the document gives none (current year if None)
+            period: Statement period resolved beforehand, e.g. for a shard of a document
+        """
+        return StatementParser(self.config, reference_year, period)
+
+    def extract_transactions(self, lines: List[Line], page_num: int) -> List[Transaction]:
         """Extract transactions from OCR lines
 
+        The lines are parsed as a document on their own: prefer
+        start_document() to resolve the statement year over every page.
+
         Args:
             lines: List of OCR processed lines
             page_num: Page number of the document
@@ -28,63 +39,16 @@ class TransactionExtractor:
         Returns:
             List of extracted transactions
         """
-        transactions = []
-        filename = f"page_{page_num + 1}"
-
-        # Expression régulière modifiée pour détecter une date au début de la ligne
-        # Accepte 1-31 pour le jour et 1-12 pour le mois
-        date_pattern = r'^(\d{1,2})\.(\d{1,2})'
-
-        for line in lines:
-            # Récupérer le texte de la ligne en joignant les mots
-            line_text = ' '.join(word['text'] for word in line['words'])
-
-            # Vérifier si la ligne commence par une date
-            match = re.match(date_pattern, line_text)
-            if match:
-                try:
-                    # Extraire la date
-                    day, month = match.groups()
-                    # Ajouter les zéros si nécessaire
-                    day = day.zfill(2)
-                    month = month.zfill(2)
-                    current_year = datetime.now().year
-                    transaction_date = datetime.strptime(f"{day}.{month}.{current_year}", "%d.%m.%Y").date()
-
-                    # Extraire le montant (dernier mot de la ligne)
-                    amount_str = line['words'][-1]['text'].replace(',', '.')
-                    try:
-                        amount = float(amount_str)
-                    except ValueError:
-                        continue
-
-                    # Extraire le libellé (tout ce qui est entre la date et le montant)
-                    libelle = ' '.join(word['text'] for word in line['words'][1:-1])
-
-                    # Créer la transaction
-                    transaction = Transaction(
-                        date=transaction_date,
-                        description=libelle,
-                        amount=amount,
-                        raw_text=' '.join(word['text'] for word in line['words'])
-                    )
-
-                    transactions.append(transaction)
-
-                    log.info(f"Transaction trouvée: Date={transaction_date.strftime('%d.%m.%Y')}, "
-                             f"Libellé={libelle}, Montant={amount}")
-
-                except (ValueError, IndexError) as e:
-                    # log.error(f"Erreur lors du parsing de la ligne: {line_text}")
-                    continue
-
-        return transactions
-
-
+        parser = self.start_document()
+        parser.add_lines(lines, page_num)
+        return parser.finish()
 
     def to_dataframe(self, transactions: List[Transaction]) -> pd.DataFrame:
         """Convert transactions to pandas DataFrame
 
+        Same layout as StatementParser.finish_frame(), which bulk parsing
+        returns directly.
+
         Args:
             transactions: List of Transaction objects
 
@@ -94,20 +58,30 @@ class TransactionExtractor:
         if not transactions:
             return pd.DataFrame()
 
-        # Convertir les transactions en dictionnaires
-        transaction_dicts = [
-            {
-                'date': t.date,
-                'description': t.description,
-                'amount': float(t.amount),
-                'raw_text': t.raw_text
-            } for t in transactions
-        ]
+        df = pd.DataFrame({
+            'date': pd.to_datetime([t.date for t in transactions]),
+            'description': [t.description for t in transactions],
+            'amount': [float(t.amount) for t in transactions],
+            'raw_text': [t.raw_text for t in transactions],
+        })
+
+        return df
 
-        # Créer le DataFrame
-        df = pd.DataFrame(transaction_dicts)
+    def from_dataframe(self, df: pd.DataFrame) -> List[Transaction]:
+        """Convert a frame of transactions (bulk parsing) back to Transaction objects
 
-        # Formater les colonnes si nécessaire
-        df['amount'] = df['amount'].astype(float)
+        Args:
+            df: DataFrame with the to_dataframe() columns
 
-        return df
\ No newline at end of file
+        Returns:
+            List of Transaction objects, in the frame order
+        """
+        if df.empty:
+            return []
+
+        return [
+            Transaction(date=transaction_date, description=description, amount=amount, raw_text=raw_text)
+            for transaction_date, description, amount, raw_text in zip(
+                df['date'].dt.date, df['description'].tolist(), df['amount'].tolist(), df['raw_text'].tolist()
+            )
+        ]
@@ -1,4 +1,6 @@
 from typing import List
+import pandas as pd
+
 from .models import Transaction
 from core.config import ServiceConfig
 
@@ -38,4 +40,26 @@ class TransactionValidator:
         # Vérifier le montant minimum
         amount_valid = abs(transaction.amount) >= self.config.validation.min_transaction_amount
 
-        return required_fields_met and amount_valid
\ No newline at end of file
+        return required_fields_met and amount_valid
+
+    def validate_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Validate and filter a frame of transactions, same rules as validate_transactions
+
+        Args:
+            frame: Transactions, one column per Transaction field
+
+        Returns:
+            Rows of the valid transactions
+        """
+        return frame[self.valid_mask(frame)]
+
+    def valid_mask(self, frame: pd.DataFrame) -> pd.Series:
+        """Boolean mask of the valid rows of a frame of transactions"""
+        mask = frame['amount'].abs() >= self.config.validation.min_transaction_amount
+        for field in self.config.validation.required_fields:
+            if field in frame:
+                mask &= frame[field].notna()
+            elif getattr(Transaction, field, None) is None:
+                # Champ absent du frame et sans valeur par défaut dans Transaction
+                mask &= False
+        return mask
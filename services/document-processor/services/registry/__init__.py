@@ -0,0 +1,3 @@
+from .model_registry import ModelRegistry, SharedPredictor
+
+__all__ = ['ModelRegistry', 'SharedPredictor']
@@ -0,0 +1,119 @@
+import threading
+from typing import Any, Optional
+
+import numpy as np
+import torch
+from doctr.models import ocr_predictor
+
+from core.artifacts import ArtifactWriter
+from core.config import ServiceConfig
+from core.logger import log
+from core.metrics import model_memory_bytes
+from services.cache.page_cache import PageCache
+from services.ocr.extractor import OcrExtractor
+from services.processor.processor import DocumentProcessor
+from services.tableau.extractor import TableauExtractor
+from services.tableau.model_handler import ModelHandler
+
+
+def _module_bytes(model: Any) -> int:
+    """Size of the parameters and buffers of a torch model, 0 for anything else"""
+    if not isinstance(model, torch.nn.Module):
+        return 0
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+
+class SharedPredictor:
+    """Thread-safe wrapper around a doctr predictor shared between requests"""
+
+    def __init__(self, model: Any):
+        self.model = model
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            return self.model(*args, **kwargs)
+
+
+class ModelRegistry:
+    def __init__(self, config: Optional[ServiceConfig] = None):
+        """Registry holding the YOLO and doctr models of a worker process
+
+        Args:
+            config: Service configuration
+        """
+        self.config = config or ServiceConfig()
+        self.ocr_model: Optional[SharedPredictor] = None
+        self.model_handler: Optional[ModelHandler] = None
+        self.page_cache = PageCache(self.config)
+        self.artifacts = ArtifactWriter(self.config)
+        self.error: Optional[str] = None
+        self._load_lock = threading.Lock()
+        self._ready = threading.Event()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def initialize(self) -> None:
+        """Load the models once and run the warm-up inference"""
+        with self._load_lock:
+            if self.is_ready:
+                return
+            try:
+                self._load_models()
+                if self.config.models.warmup:
+                    self._warm_up()
+                self.error = None
+                self._ready.set()
+                log.info("✅ Models loaded and warmed up")
+            except Exception as e:
+                self.error = str(e)
+                log.log_error(e, "loading models")
+
+    def _load_models(self) -> None:
+        """Load doctr and YOLO models"""
+        device = self.config.tableau.torch_device
+        log.info(f"📦 Loading OCR model on device: {device}")
+        self.ocr_model = SharedPredictor(ocr_predictor(pretrained=True).to(device))
+
+        log.info(f"📦 Loading table detection model: {self.config.tableau.model_repo_id}")
+        self.model_handler = ModelHandler(self.config)
+
+        model_memory_bytes.labels("ocr").set(_module_bytes(self.ocr_model.model))
+        model_memory_bytes.labels("table_detection").set(_module_bytes(self.model_handler.model))
+
+    def _warm_up(self) -> None:
+        """Run one inference of each model on a dummy page"""
+        size = self.config.models.warmup_image_size
+        dummy = np.full((size, size, 3), 255, dtype=np.uint8)
+        dummy[size // 4:size // 4 + 20, size // 8:size - size // 8] = 0
+
+        log.info("🔥 Warming up models...")
+        self.model_handler.detect_tables(dummy)
+        self.ocr_model([dummy])
+
+    def create_processor(self, config: Optional[ServiceConfig] = None) -> DocumentProcessor:
+        """Build a DocumentProcessor backed by the shared models
+
+        Args:
+            config: Configuration of the processor, e.g. a job workspace
+                    configuration (the registry configuration if None)
+
+        Raises:
+            RuntimeError: If the models are not loaded yet
+        """
+        if not self.is_ready:
+            raise RuntimeError("Models are not ready")
+
+        config = config or self.config
+        return DocumentProcessor(
+            tableau_extractor=TableauExtractor(
+                config, model_handler=self.model_handler, page_cache=self.page_cache, artifacts=self.artifacts
+            ),
+            ocr_extractor=OcrExtractor(ocr_model=self.ocr_model, config=config, page_cache=self.page_cache),
+            config=config,
+            artifacts=self.artifacts
+        )
+
@@ -1,23 +1,33 @@
+from itertools import islice
 from pathlib import Path
 import numpy as np
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence, Tuple
+from core.artifacts import ArtifactSession, ArtifactWriter
 from core.config import ServiceConfig
+from services.cache.page_cache import PageCache
 from .models import TableBox, ProcessedTable
 from .pdf_processor import PDFProcessor
 from .model_handler import ModelHandler
 from .visualizer import TableVisualizer
 from core.logger import log
-import cv2
+from core.metrics import stage_seconds
 
 class TableauExtractor:
-    def __init__(self, config: Optional[ServiceConfig] = None):
+    def __init__(self, config: Optional[ServiceConfig] = None, model_handler: Optional[ModelHandler] = None,
+                 page_cache: Optional[PageCache] = None, artifacts: Optional[ArtifactWriter] = None):
         """Initialize TableauExtractor
 
         Args:
             config: Configuration object for table extraction
+            model_handler: Shared model handler (a new one is loaded if None)
+            page_cache: Cache of per-page detections (no caching if None)
+            artifacts: Shared debug artifact writer (a new one is created if None)
         """
         self.config = config or ServiceConfig()
-        self.model_handler = ModelHandler(self.config)
+        self.model_handler = model_handler or ModelHandler(self.config)
+        self.page_cache = page_cache
+        self.artifacts = artifacts or ArtifactWriter(self.config)
+        self.pdf_processor = PDFProcessor(self.config)
         self.visualizer = TableVisualizer()
         self.config.create_directories()
 
@@ -30,26 +40,110 @@ class TableauExtractor:
         Returns:
             List of processed tables per page
         """
+        return [page_tables for window in self.iter_document(pdf_path) for page_tables in window]
+
+    def iter_document(self, pdf_path: Path,
+                      pages: Optional[Sequence[int]] = None) -> Iterator[List[List[ProcessedTable]]]:
+        """Lazily process a PDF document, a window of pages at a time
+
+        Pages are rendered, detected and handed over `document.page_window`
+        pages at a time, so only the pages of the current window are kept
+        in memory once the caller is done with them.
+
+        Args:
+            pdf_path: Path to the PDF file
+            pages: 0-based page numbers to process (all pages if None)
+
+        Yields:
+            Processed tables per page, for each window of pages
+        """
+        artifacts = self.artifacts.session(Path(pdf_path).stem, self.config.output_folders)
+        page_count = 0
+        table_count = 0
+
+        for window in self.iter_windows(pdf_path, pages):
+            window_tables = self.detect_window(window, artifacts)
+            page_count += len(window_tables)
+            table_count += sum(len(page_tables) for page_tables in window_tables)
+
+            # Keep no reference to the window while the next one is rendered
+            del window
+            yield window_tables
+            del window_tables
+
+        log.info(f"📄 Converted PDF to {page_count} images")
+        log.info(f"📊 Found {table_count} tables in total")
+
+    def iter_windows(self, pdf_path: Path,
+                     pages: Optional[Sequence[int]] = None) -> Iterator[List[Tuple[int, np.ndarray]]]:
+        """Render a PDF document a window of `document.page_window` pages at a time
+
+        Args:
+            pdf_path: Path to the PDF file
+            pages: 0-based page numbers to render (all pages if None)
+
+        Yields:
+            (page_num, image) pairs of each window
+        """
         log.info(f"➡️ Starting table extraction from: {pdf_path}")
-        images = PDFProcessor.convert_to_images(pdf_path)
-        log.info(f"📄 Converted PDF to {len(images)} images")
-
-        tables = [self.process_page(image, page_num) for page_num, image in enumerate(images)]
-        log.info(f"📊 Found {sum(len(page_tables) for page_tables in tables)} tables in total")
-
-        # save output images and boxes
-        for page_num, page_tables in enumerate(tables):
-            image = images[page_num]
-            boxes = [table.coordinates for table in page_tables]
-            visualized_image = self.visualize_detections(image, boxes)
-            page_output_path = Path(self.config.output_folders.pages) / f"page_{page_num}.png"
-            table_output_path = Path(self.config.output_folders.tables) / f"page_{page_num}_tables.png"
-            log.info(f"🖼️  Saving page image to: {page_output_path}")
-            log.info(f"🖼️  Saving visualized detections to: {table_output_path}")
-            cv2.imwrite(str(page_output_path), cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-            cv2.imwrite(str(table_output_path), cv2.cvtColor(visualized_image, cv2.COLOR_BGR2RGB))
-
-        return tables
+        window_size = max(1, self.config.document.page_window)
+        images = self.pdf_processor.iter_images(pdf_path, window=window_size, pages=pages)
+
+        rasterize_seconds = stage_seconds.labels("rasterize")
+        while True:
+            with rasterize_seconds.time():
+                window = list(islice(images, window_size))
+            if not window:
+                break
+            yield window
+            del window
+
+    def detect_window(self, window: List[Tuple[int, np.ndarray]],
+                      artifacts: Optional[ArtifactSession] = None) -> List[List[ProcessedTable]]:
+        """Detect the tables of a window of rendered pages
+
+        Args:
+            window: (page_num, image) pairs
+            artifacts: Debug artifacts of the document (none saved if None)
+
+        Returns:
+            Processed tables per page of the window
+        """
+        images = [image for _, image in window]
+        page_hashes = [self._page_hash(image) for image in images]
+        detections = self._detect_tables(images, page_hashes)
+
+        window_tables = []
+        for (page_num, image), boxes, page_hash in zip(window, detections, page_hashes):
+            window_tables.append(self._build_tables(image, boxes, page_num, page_hash))
+            if artifacts is not None:
+                artifacts.save_page(page_num, image, boxes)
+        return window_tables
+
+    def _page_hash(self, image: np.ndarray) -> Optional[str]:
+        """Hash of a page for the page cache, None when caching is off"""
+        if self.page_cache is None or not self.page_cache.enabled:
+            return None
+        return self.page_cache.page_hash(image)
+
+    def _detect_tables(self, images: List[np.ndarray], page_hashes: List[Optional[str]]) -> List[List[TableBox]]:
+        """Detect tables in a window of pages, skipping pages found in the page cache"""
+        detections = [
+            self.page_cache.get_detections(page_hash) if page_hash else None
+            for page_hash in page_hashes
+        ]
+        missing = [index for index, boxes in enumerate(detections) if boxes is None]
+        if len(missing) < len(images):
+            log.info(f"🗄️ Page cache hit for {len(images) - len(missing)}/{len(images)} page detections")
+
+        if missing:
+            found = self.model_handler.detect_tables_batch([images[index] for index in missing])
+            for index, boxes in zip(missing, found):
+                detections[index] = boxes
+                if page_hashes[index]:
+                    self.page_cache.set_detections(page_hashes[index], boxes)
+
+        return detections
 
     def process_page(self, image: np.ndarray, page_num: int) -> List[ProcessedTable]:
         """Process a single page
@@ -61,18 +155,22 @@ class TableauExtractor:
         Returns:
             List of processed tables from the page
         """
-        tables = []
         detected_boxes = self.model_handler.detect_tables(image)
-
-        for box in detected_boxes:
-            # table_image = box.extract_region(image)
-            tables.append(ProcessedTable(
+        return self._build_tables(image, detected_boxes, page_num)
+
+    @staticmethod
+    def _build_tables(image: np.ndarray, boxes: List[TableBox], page_num: int,
+                      page_hash: Optional[str] = None) -> List[ProcessedTable]:
+        """Wrap detected boxes of a page into processed tables"""
+        return [
+            ProcessedTable(
                 image=image,
                 coordinates=box,
-                page_number=page_num
-            ))
-
-        return tables
+                page_number=page_num,
+                page_hash=page_hash
+            )
+            for box in boxes
+        ]
 
     def visualize_detections(self, image: np.ndarray, boxes: List[TableBox]) -> np.ndarray:
         """Visualize detected tables
@@ -1,15 +1,26 @@
+import threading
 import torch
 from ultralytics import YOLO
 from huggingface_hub import hf_hub_download
 import numpy as np
-from typing import List
+from typing import List, Optional
 from .models import TableBox
 from core.config import ServiceConfig
+from core.logger import log
+from core.metrics import stage_seconds
 
 class ModelHandler:
-    def __init__(self, config: ServiceConfig):
+    def __init__(self, config: ServiceConfig, model: Optional[YOLO] = None):
+        """Initialize ModelHandler
+
+        Args:
+            config: Service configuration
+            model: Already loaded YOLO model (loaded from the hub if None)
+        """
         self.config = config
-        self.model = self._load_model()
+        self.model = model or self._load_model()
+        # Le predictor YOLO garde un état interne : une inférence à la fois
+        self._lock = threading.Lock()
 
     def _load_model(self) -> YOLO:
         """Load and configure YOLO model"""
@@ -34,11 +45,62 @@ class ModelHandler:
             List of detected table boxes
         """
         try:
-            results = self.model(image)
+            with self._lock, stage_seconds.labels("detect_tables").time():
+                results = self.model(image)
             if len(results) > 0:
-                boxes = results[0].boxes.xyxy.cpu().numpy()
-                return [TableBox.from_coordinates(box) for box in boxes]
+                return self._to_table_boxes(results[0])
             return []
         except Exception as e:
-            print(f"Error detecting tables: {e}")
-            return []
\ No newline at end of file
+            log.error("Error detecting tables: {}", e)
+            return []
+
+    def detect_tables_batch(self, images: List[np.ndarray], batch_size: Optional[int] = None) -> List[List[TableBox]]:
+        """Detect tables in several page images with batched forward passes
+
+        Consecutive pages are grouped in batches of at most `batch_size`
+        images of the same shape, so the letterboxing (and therefore the
+        detections) is the same as with `detect_tables` page by page.
+
+        Args:
+            images: Page images
+            batch_size: Max number of images per forward pass
+                        (defaults to tableau.batch_size)
+
+        Returns:
+            List of detected table boxes for each image
+
+        Raises:
+            Exception: The model error when a batch fails: an empty result
+                       would read as "no table" and be cached as such
+        """
+        batch_size = max(1, batch_size or self.config.tableau.batch_size)
+        detections = []
+
+        for batch in self._make_batches(images, batch_size):
+            try:
+                with self._lock, stage_seconds.labels("detect_tables").time():
+                    results = self.model(batch)
+                detections.extend(self._to_table_boxes(result) for result in results)
+            except Exception as e:
+                log.error("Error detecting tables on a batch of {} pages: {}", len(batch), e)
+                raise
+
+        return detections
+
+    @staticmethod
+    def _make_batches(images: List[np.ndarray], batch_size: int) -> List[List[np.ndarray]]:
+        """Split images into batches of same-shaped consecutive images"""
+        batches = []
+        for image in images:
+            if (batches and len(batches[-1]) < batch_size
+                    and batches[-1][-1].shape == image.shape):
+                batches[-1].append(image)
+            else:
+                batches.append([image])
+        return batches
+
+    @staticmethod
+    def _to_table_boxes(result) -> List[TableBox]:
+        """Convert one YOLO result into table boxes"""
+        boxes = result.boxes.xyxy.cpu().numpy()
+        return [TableBox.from_coordinates(box) for box in boxes]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import numpy as np
 
 @dataclass
@@ -23,4 +23,5 @@ class TableBox:
 class ProcessedTable:
     image: np.ndarray
     coordinates: TableBox
-    page_number: int
\ No newline at end of file
+    page_number: int
+    page_hash: Optional[str] = None
\ No newline at end of file
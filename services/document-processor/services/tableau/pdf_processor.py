@@ -1,12 +1,21 @@
-from pdf2image import convert_from_path
 import numpy as np
-from typing import List
-import cv2
+from typing import Iterator, List, Optional, Sequence, Tuple
 from pathlib import Path
 
+from core.config import ServiceConfig
+from core.logger import log
+from .rasterizer import create_rasterizer
+
 class PDFProcessor:
-    @staticmethod
-    def convert_to_images(pdf_path: Path) -> List[np.ndarray]:
+    def __init__(self, config: ServiceConfig):
+        """Initialize PDFProcessor
+
+        Args:
+            config: Service configuration, the backend is selected by its rasterizer section
+        """
+        self.rasterizer = create_rasterizer(config.rasterizer)
+
+    def convert_to_images(self, pdf_path: Path) -> List[np.ndarray]:
         """Convert PDF pages to images
 
         Args:
@@ -15,17 +24,48 @@ class PDFProcessor:
         Returns:
             List of images (one per page)
         """
+        return [image for _, image in self.iter_images(pdf_path)]
+
+    def iter_images(self, pdf_path: Path, window: int = 1,
+                    pages: Optional[Sequence[int]] = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """Lazily convert PDF pages to images, one page at a time
+
+        Pages are rendered `window` at a time, so at most `window` pages
+        are held in memory by the rasterizer.
+
+        Args:
+            pdf_path: Path to the PDF file
+            window: Number of pages rendered together
+            pages: 0-based page numbers to render (all pages if None)
+
+        Yields:
+            (page number, page image), in page order
+        """
         try:
-            # Convert PDF pages to PIL images
-            pil_images = convert_from_path(pdf_path)
-            
-            # Convert PIL images to numpy arrays
-            return [PDFProcessor._convert_pil_to_cv2(img) for img in pil_images]
+            if pages is None:
+                pages = range(self.rasterizer.page_count(pdf_path))
+            pages = sorted(pages)
+            window = max(1, window)
+
+            for start in range(0, len(pages), window):
+                for first_page, last_page in self._contiguous_ranges(pages[start:start + window]):
+                    images = self.rasterizer.render_pages(pdf_path, first_page + 1, last_page + 1)
+
+                    # Hand over each page without keeping a reference to it
+                    for page_num in range(first_page, last_page + 1):
+                        yield page_num, images.pop(0)
         except Exception as e:
-            print(f"Error converting PDF to images: {e}")
-            return []
+            # Propager : un document rendu en partie ne doit pas passer pour complet (ni être mis en cache)
+            log.error("Error converting PDF to images: {}", e)
+            raise
 
     @staticmethod
-    def _convert_pil_to_cv2(pil_image) -> np.ndarray:
-        """Convert PIL image to OpenCV format"""
-        return cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
\ No newline at end of file
+    def _contiguous_ranges(pages: List[int]) -> List[Tuple[int, int]]:
+        """Split sorted page numbers into (first, last) runs of consecutive pages"""
+        ranges = []
+        for page in pages:
+            if ranges and ranges[-1][1] == page - 1:
+                ranges[-1] = (ranges[-1][0], page)
+            else:
+                ranges.append((page, page))
+        return ranges
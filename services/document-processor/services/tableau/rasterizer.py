@@ -0,0 +1,221 @@
+import multiprocessing
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple, Type
+
+import cv2
+import numpy as np
+import pypdfium2 as pdfium
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+from core.config import RasterizerConfig
+from core.logger import log
+from .shared_pages import PageDescriptor, get_page_pool, write_page
+
+# Attente maximale d'un slot libre avant de repasser par un transfert classique
+SLOT_WAIT_SECONDS = 5.0
+
+# Pools de rendu partagés par tout le processus, clé : (type de pool, nombre de workers)
+_executors: Dict[Tuple[str, int], Executor] = {}
+_executors_lock = threading.Lock()
+# pdfium n'est pas thread-safe : tout appel pdfium fait depuis des threads (le comptage des pages par
+# le processus de l'API, appelé pour plusieurs envois à la fois) passe par ce verrou
+_pdfium_lock = threading.Lock()
+
+
+def _get_executor(pool: str, workers: int) -> Executor:
+    """Return the process-wide executor for a pool kind and size"""
+    with _executors_lock:
+        key = (pool, workers)
+        if key not in _executors:
+            if pool == "process":
+                # Pas de fork : le processus appelant (un worker de jobs) a déjà des threads
+                # (torch, pipeline, artefacts) dont les verrous seraient copiés dans l'enfant
+                _executors[key] = ProcessPoolExecutor(max_workers=workers,
+                                                      mp_context=multiprocessing.get_context("spawn"))
+            else:
+                _executors[key] = ThreadPoolExecutor(max_workers=workers)
+        return _executors[key]
+
+
+def _render_range(rasterizer_cls: Type['Rasterizer'], config: RasterizerConfig,
+                  pdf_path: Path, first_page: int, last_page: int) -> List[np.ndarray]:
+    """Render a page range in a pool worker"""
+    return rasterizer_cls(config).render_range(pdf_path, first_page, last_page)
+
+
+def _render_range_shared(rasterizer_cls: Type['Rasterizer'], config: RasterizerConfig, pdf_path: Path,
+                         first_page: int, last_page: int, pool_name: str, slots: List[int],
+                         slot_bytes: int) -> List[object]:
+    """Render a page range in a pool worker into shared-memory slots
+
+    Returns:
+        One PageDescriptor per page, or the page itself when it does not fit in a slot
+    """
+    images = rasterizer_cls(config).render_range(pdf_path, first_page, last_page)
+    results = []
+    for page_number, slot, image in zip(range(first_page, last_page + 1), slots, images):
+        descriptor = write_page(pool_name, slot, slot_bytes, image, page_number)
+        results.append(descriptor if descriptor is not None else image)
+    return results
+
+
+class Rasterizer(ABC):
+    """Render PDF pages to BGR images"""
+
+    # False when the backend cannot render from several threads at once
+    thread_safe = True
+
+    def __init__(self, config: RasterizerConfig):
+        self.config = config
+
+    @abstractmethod
+    def page_count(self, pdf_path: Path) -> int:
+        """Return the number of pages of the PDF"""
+
+    @abstractmethod
+    def render_range(self, pdf_path: Path, first_page: int, last_page: int) -> List[np.ndarray]:
+        """Render pages first_page..last_page (1-based, inclusive) sequentially"""
+
+    def render_pages(self, pdf_path: Path, first_page: int, last_page: int) -> List[np.ndarray]:
+        """Render pages first_page..last_page (1-based, inclusive)
+
+        The range is split in contiguous chunks rendered in parallel by the
+        configured thread or process pool.
+
+        Returns:
+            Page images, in page order
+        """
+        page_total = last_page - first_page + 1
+        workers = min(self.config.workers, page_total)
+        if workers <= 1:
+            return self.render_range(pdf_path, first_page, last_page)
+
+        pool = self.config.pool if self.thread_safe else "process"
+        executor = _get_executor(pool, self.config.workers)
+
+        chunk_size = -(-page_total // workers)
+        chunks = [(start, min(start + chunk_size - 1, last_page))
+                  for start in range(first_page, last_page + 1, chunk_size)]
+        if pool == "process" and self.config.shared_memory:
+            return self._render_shared(executor, pdf_path, chunks)
+
+        futures = [executor.submit(_render_range, type(self), self.config, pdf_path, start, end)
+                   for start, end in chunks]
+        return [image for future in futures for image in future.result()]
+
+    def _render_shared(self, executor: Executor, pdf_path: Path,
+                       chunks: List[Tuple[int, int]]) -> List[np.ndarray]:
+        """Render chunks in worker processes, pages coming back through shared memory"""
+        page_pool = get_page_pool(self.config.shared_slots, self.config.shared_slot_mb * 1024 * 1024)
+        futures = []
+        for start, end in chunks:
+            slots = page_pool.acquire(end - start + 1, timeout=SLOT_WAIT_SECONDS)
+            if slots is None:
+                # Plus de slot libre : ce morceau revient par pickling
+                log.debug("No free shared page slot, pickling pages {}-{}", start, end)
+                futures.append((None, executor.submit(_render_range, type(self), self.config, pdf_path,
+                                                      start, end)))
+                continue
+            futures.append((slots, executor.submit(_render_range_shared, type(self), self.config, pdf_path,
+                                                   start, end, page_pool.name, slots, page_pool.slot_bytes)))
+
+        images = []
+        for slots, future in futures:
+            try:
+                results = future.result()
+            except BaseException:
+                for slot in slots or []:
+                    page_pool.release(slot)
+                raise
+
+            for slot, result in zip(slots or [None] * len(results), results):
+                if isinstance(result, PageDescriptor):
+                    images.append(page_pool.view(result))
+                else:
+                    if slot is not None:
+                        page_pool.release(slot)
+                    images.append(result)
+        return images
+
+    @staticmethod
+    def _to_bgr(image: np.ndarray, rgb: bool = False) -> np.ndarray:
+        """Convert a rendered page to a 3-channel BGR image"""
+        if image.ndim == 2:
+            return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        if rgb:
+            # Conversion in place: no second copy of the page
+            return cv2.cvtColor(image, cv2.COLOR_RGB2BGR, dst=image)
+        return image
+
+
+class PopplerRasterizer(Rasterizer):
+    """Rendering through poppler's pdftoppm (pdf2image)"""
+
+    def page_count(self, pdf_path: Path) -> int:
+        return pdfinfo_from_path(pdf_path)["Pages"]
+
+    def render_range(self, pdf_path: Path, first_page: int, last_page: int) -> List[np.ndarray]:
+        pil_images = convert_from_path(
+            pdf_path,
+            dpi=self.config.dpi,
+            first_page=first_page,
+            last_page=last_page,
+            grayscale=self.config.grayscale
+        )
+
+        # Release each PIL page as soon as it is converted
+        images = []
+        while pil_images:
+            images.append(self._to_bgr(np.array(pil_images.pop(0)), rgb=True))
+        return images
+
+
+class PdfiumRasterizer(Rasterizer):
+    """In-process rendering with pdfium, straight into NumPy buffers"""
+
+    # pdfium n'est pas thread-safe : le rendu parallèle passe par des processus
+    thread_safe = False
+
+    def page_count(self, pdf_path: Path) -> int:
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(str(pdf_path))
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+
+    def render_range(self, pdf_path: Path, first_page: int, last_page: int) -> List[np.ndarray]:
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(str(pdf_path))
+            try:
+                images = []
+                for page_index in range(first_page - 1, last_page):
+                    page = pdf[page_index]
+                    # pdfium renders BGR by default: the bitmap buffer is used as is
+                    bitmap = page.render(scale=self.config.dpi / 72, grayscale=self.config.grayscale)
+                    images.append(self._to_bgr(bitmap.to_numpy()))
+                    page.close()
+                return images
+            finally:
+                pdf.close()
+
+
+RASTERIZERS: Dict[str, Type[Rasterizer]] = {
+    "poppler": PopplerRasterizer,
+    "pdfium": PdfiumRasterizer,
+}
+
+
+def create_rasterizer(config: RasterizerConfig) -> Rasterizer:
+    """Create the rasterizer backend selected in the configuration
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    try:
+        return RASTERIZERS[config.backend](config)
+    except KeyError:
+        raise ValueError(f"Unknown rasterizer backend: {config.backend}") from None
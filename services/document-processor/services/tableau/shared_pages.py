@@ -0,0 +1,123 @@
+import atexit
+import threading
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PageDescriptor:
+    """Location of a rendered page in a shared page pool"""
+    slot: int
+    shape: Tuple[int, ...]
+    dtype: str
+    page_number: int
+
+
+class _SlotBuffer:
+    """Owner of the memory of one slot, alive as long as an array uses it"""
+
+    def __init__(self, memory: memoryview, descriptor: PageDescriptor):
+        self._array = np.frombuffer(memory, dtype=descriptor.dtype,
+                                    count=int(np.prod(descriptor.shape))).reshape(descriptor.shape)
+        self.__array_interface__ = self._array.__array_interface__
+
+
+class SharedPagePool:
+    def __init__(self, slot_count: int, slot_bytes: int):
+        """Ring of fixed-size shared-memory slots holding rendered pages
+
+        Rendering processes copy page pixels into a slot and send back a
+        PageDescriptor instead of pickling the page. The owning process
+        wraps the slot as a NumPy array without copying; the slot goes back
+        to the ring once that array and every view of it (table crops...)
+        are garbage collected.
+
+        Args:
+            slot_count: Number of pages the pool can hold at once
+            slot_bytes: Size of a slot, pages larger than this are not shared
+        """
+        self.slot_count = slot_count
+        self.slot_bytes = slot_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=slot_count * slot_bytes)
+        self._free = deque(range(slot_count))
+        self._available = threading.Condition()
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def acquire(self, count: int, timeout: Optional[float] = None) -> Optional[List[int]]:
+        """Reserve `count` slots, None if they are not free within `timeout` seconds"""
+        if count > self.slot_count:
+            return None
+        with self._available:
+            if not self._available.wait_for(lambda: len(self._free) >= count, timeout=timeout):
+                return None
+            return [self._free.popleft() for _ in range(count)]
+
+    def release(self, slot: int) -> None:
+        with self._available:
+            self._free.append(slot)
+            self._available.notify_all()
+
+    def view(self, descriptor: PageDescriptor) -> np.ndarray:
+        """Wrap a written slot as an array, the slot is released with the array"""
+        start = descriptor.slot * self.slot_bytes
+        owner = _SlotBuffer(self.shm.buf[start:start + self.slot_bytes], descriptor)
+        weakref.finalize(owner, self.release, descriptor.slot)
+        return np.asarray(owner)
+
+    def close(self) -> None:
+        """Free the shared memory (pages still in use keep their mapping)"""
+        try:
+            self.shm.close()
+        except BufferError:
+            # Des vues sont encore vivantes : le segment est libéré à leur destruction
+            pass
+        self.shm.unlink()
+
+
+# Segments ouverts par les processus de rendu, clé : nom du segment
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def write_page(pool_name: str, slot: int, slot_bytes: int,
+               image: np.ndarray, page_number: int) -> Optional[PageDescriptor]:
+    """Copy a rendered page into its slot, from a rendering process
+
+    Returns:
+        The page descriptor, None if the page does not fit in a slot
+    """
+    if image.nbytes > slot_bytes:
+        return None
+
+    if pool_name not in _attached:
+        _attached[pool_name] = shared_memory.SharedMemory(name=pool_name)
+        # Le segment appartient au processus principal : il ne doit pas être
+        # supprimé quand ce processus de rendu se termine
+        resource_tracker.unregister(_attached[pool_name]._name, "shared_memory")
+
+    start = slot * slot_bytes
+    target = np.ndarray(image.shape, dtype=image.dtype, buffer=_attached[pool_name].buf, offset=start)
+    np.copyto(target, image)
+    return PageDescriptor(slot=slot, shape=image.shape, dtype=image.dtype.str, page_number=page_number)
+
+
+# Pool partagé par tout le processus, clé : (nombre de slots, taille d'un slot)
+_pools: Dict[Tuple[int, int], SharedPagePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_page_pool(slot_count: int, slot_bytes: int) -> SharedPagePool:
+    """Return the process-wide shared page pool for a size"""
+    with _pools_lock:
+        key = (slot_count, slot_bytes)
+        if key not in _pools:
+            _pools[key] = SharedPagePool(slot_count, slot_bytes)
+            atexit.register(_pools[key].close)
+        return _pools[key]
@@ -0,0 +1,15 @@
+from fastapi.testclient import TestClient
+
+import main
+from core.metrics import stage_seconds
+
+
+def test_metrics_endpoint_exposes_prometheus_text():
+    stage_seconds.labels("rasterize").observe(0.2)
+
+    response = TestClient(main.app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'document_processor_stage_seconds_count{stage="rasterize"}' in response.text
+    assert "document_processor_jobs_in_flight 0" in response.text
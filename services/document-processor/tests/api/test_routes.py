@@ -0,0 +1,168 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from datetime import date
+from pathlib import Path
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import Mock, PropertyMock, patch
+
+from api import routes
+from services.jobs import JobManager, worker
+from services.processor.models import ProcessedDocument, Transaction
+from services.tableau.models import TableBox
+
+
+@pytest.fixture
+def processor():
+    processor = Mock()
+    processor.process_document.return_value = ProcessedDocument(
+        transactions=[Transaction(date=date(2024, 1, 2), description="CB", amount=-12.5)],
+        page_count=1,
+        filename="statement.pdf",
+        processing_time=1.0
+    )
+    return processor
+
+
+@pytest.fixture
+def job_manager(test_config, processor):
+    registry = Mock(is_ready=True, error=None, config=test_config)
+    registry.create_processor.return_value = processor
+    executor = ThreadPoolExecutor(max_workers=1)
+    manager = JobManager(test_config, executor=executor)
+
+    with patch.object(worker, '_registry', registry):
+        manager.start()
+        yield manager
+    executor.shutdown()
+
+
+@pytest.fixture
+def client(job_manager):
+    app = FastAPI()
+    app.include_router(routes.router)
+
+    with patch.object(routes, 'job_manager', job_manager):
+        yield TestClient(app)
+
+
+def _upload(client, content=b'%PDF-1.4 statement'):
+    return client.post("/api/v1/pdf_processor/process/",
+                       files={'file': ('statement.pdf', content, 'application/pdf')})
+
+
+def test_process_reports_cache_miss_then_hit(client, processor):
+    first = _upload(client)
+    second = _upload(client)
+
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.status_code == 200
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    processor.process_document.assert_called_once()
+
+
+def test_cache_hit_does_not_need_models(client, processor):
+    _upload(client)
+
+    with patch.object(JobManager, 'error', new_callable=PropertyMock, return_value="load failed"):
+        assert _upload(client).headers["X-Cache"] == "HIT"
+        assert _upload(client, b'%PDF-1.4 other').status_code == 503
+
+
+def test_job_is_accepted_then_polled(client, processor):
+    response = client.post("/api/v1/pdf_processor/jobs/",
+                           files={'file': ('statement.pdf', b'%PDF-1.4 job', 'application/pdf')})
+
+    assert response.status_code == 202
+    job_url = response.headers["Location"]
+    for _ in range(100):
+        job = client.get(job_url).json()
+        if job["status"] not in ("queued", "running"):
+            break
+        time.sleep(0.01)
+
+    assert job["status"] == "done"
+    assert job["result"]["transaction_count"] == 1
+    assert client.get("/api/v1/pdf_processor/jobs/unknown").status_code == 404
+
+
+def test_full_queue_answers_429(client, job_manager, processor, test_config):
+    test_config.jobs.max_pending = 1
+    release = threading.Event()
+    processor.process_document.side_effect = lambda pdf_path, pages=None, period=None: release.wait() and None
+
+    first = client.post("/api/v1/pdf_processor/jobs/",
+                        files={'file': ('a.pdf', b'%PDF-1.4 a', 'application/pdf')})
+    second = client.post("/api/v1/pdf_processor/jobs/",
+                         files={'file': ('b.pdf', b'%PDF-1.4 b', 'application/pdf')})
+    release.set()
+
+    assert first.status_code == 202
+    assert second.status_code == 429
+    assert second.headers["Retry-After"] == str(test_config.jobs.retry_after_seconds)
+
+
+def test_rejects_non_pdf_files(client):
+    response = client.post("/api/v1/pdf_processor/process/",
+                           files={'file': ('statement.txt', b'text', 'text/plain')})
+
+    assert response.status_code == 400
+
+
+def test_debug_tables_are_drawn_from_saved_artifacts(client, job_manager, test_config):
+    test_config.artifacts.mode = "always"
+    artifacts = job_manager.debug_artifacts("doc")
+    artifacts.save_page(0, np.zeros((40, 40, 3), dtype=np.uint8), [TableBox(5, 5, 30, 30)])
+    job_manager.artifacts.flush()
+
+    response = client.get("/api/v1/pdf_processor/debug/doc/pages/0/tables.png")
+    missing = client.get("/api/v1/pdf_processor/debug/doc/pages/1/lines.png")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert missing.status_code == 404
+
+
+def _workspaces(test_config):
+    workspace_dir = Path(test_config.jobs.workspace_dir)
+    return list(workspace_dir.iterdir()) if workspace_dir.exists() else []
+
+
+def test_rejects_files_without_pdf_magic(client, processor, test_config):
+    response = _upload(client, b'<html>not a pdf</html>')
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "File is not a PDF"
+    assert _workspaces(test_config) == []
+    processor.process_document.assert_not_called()
+
+
+def test_rejects_oversized_files_while_streaming(client, processor, test_config):
+    test_config.document.max_file_size_mb = 1
+    # Sous la marge du Content-Length : refusé pendant la lecture du flux
+    just_over = _upload(client, b'%PDF-1.4 ' + b'x' * (1024 * 1024))
+    # Content-Length trop grand : refusé avant de lire le corps
+    declared = _upload(client, b'%PDF-1.4 ' + b'x' * (2 * 1024 * 1024))
+
+    assert just_over.status_code == 413
+    assert declared.status_code == 413
+    assert _workspaces(test_config) == []
+    processor.process_document.assert_not_called()
+
+
+def test_upload_is_hashed_while_streaming(client, job_manager):
+    content = b'%PDF-1.4 ' + bytes(range(256)) * 1000
+
+    with patch.object(job_manager, 'submit', wraps=job_manager.submit) as submit:
+        assert _upload(client, content).status_code == 200
+
+    job, content_hash = submit.call_args.args
+    assert content_hash == hashlib.sha256(content).hexdigest()
+    assert job.filename == "statement.pdf"
@@ -0,0 +1,57 @@
+import pytest
+from pathlib import Path
+
+from core.config import ServiceConfig
+
+@pytest.fixture
+def test_config(tmp_path, monkeypatch):
+    """Create test configuration with outputs written in a temporary folder"""
+    monkeypatch.chdir(tmp_path)
+    config_path = Path(__file__).parent.parent / 'config' / 'config.yaml'
+    return ServiceConfig(config_path=config_path)
+
+
+def write_text_pdf(path: Path, pages, images=None):
+    """Write a minimal PDF with a Helvetica text layer
+
+    Args:
+        path: Output path
+        pages: One list of (x, y, text) per page, in PDF points from the
+               top-left corner. An empty list gives a page without text.
+        images: Page index -> (x, y, width, height) of an image drawn under
+                the text of that page, e.g. the whole page for a scan
+    """
+    images = images or {}
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+               b"<< /Type /XObject /Subtype /Image /Width 1 /Height 1 /ColorSpace /DeviceGray "
+               b"/BitsPerComponent 8 /Length 1 >>\nstream\n\x80\nendstream"]
+    page_ids = []
+    for page_index, page in enumerate(pages):
+        stream = b""
+        if page_index in images:
+            x, y, width, height = images[page_index]
+            stream += b"q %d 0 0 %d %d %d cm /Im1 Do Q\n" % (width, height, x, 842 - y - height)
+        stream += b"".join(
+            b"BT /F1 10 Tf %d %d Td (%s) Tj ET\n" % (x, 842 - y, text.encode('latin-1'))
+            for x, y, text in page
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> /XObject << /Im1 4 0 R >> >> "
+                       b"/Contents %d 0 R >>" % len(objects))
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids))
+
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(content)
+    content += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    content += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    content += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(content)
+    return path
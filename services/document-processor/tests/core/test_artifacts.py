@@ -0,0 +1,73 @@
+import threading
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from core.artifacts import ArtifactWriter
+from services.ocr.models import BoundingBox, Line, Word
+from services.processor.models import Transaction
+from services.tableau.models import TableBox
+
+LINES = [Line(words=[Word(text='02/01', confidence=0.9, bbox=BoundingBox(1, 1, 5, 5))], y_position=3)]
+
+
+def test_off_mode_writes_nothing(test_config):
+    test_config.artifacts.mode = "off"
+    writer = ArtifactWriter(test_config)
+    artifacts = writer.session("doc")
+
+    artifacts.save_page(0, np.zeros((4, 4, 3), dtype=np.uint8), [TableBox(0, 0, 2, 2)])
+    artifacts.save_lines(0, 0, LINES)
+
+    assert not artifacts.enabled
+    assert writer._thread is None
+    assert not Path(test_config.output_folders.pages).exists()
+
+
+def test_sampled_mode_follows_sample_rate(test_config):
+    test_config.artifacts.mode = "sampled"
+    test_config.artifacts.sample_rate = 0.0
+    assert not ArtifactWriter(test_config).session("doc").enabled
+
+    test_config.artifacts.sample_rate = 1.0
+    assert ArtifactWriter(test_config).session("doc").enabled
+
+
+def test_always_mode_writes_in_background_and_reads_back(test_config):
+    test_config.artifacts.mode = "always"
+    writer = ArtifactWriter(test_config)
+    artifacts = writer.session("doc")
+    image = np.random.default_rng(0).integers(0, 255, (20, 30, 3), dtype=np.uint8)
+
+    artifacts.save_page(1, image, [TableBox(0, 0, 10, 10)])
+    artifacts.save_lines(1, 0, LINES)
+    artifacts.save_lines(1, 1, LINES)
+    artifacts.save_transactions([Transaction(date=date(2024, 1, 2), description="CB", amount=-1.0)])
+    writer.flush()
+
+    assert np.array_equal(artifacts.load_page(1), image)
+    assert artifacts.load_boxes(1) == [[0, 0, 10, 10]]
+    assert [Line.from_dict(line) for line in artifacts.load_lines(1)] == LINES + LINES
+    assert (Path(test_config.output_folders.text) / "doc" / "page_1_table_0_lines.txt").read_text() == "02/01\n"
+    assert (Path(test_config.output_folders.transactions) / "doc_transactions.csv").exists()
+    assert artifacts.load_page(2) is None
+
+
+def test_full_queue_drops_artifacts(test_config):
+    test_config.artifacts.queue_size = 1
+    writer = ArtifactWriter(test_config)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking_write(path):
+        started.set()
+        release.wait()
+
+    assert writer.submit(Path("a"), blocking_write)
+    started.wait()
+    assert writer.submit(Path("b"), lambda path: None)
+    assert not writer.submit(Path("c"), lambda path: None)
+
+    release.set()
+    writer.flush()
@@ -0,0 +1,75 @@
+import importlib.util
+import io
+import json
+from pathlib import Path
+
+import cashflow_logger
+import pytest
+
+from core.logger import StructuredLogger, log
+
+SERVICES = Path(__file__).resolve().parents[3]
+
+
+class Unformattable:
+    def __format__(self, spec):
+        raise AssertionError("formatted below the level")
+
+
+@pytest.fixture
+def console():
+    stream = io.StringIO()
+    yield stream
+    # Restaurer la configuration du logger global
+    log.configure()
+
+
+def records(logger: StructuredLogger, stream: io.StringIO):
+    logger.complete()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_lines_carry_fields(console):
+    logger = StructuredLogger(level="INFO", fmt="json", log_dir="", console=console)
+
+    logger.info("Job {} done", "abc", job_id="abc")
+    logger.log_result({'transactions': [{'amount': 1.5}]})
+
+    first, result = records(logger, console)
+    assert first['message'] == "Job abc done"
+    assert first['job_id'] == "abc"
+    assert first['function'] == "test_json_lines_carry_fields"
+    assert result['result'] == {'transactions': [{'amount': 1.5}]}
+
+
+def test_arguments_are_not_formatted_below_the_level(console):
+    logger = StructuredLogger(level="INFO", fmt="text", log_dir="", console=console)
+
+    logger.debug("Value {}", Unformattable())
+
+    assert not logger.is_enabled("DEBUG")
+    logger.complete()
+    assert console.getvalue() == ""
+
+
+def test_sampling_and_rate_limit_per_call_site(console):
+    logger = StructuredLogger(level="INFO", fmt="json", log_dir="", console=console)
+
+    for index in range(10):
+        logger.info("Sampled {}", index, sample=4)
+    for index in range(5):
+        logger.warning("Limited {}", index, rate=0.01)
+
+    messages = [(record['message'], record.get('suppressed')) for record in records(logger, console)]
+    assert messages == [("Sampled 0", None), ("Sampled 4", 3), ("Sampled 8", 3), ("Limited 0", None)]
+
+
+@pytest.mark.skipif(not (SERVICES / "orchestrator").exists(), reason="other services not checked out")
+def test_services_share_the_same_logger():
+    # Chaque service réexporte le paquet commun au lieu d'en garder une copie
+    for path in (SERVICES / "orchestrator" / "app" / "core" / "logger.py",
+                 SERVICES / "transaction-analyzer" / "app" / "core" / "logger.py"):
+        spec = importlib.util.spec_from_file_location(f"logger_{path.parents[2].name}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        assert module.log is log is cashflow_logger.log
@@ -0,0 +1,54 @@
+import pickle
+
+import pytest
+
+from core.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_histogram_renders_cumulative_buckets(registry):
+    stages = registry.histogram("stage_seconds", "Stage duration", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        stages.labels("ocr").observe(value)
+
+    text = registry.render()
+
+    assert "# TYPE stage_seconds histogram" in text
+    assert 'stage_seconds_bucket{stage="ocr",le="0.1"} 1' in text
+    assert 'stage_seconds_bucket{stage="ocr",le="1"} 3' in text
+    assert 'stage_seconds_bucket{stage="ocr",le="+Inf"} 4' in text
+    assert 'stage_seconds_sum{stage="ocr"} 4.05' in text
+    assert 'stage_seconds_count{stage="ocr"} 4' in text
+
+
+def test_worker_snapshots_are_merged(registry):
+    # Même registre des deux côtés : le worker est simulé par un autre pid
+    pages = registry.counter("pages", "Pages")
+    stages = registry.histogram("stage_seconds", "Stage duration", ("stage",), buckets=(1.0,))
+    memory = registry.gauge("model_memory_bytes", "Model memory", ("model",))
+    pages.inc(3)
+    stages.labels("ocr").observe(0.5)
+    memory.labels("ocr").set(100)
+
+    snapshot = pickle.loads(pickle.dumps(registry.drain()))
+    assert "pages_total 0" in registry.render()
+
+    for pid in (1, 2):
+        registry.merge({**snapshot, 'pid': pid})
+    text = registry.render()
+
+    assert "pages_total 6" in text
+    assert 'stage_seconds_count{stage="ocr"} 2' in text
+    # Jauges : la valeur de chaque processus, additionnées (100 du processus courant, 100 par worker)
+    assert 'model_memory_bytes{model="ocr"} 300' in text
+
+
+def test_labels_must_match_label_names(registry):
+    stages = registry.histogram("stage_seconds", "Stage duration", ("stage",))
+
+    with pytest.raises(ValueError):
+        stages.labels()
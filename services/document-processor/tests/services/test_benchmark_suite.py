@@ -0,0 +1,33 @@
+from benchmarks import recording
+from benchmarks.suite import DEFAULT_RECORDING, build_cases, compare
+
+
+def test_recorded_outputs_replay_the_statement(test_config):
+    test_config.artifacts.mode = "off"
+    cases = build_cases(recording.load(DEFAULT_RECORDING), test_config)
+
+    tables_lines = cases['ocr_postprocess']()
+    transactions = cases['parse_lines']()
+
+    assert len(tables_lines) == 3
+    assert len(transactions) == 120
+    assert transactions[0].description == "VIREMENTLOYER"
+    assert transactions[0].amount == -745.93
+    assert len(cases['validate_transactions']()) == 120
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = {
+        'ocr_postprocess': {'pages_per_sec': 1000.0, 'alloc_bytes_per_page': 1000.0},
+        'parse_lines': {'pages_per_sec': 1000.0, 'alloc_bytes_per_page': 1000.0},
+    }
+    results = {
+        'ocr_postprocess': {'pages_per_sec': 800.0, 'alloc_bytes_per_page': 1200.0},
+        'parse_lines': {'pages_per_sec': 700.0, 'alloc_bytes_per_page': 1300.0},
+        'parse_bulk': {'pages_per_sec': 1.0, 'alloc_bytes_per_page': 1e9},
+    }
+
+    regressions = compare(results, baseline, threshold=0.25)
+
+    assert len(regressions) == 2
+    assert all(regression.startswith("parse_lines") for regression in regressions)
@@ -0,0 +1,167 @@
+import os
+import time
+from datetime import date
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from services.cache import DiskCache, DocumentCache, PageCache, pipeline_version
+from services.ocr.models import Line
+from services.processor.models import DocumentTimings, ProcessedDocument, Transaction
+from services.tableau.models import TableBox
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    return DiskCache(tmp_path / 'cache', max_size_bytes=10_000, ttl_seconds=60)
+
+
+def _document(error=None):
+    return ProcessedDocument(
+        transactions=[Transaction(date=date(2024, 1, 2), description="CB", amount=-12.5)],
+        page_count=1,
+        filename="statement.pdf",
+        processing_time=1.0,
+        error=error
+    )
+
+
+def test_disk_cache_roundtrip(disk_cache):
+    assert disk_cache.get('ab' * 32) is None
+
+    disk_cache.set('ab' * 32, {'value': 1})
+
+    assert disk_cache.get('ab' * 32) == {'value': 1}
+
+
+def test_disk_cache_expires_entries(disk_cache):
+    disk_cache.set('ab' * 32, 'value')
+    disk_cache.ttl_seconds = 0
+    time.sleep(0.01)
+
+    assert disk_cache.get('ab' * 32) is None
+    assert not list(disk_cache.directory.glob('*/*.pkl'))
+
+
+
+def test_disk_cache_eviction_expires_by_creation_time(disk_cache):
+    disk_cache.set('aa' * 32, 'stale')
+    disk_cache.ttl_seconds = 0.05
+    time.sleep(0.1)
+    # Lue récemment (mtime à jour) mais créée avant le TTL
+    os.utime(disk_cache._path('aa' * 32))
+
+    with disk_cache._lock:
+        disk_cache._evict()
+
+    assert not disk_cache._path('aa' * 32).exists()
+
+def test_disk_cache_evicts_least_recently_used(disk_cache):
+    payload = b'x' * 4000
+    for index, key in enumerate(['aa' * 32, 'bb' * 32]):
+        disk_cache.set(key, payload)
+        # Accès plus ancien pour la première entrée
+        path = disk_cache._path(key)
+        os.utime(path, (time.time() - 10 + index, time.time() - 10 + index))
+    disk_cache.get('aa' * 32)
+
+    disk_cache.set('cc' * 32, payload)
+
+    assert disk_cache.get('bb' * 32) is None
+    assert disk_cache.get('aa' * 32) == payload
+    assert disk_cache.get('cc' * 32) == payload
+
+
+def test_document_cache_roundtrip(test_config):
+    cache = DocumentCache(test_config)
+
+    cache.set('f00d', _document())
+
+    assert cache.get('f00d') == _document()
+    assert cache.get('beef') is None
+
+
+
+def test_document_cache_hit_drops_artifacts_and_timings(test_config):
+    # Dossier du job d'origine peut-être purgé, temps non mesurés pour cette requête
+    cache = DocumentCache(test_config)
+    document = _document()
+    document.artifacts_id, document.timings = "job", DocumentTimings(cpu_time=1.0)
+
+    cache.set('f00d', document)
+
+    assert cache.get('f00d') == _document()
+
+def test_document_cache_skips_failed_results(test_config):
+    cache = DocumentCache(test_config)
+
+    cache.set('f00d', _document(error="boom"))
+
+    assert cache.get('f00d') is None
+
+
+def test_document_cache_can_be_disabled(test_config):
+    test_config.cache.enabled = False
+    cache = DocumentCache(test_config)
+
+    cache.set('f00d', _document())
+
+    assert cache.get('f00d') is None
+
+
+def test_pipeline_version_tracks_ocr_tolerances(test_config):
+    version = pipeline_version(test_config)
+    test_config.ocr.y_tolerance += 1
+
+    assert pipeline_version(test_config) != version
+
+
+def test_page_cache_keys_on_page_pixels(test_config):
+    cache = PageCache(test_config)
+    page = np.zeros((20, 10, 3), dtype=np.uint8)
+    other = page.copy()
+    other[0, 0, 0] = 1
+
+    cache.set_detections(cache.page_hash(page), [TableBox(0, 0, 5, 5)])
+    cache.set_lines(cache.page_hash(page), [0, 0, 5, 5], [Line(words=[], y_position=1.0)])
+
+    assert cache.get_detections(cache.page_hash(page.copy())) == [TableBox(0, 0, 5, 5)]
+    assert cache.get_detections(cache.page_hash(other)) is None
+    assert cache.get_lines(cache.page_hash(page), [0, 0, 5, 5]) == [Line(words=[], y_position=1.0)]
+    assert cache.get_lines(cache.page_hash(page), [0, 0, 6, 5]) is None
+
+
+def test_page_cache_ocr_lines_depend_on_tolerances(test_config):
+    page_hash = PageCache.page_hash(np.zeros((2, 2, 3), dtype=np.uint8))
+    PageCache(test_config).set_lines(page_hash, [0, 0, 1, 1], [])
+    test_config.ocr.x_tolerance += 1
+
+    assert PageCache(test_config).get_lines(page_hash, [0, 0, 1, 1]) is None
+
+
+def test_page_cache_can_be_disabled(test_config):
+    test_config.cache.page_cache_enabled = False
+    cache = PageCache(test_config)
+
+    cache.set_detections('f00d', [])
+
+    assert not cache.enabled
+    assert cache.get_detections('f00d') is None
+
+
+def test_disk_cache_scans_only_when_over_budget(disk_cache):
+    with patch.object(DiskCache, '_evict', autospec=True, side_effect=DiskCache._evict) as evict:
+        for index in range(20):
+            disk_cache.set(f"{index:02d}" * 32, b'x' * 100)
+        # Premier parcours pour connaître la taille, aucun autre sous la limite
+        assert evict.call_count == 1
+
+        for index in range(20, 40):
+            disk_cache.set(f"{index:02d}" * 32, b'x' * 1000)
+
+    # Au-delà de la limite : éviction sous 90 % de la taille max, pas un parcours par écriture
+    assert 1 < evict.call_count < 10
+    sizes = sum(path.stat().st_size for path in disk_cache.directory.glob('*/*.pkl'))
+    assert sizes <= disk_cache.max_size_bytes
+    assert disk_cache._size == sizes
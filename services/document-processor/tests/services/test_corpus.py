@@ -0,0 +1,47 @@
+import json
+from datetime import date
+
+import pytest
+
+from benchmarks.score import match
+from services.ocr.text_layer import TextLayerExtractor
+from services.processor.models import Transaction
+
+pytest.importorskip("reportlab")
+
+from benchmarks.corpus import format_amount, generate  # noqa: E402
+
+
+def test_statements_carry_their_ground_truth(test_config, tmp_path):
+    manifest = generate(tmp_path / "corpus", documents=2, pages=2, noise_pages=1, seed=3)
+
+    entry = manifest['documents'][0]
+    truth = json.loads((tmp_path / "corpus" / entry['truth']).read_text())
+    pages = TextLayerExtractor(test_config).extract_document(tmp_path / "corpus" / entry['pdf'])
+    page_texts = [" ".join(word.text for word in page.words) for page in pages]
+
+    assert len(manifest['documents']) == 2
+    assert len(pages) == entry['pages'] == 3
+    assert entry['transactions'] == len(truth['transactions']) > 0
+    # Une page de bruit, sans transaction
+    assert len({transaction['page'] for transaction in truth['transactions']}) == 2
+    for transaction in truth['transactions']:
+        day_month = date.fromisoformat(transaction['date']).strftime("%d.%m")
+        assert f"{day_month} {transaction['description']} {format_amount(transaction['amount'])}" \
+            in page_texts[transaction['page']]
+
+
+def test_match_counts_each_expected_transaction_once():
+    expected = [
+        {'date': "2024-03-05", 'description': "PRLV SEPA EDF", 'amount': -52.3},
+        {'date': "2024-03-05", 'description': "PRLV SEPA EDF", 'amount': -52.3},
+        {'date': "2024-03-09", 'description': "VIREMENT SALAIRE", 'amount': 2100.0},
+    ]
+    found = [
+        Transaction(date(2024, 3, 5), "PRLVSEPA EDF", -52.3),
+        Transaction(date(2024, 3, 5), "PRLV SEPA EDF", -52.3),
+        Transaction(date(2024, 3, 5), "PRLV SEPA EDF", -52.3),
+        Transaction(date(2024, 3, 9), "VIREMENT", 2100.0),
+    ]
+
+    assert match(expected, found) == {'expected': 3, 'found': 4, 'matched': 3, 'same_description': 2}
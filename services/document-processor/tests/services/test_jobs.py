@@ -0,0 +1,168 @@
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from services.jobs import JobManager, WorkersUnavailableError, worker
+from services.ocr.extractor import OcrExtractor
+from services.processor.models import DocumentTimings, ProcessedDocument
+from services.processor.processor import DocumentProcessor
+from tests.conftest import write_text_pdf
+
+
+@pytest.fixture
+def registry(test_config):
+    return Mock(is_ready=True, error=None, config=test_config)
+
+
+@pytest.fixture
+def manager(test_config, registry):
+    executor = ThreadPoolExecutor(max_workers=1)
+    manager = JobManager(test_config, executor=executor)
+    with patch.object(worker, '_registry', registry):
+        manager.start()
+        yield manager
+    executor.shutdown()
+
+
+def _run(manager, content=b'%PDF-1.4'):
+    job = manager.create_job("statement.pdf")
+    job.pdf_path.write_bytes(content)
+    return _wait(manager.submit(job, content.hex()))
+
+
+def _wait(job):
+    # Résultat posé une fois le job enregistré et les anciens jobs purgés
+    return job.completed.result(timeout=10)
+
+
+def test_thread_budget_shares_the_cores(test_config):
+    test_config.jobs.workers = 4
+    test_config.jobs.threads_per_worker = 0
+
+    with patch('core.config.os.cpu_count', return_value=32):
+        assert test_config.jobs.thread_budget == 8
+        test_config.jobs.workers = 0
+        test_config.jobs.threads_per_worker = 2
+        assert test_config.jobs.worker_count == 16
+
+
+def test_pages_dispatch_splits_and_merges_shards(manager, registry, test_config):
+    test_config.jobs.dispatch = "pages"
+    test_config.jobs.pages_per_shard = 2
+
+    def process_document(pdf_path, pages=None, period=None):
+        timings = DocumentTimings(cpu_time=0.5, peak_rss_delta=len(pages))
+        for page in pages:
+            timings.add("ocr", 1.0, [page])
+        return ProcessedDocument(transactions=list(pages), page_count=len(pages),
+                                 filename=pdf_path.name, processing_time=1.0, timings=timings)
+
+    registry.create_processor.return_value.process_document.side_effect = process_document
+    job = manager.create_job("statement.pdf")
+    write_text_pdf(job.pdf_path, [[]] * 5)
+    job = _wait(manager.submit(job, "hash"))
+
+    assert job.status == "done"
+    assert job.result.transactions == [0, 1, 2, 3, 4]
+    assert job.result.page_count == 5
+    assert job.result.timings.stages == {"ocr": 5.0}
+    assert sorted(job.result.timings.pages) == [0, 1, 2, 3, 4]
+    assert (job.result.timings.cpu_time, job.result.timings.peak_rss_delta) == (1.5, 2)
+    assert registry.create_processor.return_value.process_document.call_count == 3
+
+
+
+def _statement_page(day_month, header=()):
+    return list(header) + [
+        (40, 100, "DATE"), (150, 100, "LIBELLE"), (400, 100, "DEBIT"), (480, 100, "CREDIT"),
+        (40, 130, day_month), (150, 130, "PAIEMENT CB"), (400, 130, "10,00"),
+    ]
+
+
+def test_shards_share_the_statement_period(manager, registry, test_config):
+    test_config.jobs.dispatch = "pages"
+    test_config.jobs.pages_per_shard = 2
+    test_config.pipeline.enabled = False
+    registry.create_processor.side_effect = lambda config: DocumentProcessor(
+        Mock(), OcrExtractor(ocr_model=Mock(), config=config), config)
+    job = manager.create_job("statement.pdf")
+    # Période sur la première page seulement : le second shard n'a que des dates de janvier sans année
+    write_text_pdf(job.pdf_path, [
+        _statement_page("28.12", header=[(40, 60, "Releve du 01.12.2023 au 31.01.2024")]),
+        _statement_page("30.12"), _statement_page("03.01"), _statement_page("05.01"),
+    ])
+
+    job = _wait(manager.submit(job, "hash"))
+
+    assert job.status == "done"
+    assert [transaction.date for transaction in job.result.transactions] == [
+        date(2023, 12, 28), date(2023, 12, 30), date(2024, 1, 3), date(2024, 1, 5)
+    ]
+
+def test_job_outputs_go_to_its_workspace(test_config):
+    workspace = Path(test_config.jobs.workspace_dir) / "job"
+    job_config = test_config.for_workspace(workspace)
+
+    assert job_config.output_folders.pages == str(workspace / "pages")
+    assert test_config.output_folders.pages == "output/pages"
+    assert job_config.ocr is test_config.ocr
+
+
+def test_worker_exception_fails_the_job(manager, registry):
+    registry.create_processor.side_effect = RuntimeError("Models are not ready")
+
+    job = _run(manager)
+
+    assert job.status == "failed"
+    assert job.error == "Models are not ready"
+    assert not job.pdf_path.exists()
+
+
+def test_oldest_finished_jobs_are_pruned(manager, registry, test_config):
+    test_config.jobs.keep_finished = 1
+    registry.create_processor.return_value.process_document.return_value = Mock(error=None, transactions=[1])
+
+    first = _run(manager, b'first')
+    second = _run(manager, b'second')
+
+    assert manager.get(first.id) is None
+    assert not first.workspace.exists()
+    assert manager.get(second.id).status == "done"
+
+
+def test_failed_dispatch_does_not_leave_a_queued_job(test_config, registry):
+    executor = Mock()
+    manager = JobManager(test_config, executor=executor)
+    manager.start()
+    executor.submit.side_effect = RuntimeError("cannot schedule new futures after shutdown")
+    job = manager.create_job("statement.pdf")
+    job.pdf_path.write_bytes(b'%PDF-1.4')
+
+    with pytest.raises(WorkersUnavailableError):
+        manager.submit(job, "hash")
+
+    assert manager.get(job.id) is None
+    assert manager.pending_count == 0
+    assert not job.workspace.exists()
+
+
+def test_broken_pool_is_replaced(test_config, registry):
+    broken = Mock()
+    broken.submit.side_effect = BrokenProcessPool("A process in the pool was terminated abruptly")
+    replacement = ThreadPoolExecutor(max_workers=1)
+    manager = JobManager(test_config, executor=broken)
+    registry.create_processor.return_value.process_document.return_value = Mock(error=None, transactions=[1])
+
+    with patch.object(worker, '_registry', registry), \
+            patch.object(JobManager, '_create_executor', return_value=replacement):
+        job = _run(manager)
+
+    assert job.status == "done"
+    broken.shutdown.assert_called_once()
+    assert manager._executor is replacement
+    assert manager.is_ready
+    replacement.shutdown()
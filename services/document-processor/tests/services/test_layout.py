@@ -0,0 +1,48 @@
+import pytest
+
+from services.ocr.layout import LayoutAnalyzer
+from services.ocr.models import BoundingBox, Word
+
+
+def _word(text, x1, y1, x2, y2, confidence=1.0):
+    return Word(text=text, confidence=confidence, bbox=BoundingBox(x1, y1, x2, y2))
+
+
+@pytest.fixture
+def layout(test_config):
+    test_config.ocr.x_tolerance = 15
+    test_config.ocr.y_tolerance = 10
+    test_config.ocr.debit_x_tolerance = 20
+    return LayoutAnalyzer(test_config)
+
+
+def test_analyze_merges_cells_and_marks_debit_amounts(layout):
+    words = [
+        _word("12,50", 510, 40, 560, 60),
+        _word("DEBIT", 500, 0, 560, 20),
+        _word("CB", 160, 42, 200, 62, confidence=0.5),
+        _word("02.01", 10, 40, 60, 60),
+        _word("PAIEMENT", 70, 41, 150, 61),
+    ]
+
+    lines = layout.analyze(words)
+
+    assert [line.text for line in lines] == ["DEBIT", "02.01 PAIEMENTCB -12.5"]
+    assert lines[1].words[1].confidence == pytest.approx(0.75)
+    assert lines[1].words[1].bbox == BoundingBox(70, 41, 200, 62)
+
+
+def test_group_lines_keeps_the_words_unmerged(layout):
+    words = [_word("B", 30, 2, 40, 12), _word("A", 0, 0, 20, 10), _word("C", 0, 30, 20, 40)]
+
+    lines = layout.group_lines(words)
+
+    assert [[word.text for word in line.words] for line in lines] == [["A", "B"], ["C"]]
+    assert lines[0].words[0] is words[1]
+    assert lines[0].y_position == pytest.approx(6)
+
+
+def test_merge_words_ignores_vertical_position(layout):
+    words = [_word("1", 25, 100, 35, 110), _word("0", 0, 0, 20, 10), _word("X", 80, 0, 90, 10)]
+
+    assert [word.text for word in layout.merge_words(words)] == ["01", "X"]
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+
+from services.tableau.model_handler import ModelHandler
+from services.tableau.models import TableBox
+
+
+def _fake_result(image):
+    """Fake YOLO result with one box derived from the image content"""
+    value = float(image[0, 0, 0])
+    xyxy = Mock()
+    xyxy.cpu.return_value.numpy.return_value = np.array([[value, 0, value + 10, 20]])
+    return Mock(boxes=Mock(xyxy=xyxy))
+
+
+@pytest.fixture
+def model_handler(test_config):
+    model = Mock(side_effect=lambda source: [_fake_result(image) for image in
+                                             (source if isinstance(source, list) else [source])])
+    return ModelHandler(test_config, model=model)
+
+
+def test_detect_tables_batch_matches_per_page(model_handler):
+    images = [np.full((50, 40, 3), i, dtype=np.uint8) for i in range(5)]
+
+    batched = model_handler.detect_tables_batch(images, batch_size=2)
+
+    assert batched == [model_handler.detect_tables(image) for image in images]
+    assert batched[3] == [TableBox(3, 0, 13, 20)]
+
+
+def test_detect_tables_batch_respects_batch_size_and_shapes(model_handler):
+    images = [np.zeros((50, 40, 3), dtype=np.uint8)] * 3 + [np.zeros((60, 40, 3), dtype=np.uint8)]
+
+    model_handler.detect_tables_batch(images, batch_size=2)
+
+    batch_sizes = [len(call.args[0]) for call in model_handler.model.call_args_list]
+    assert batch_sizes == [2, 1, 1]
+
+
+def test_detect_tables_batch_uses_config_batch_size(model_handler, test_config):
+    test_config.tableau.batch_size = 3
+    images = [np.zeros((50, 40, 3), dtype=np.uint8)] * 7
+
+    model_handler.detect_tables_batch(images)
+
+    assert [len(call.args[0]) for call in model_handler.model.call_args_list] == [3, 3, 1]
+
+
+def test_detect_tables_logs_model_errors(model_handler):
+    model_handler.model.side_effect = RuntimeError("CUDA out of memory")
+
+    with patch('services.tableau.model_handler.log') as log:
+        assert model_handler.detect_tables(np.zeros((50, 40, 3), dtype=np.uint8)) == []
+
+    log.error.assert_called_once()
+
+
+def test_detect_tables_batch_failure_raises(model_handler):
+    # Des pages vides passeraient pour "aucun tableau" et seraient mises en cache
+    model_handler.model.side_effect = RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        model_handler.detect_tables_batch([np.zeros((50, 40, 3), dtype=np.uint8)] * 2)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+
+from services.registry.model_registry import ModelRegistry, SharedPredictor
+
+
+@pytest.fixture
+def mock_models():
+    with patch('services.registry.model_registry.ocr_predictor') as mock_predictor, \
+            patch('services.registry.model_registry.ModelHandler') as mock_handler:
+        yield mock_predictor, mock_handler
+
+
+def test_registry_not_ready_before_initialize(test_config):
+    registry = ModelRegistry(test_config)
+
+    assert not registry.is_ready
+    with pytest.raises(RuntimeError):
+        registry.create_processor()
+
+
+def test_initialize_loads_models_once_and_warms_up(test_config, mock_models):
+    mock_predictor, mock_handler = mock_models
+    registry = ModelRegistry(test_config)
+
+    registry.initialize()
+    registry.initialize()
+
+    assert registry.is_ready
+    mock_predictor.assert_called_once_with(pretrained=True)
+    mock_handler.assert_called_once_with(test_config)
+    mock_handler.return_value.detect_tables.assert_called_once()
+    warmup_image = mock_handler.return_value.detect_tables.call_args[0][0]
+    assert warmup_image.shape == (test_config.models.warmup_image_size,) * 2 + (3,)
+
+
+def test_initialize_failure_keeps_registry_not_ready(test_config, mock_models):
+    mock_predictor, _ = mock_models
+    mock_predictor.side_effect = RuntimeError("download failed")
+    registry = ModelRegistry(test_config)
+
+    registry.initialize()
+
+    assert not registry.is_ready
+    assert registry.error == "download failed"
+
+
+def test_create_processor_shares_models(test_config, mock_models):
+    registry = ModelRegistry(test_config)
+    registry.initialize()
+
+    first = registry.create_processor()
+    second = registry.create_processor()
+
+    assert first.tableau_extractor.model_handler is second.tableau_extractor.model_handler
+    assert first.ocr_extractor.ocr_model is registry.ocr_model
+
+
+def test_shared_predictor_forwards_calls():
+    model = Mock(return_value="result")
+    predictor = SharedPredictor(model)
+
+    assert predictor([np.zeros((2, 2, 3))]) == "result"
+    model.assert_called_once()
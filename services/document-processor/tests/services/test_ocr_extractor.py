@@ -0,0 +1,126 @@
+import numpy as np
+from pathlib import Path
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from services.cache import PageCache
+from services.ocr.extractor import OcrExtractor
+from services.ocr.models import BoundingBox
+from services.tableau.models import ProcessedTable, TableBox
+
+
+def make_page(words):
+    """Build a doctr-like page from (text, ((x1, y1), (x2, y2)), confidence) tuples"""
+    doctr_words = [SimpleNamespace(value=text, geometry=geometry, confidence=confidence)
+                   for text, geometry, confidence in words]
+    return SimpleNamespace(blocks=[SimpleNamespace(lines=[SimpleNamespace(words=doctr_words)])])
+
+
+STATEMENT_WORDS = [
+    ("DATE", ((0.05, 0.05), (0.15, 0.10)), 0.99),
+    ("LIBELLE", ((0.32, 0.05), (0.45, 0.10)), 0.99),
+    ("DEBIT", ((0.70, 0.05), (0.80, 0.10)), 0.99),
+    ("02.01", ((0.05, 0.20), (0.15, 0.25)), 0.95),
+    ("PAIEMENT", ((0.30, 0.20), (0.42, 0.25)), 0.90),
+    ("CB", ((0.43, 0.20), (0.47, 0.25)), 0.90),
+    ("12,50", ((0.70, 0.20), (0.78, 0.25)), 0.97),
+]
+
+
+@pytest.fixture
+def ocr_model():
+    """Fake doctr predictor returning one statement page per input image"""
+    return Mock(side_effect=lambda doc: SimpleNamespace(pages=[make_page(STATEMENT_WORDS) for _ in doc]))
+
+
+@pytest.fixture
+def ocr_extractor(ocr_model, test_config):
+    return OcrExtractor(ocr_model=ocr_model, config=test_config)
+
+
+def _page_image():
+    return np.full((400, 1000, 3), 255, dtype=np.uint8)
+
+
+def test_extract_text_from_region_builds_lines(ocr_extractor):
+    lines = ocr_extractor.extract_text_from_region(_page_image(), [0, 0, 1000, 400], 0)
+
+    texts = [[word.text for word in line.words] for line in lines]
+    assert texts == [['DATE', 'LIBELLE', 'DEBIT'], ['02.01', 'PAIEMENTCB', '-12.5']]
+
+
+def test_extract_text_from_tables_batches_all_regions(ocr_extractor, ocr_model, test_config):
+    test_config.ocr.batch_size = 2
+    image = _page_image()
+    tables = [ProcessedTable(image=image, coordinates=TableBox(0, 0, 1000, 400), page_number=page)
+              for page in range(3)]
+
+    results = ocr_extractor.extract_text_from_tables(tables)
+
+    assert [len(call.args[0]) for call in ocr_model.call_args_list] == [2, 1]
+    assert results == [ocr_extractor.extract_text_from_region(image, [0, 0, 1000, 400], 0)] * 3
+
+
+def test_extract_text_from_regions_skips_empty_regions(ocr_extractor, ocr_model):
+    image = _page_image()
+
+    results = ocr_extractor.extract_text_from_regions([
+        (image, [10, 10, 10, 10], 0),
+        (image, [0, 0, 1000, 400], 1),
+    ])
+
+    assert results[0] == []
+    assert len(results[1]) == 2
+    assert len(ocr_model.call_args.args[0]) == 1
+
+
+def test_regions_are_passed_in_memory(ocr_extractor, ocr_model, test_config):
+    image = _page_image()
+
+    ocr_extractor.extract_text_from_region(image, [0, 0, 1000, 400], 0)
+
+    region = ocr_model.call_args.args[0][0]
+    assert isinstance(region, np.ndarray)
+    assert np.shares_memory(region, image)
+    assert not list(Path(test_config.output_folders.pages).glob('ocr_page_*.png'))
+
+
+def test_debug_images_are_opt_in(ocr_extractor, test_config):
+    test_config.ocr.save_debug_images = True
+
+    ocr_extractor.extract_text_from_region(_page_image(), [0, 0, 1000, 400], 0)
+
+    assert list(Path(test_config.output_folders.pages).glob('ocr_page_0_*.png'))
+
+
+def test_extract_text_from_tables_reuses_cached_lines(ocr_model, test_config):
+    ocr_extractor = OcrExtractor(ocr_model=ocr_model, config=test_config, page_cache=PageCache(test_config))
+    image = _page_image()
+    tables = [ProcessedTable(image=image, coordinates=TableBox(0, 0, 1000, 400), page_number=0,
+                             page_hash=PageCache.page_hash(image))]
+
+    first = ocr_extractor.extract_text_from_tables(tables)
+    second = ocr_extractor.extract_text_from_tables(tables)
+
+    assert second == first
+    assert ocr_model.call_count == 1
+
+
+def test_lines_are_clustered_from_the_first_word_of_each_line(ocr_extractor, test_config):
+    test_config.ocr.y_tolerance = 10
+    test_config.ocr.x_tolerance = 15
+    page = make_page([
+        ("B", ((0.50, 0.100), (0.60, 0.120)), 0.5),
+        ("A", ((0.10, 0.100), (0.20, 0.120)), 1.0),
+        ("C", ((0.21, 0.108), (0.30, 0.128)), 0.8),   # 8px below A: same line
+        ("D", ((0.10, 0.116), (0.20, 0.136)), 0.9),   # 16px below A: next line, although 8px below C
+        ("12", ((0.40, 0.200), (0.45, 0.220)), 0.9),
+        ("E", ((0.455, 0.200), (0.50, 0.220)), 0.9),  # close to "12" but not a number
+    ])
+
+    lines = ocr_extractor._process_page(page, [0, 0, 1000, 1000])
+
+    assert [[word.text for word in line.words] for line in lines] == [['AC', 'B'], ['D'], ['12', 'E']]
+    assert lines[0].words[0].confidence == pytest.approx(0.9)
+    assert lines[0].words[0].bbox == BoundingBox(100, 100, 300, 128)
@@ -0,0 +1,104 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.ocr.models import BoundingBox, Line, Word
+from services.processor.parser import (
+    FRAME_COLUMNS, StatementParser, StatementPeriod, parse_amount, parse_amounts
+)
+from services.processor.transaction_extractor import TransactionExtractor
+from services.processor.validator import TransactionValidator
+
+
+def _line(*texts):
+    return Line(words=[Word(text, 1.0, BoundingBox(0, 0, 1, 1)) for text in texts], y_position=0)
+
+
+@pytest.fixture
+def parser(test_config):
+    return StatementParser(test_config, reference_year=2020)
+
+
+def test_transaction_line_is_parsed_in_one_pass(parser):
+    parser.add_lines([_line("02.01", "PAIEMENT", "CB", "-12,50"), _line("DATE", "LIBELLE", "MONTANT")], 0)
+
+    [transaction] = parser.finish()
+
+    assert transaction.date == date(2020, 1, 2)
+    assert transaction.description == "PAIEMENT CB"
+    assert transaction.amount == -12.5
+    assert transaction.raw_text == "02.01 PAIEMENT CB -12,50"
+
+
+def test_statement_period_spanning_new_year(parser):
+    # L'en-tête arrive après des transactions d'une page précédente : l'année est résolue à la fin
+    parser.add_lines([_line("28.12", "VIR", "100,00")], 1)
+    parser.add_lines([_line("Relevédu", "01.12.2023", "au", "31.01.2024"), _line("03.01", "CB", "-5,00")], 0)
+
+    transactions = parser.finish()
+
+    assert parser.resolve_period() == StatementPeriod(date(2023, 12, 1), date(2024, 1, 31))
+    assert [t.date for t in transactions] == [date(2024, 1, 3), date(2023, 12, 28)]
+
+
+def test_year_from_document_dates_and_invalid_dates_dropped(parser):
+    parser.add_lines([
+        _line("Éditéle", "01/03/2024"),
+        _line("SOLDE", "AU", "29/02/2024", "1200,00"),
+        _line("29.02", "CB", "-1,00"),
+        _line("31.02", "CB", "-1,00"),
+        _line("05.03.2023", "CB", "-2,00"),
+    ], 0)
+
+    assert [t.date for t in parser.finish()] == [date(2024, 2, 29), date(2023, 3, 5)]
+
+
+def test_reference_year_without_any_date(parser):
+    parser.add_lines([_line("02.01", "CB", "-1,00")], 0)
+
+    assert parser.finish()[0].date == date(2020, 1, 2)
+
+
+@pytest.mark.parametrize("text, amount", [
+    ("12,50", 12.5), ("-12.5", -12.5), ("1 234,56", 1234.56), ("1.234,56", 1234.56),
+    ("1,234.56", 1234.56), ("+5", 5.0), ("CB", None), ("1e5", None), ("nan", None), ("1.2.3", None),
+])
+def test_amounts_line_by_line_and_vectorized(text, amount):
+    assert parse_amount(text) == amount
+    parsed = parse_amounts(pd.Series([text]))[0]
+    assert (amount is None and np.isnan(parsed)) or parsed == amount
+
+
+def test_bulk_parse_matches_line_parse(test_config):
+    pages = [
+        [_line("Relevédu", "01.12.2023", "au", "31.01.2024"), _line("28.12", "VIR", "SALAIRE", "1 500,00")],
+        [_line("03.01", "CB", "-5,00"), _line("31.02", "CB", "-1,00"), _line("04.01.2022", "CHQ", "-7.5"),
+         _line("05.01", "TOTAL"), _line("06.01", "0,00")],
+    ]
+    line_parser = StatementParser(test_config, reference_year=2020)
+    bulk_parser = StatementParser(test_config, reference_year=2020)
+    for page_num in (1, 0):
+        line_parser.add_lines(pages[page_num], page_num)
+        bulk_parser.add_lines(pages[page_num], page_num)
+
+    extractor = TransactionExtractor(test_config)
+    validator = TransactionValidator(test_config)
+    frame = validator.validate_frame(bulk_parser.finish_frame())
+
+    assert extractor.from_dataframe(frame) == validator.validate_transactions(line_parser.finish())
+    assert list(frame['date'].dt.date) == [date(2023, 12, 28), date(2024, 1, 3), date(2022, 1, 4)]
+    assert list(frame['amount']) == [1500.0, -5.0, -7.5]
+    assert list(frame.columns) == ['page'] + FRAME_COLUMNS
+
+
+def test_bulk_parse_is_opt_in(test_config, monkeypatch):
+    monkeypatch.setattr('services.processor.parser.HAS_ARROW_STRINGS', True)
+    parser = StatementParser(test_config)
+    parser.add_lines([_line("02.01", "CB", "-1,00")] * 50, 0)
+
+    assert test_config.parser.bulk_min_lines == 0
+    assert not parser.is_bulk
+    test_config.parser.bulk_min_lines = 50
+    assert parser.is_bulk
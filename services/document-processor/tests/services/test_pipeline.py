@@ -0,0 +1,72 @@
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+
+from services.ocr.extractor import OcrExtractor
+from services.ocr.models import BoundingBox, Line, Word
+from services.processor.pipeline import StagePipeline
+from services.processor.processor import DocumentProcessor
+from services.tableau.extractor import TableauExtractor
+from services.tableau.models import TableBox
+from services.tableau.pdf_processor import PDFProcessor
+
+
+def test_stages_keep_order_and_count_items():
+    pipeline = StagePipeline(range(5), [("double", lambda x: x * 2), ("inc", lambda x: x + 1)])
+
+    assert list(pipeline) == [1, 3, 5, 7, 9]
+    stats = pipeline.stats_dict()
+    assert [stats[name]["items"] for name in ("source", "double", "inc")] == [5, 5, 5]
+    assert stats["double"]["max_queue_depth"] <= 1
+
+
+def test_next_item_is_produced_while_last_stage_works():
+    second_rendered = threading.Event()
+
+    def source():
+        yield 0
+        second_rendered.set()
+        yield 1
+
+    def last_stage(item):
+        # Sequential execution would never render item 1 before this returns
+        return second_rendered.wait(timeout=5) if item == 0 else True
+
+    assert list(StagePipeline(source(), [("detect", lambda x: x), ("ocr", last_stage)])) == [True, True]
+
+
+def test_stage_errors_reach_the_consumer():
+    def fail(item):
+        raise ValueError("detection failed")
+
+    with pytest.raises(ValueError, match="detection failed"):
+        list(StagePipeline(range(3), [("detect", fail)]))
+
+
+def test_pipeline_and_sequential_paths_give_the_same_transactions(test_config):
+    test_config.text_layer.enabled = False
+    test_config.document.page_window = 1
+    model_handler = Mock()
+    model_handler.detect_tables_batch.side_effect = lambda images: [[TableBox(0, 0, 5, 5)] for _ in images]
+    lines = [Line(words=[Word(text, 1.0, BoundingBox(0, 0, 1, 1)) for text in ('02.01', 'CB', '-12,50')],
+                  y_position=1)]
+    pages = [np.full((10, 10, 3), i, dtype=np.uint8) for i in range(3)]
+
+    results = []
+    for enabled in (False, True):
+        test_config.pipeline.enabled = enabled
+        ocr_extractor = OcrExtractor(ocr_model=Mock(), config=test_config)
+        ocr_extractor.extract_text_from_tables = lambda tables: [lines for _ in tables]
+        processor = DocumentProcessor(TableauExtractor(test_config, model_handler=model_handler),
+                                      ocr_extractor, test_config)
+        with patch.object(PDFProcessor, 'iter_images', return_value=iter(enumerate(pages))):
+            results.append(processor.process_document(Path('statement.pdf')))
+
+    sequential, pipelined = results
+    assert pipelined.error is None
+    assert pipelined.page_count == sequential.page_count == 3
+    assert pipelined.transactions == sequential.transactions
+    assert len(pipelined.transactions) == 3
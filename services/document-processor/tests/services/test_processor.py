@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+from unittest.mock import Mock
+
+from tests.conftest import write_text_pdf
+from tests.services.test_text_layer import FULL_PAGE, SCAN_OVERLAY, STATEMENT_PAGE
+from services.ocr.extractor import OcrExtractor
+from services.processor.parser import HAS_ARROW_STRINGS
+from services.processor.processor import DocumentProcessor
+from services.tableau.models import ProcessedTable, TableBox
+
+
+@pytest.fixture
+def tableau_extractor():
+    extractor = Mock()
+    extractor.iter_windows.return_value = iter([])
+    return extractor
+
+
+@pytest.fixture
+def processor(test_config, tableau_extractor):
+    # Sequential path, the staged pipeline is covered separately
+    test_config.pipeline.enabled = False
+    ocr_extractor = OcrExtractor(ocr_model=Mock(), config=test_config)
+    return DocumentProcessor(tableau_extractor, ocr_extractor, test_config)
+
+
+def test_text_layer_pages_skip_ocr(processor, tableau_extractor, tmp_path):
+    pdf_path = write_text_pdf(tmp_path / 'statement.pdf', [STATEMENT_PAGE])
+
+    result = processor.process_document(pdf_path)
+
+    assert result.error is None
+    assert result.page_count == 1
+    assert [(t.date.strftime('%d.%m'), t.amount) for t in result.transactions] == [
+        ('02.01', -42.5), ('05.01', 2500.0)
+    ]
+    tableau_extractor.iter_windows.assert_not_called()
+    processor.ocr_extractor.ocr_model.assert_not_called()
+    assert set(result.timings.stages) == {"text_layer", "layout", "extract_transactions"}
+    assert set(result.timings.pages) == {0}
+
+
+@pytest.mark.skipif(not HAS_ARROW_STRINGS, reason="bulk parsing needs pyarrow")
+def test_large_documents_are_parsed_in_bulk(processor, test_config, tmp_path):
+    test_config.parser.bulk_min_lines = 1
+    pdf_path = write_text_pdf(tmp_path / 'statement.pdf', [STATEMENT_PAGE])
+
+    result = processor.process_document(pdf_path)
+
+    assert [(t.date.strftime('%d.%m'), t.amount) for t in result.transactions] == [
+        ('02.01', -42.5), ('05.01', 2500.0)
+    ]
+
+
+def test_pages_without_text_fall_back_to_ocr(processor, tableau_extractor, tmp_path):
+    pdf_path = write_text_pdf(tmp_path / 'statement.pdf', [[], STATEMENT_PAGE, []])
+    processor.ocr_extractor.extract_text_from_tables = Mock(return_value=[[]])
+    image = np.zeros((5, 5, 3))
+    table = ProcessedTable(image=image, coordinates=TableBox(0, 0, 5, 5), page_number=2)
+    tableau_extractor.iter_windows.return_value = iter([[(0, image), (2, image)]])
+    tableau_extractor.detect_window.return_value = [[], [table]]
+
+    result = processor.process_document(pdf_path)
+
+    assert result.page_count == 3
+    tableau_extractor.iter_windows.assert_called_once_with(pdf_path, [0, 2])
+    processor.ocr_extractor.extract_text_from_tables.assert_called_once_with([table])
+    assert len(result.transactions) == 2
+
+    # Temps des pages rendues partagés entre elles, l'OCR attribué à la page du tableau
+    timings = result.timings.to_dict()
+    pages = {page['page']: page for page in timings['pages']}
+    assert set(pages) == {0, 1, 2}
+    assert {"rasterize", "detect_tables"} <= set(pages[0]) and "ocr" not in pages[0]
+    assert pages[2]['ocr'] == timings['stages']['ocr']
+    assert "layout" in pages[1] and "rasterize" not in pages[1]
+    assert timings['cpu_time'] > 0
+
+
+
+def test_scanned_page_with_text_overlay_is_ocrd(processor, tableau_extractor, tmp_path):
+    pdf_path = write_text_pdf(tmp_path / 'statement.pdf', [SCAN_OVERLAY], images={0: FULL_PAGE})
+    processor.ocr_extractor.extract_text_from_tables = Mock(return_value=[[]])
+    image = np.zeros((5, 5, 3))
+    table = ProcessedTable(image=image, coordinates=TableBox(0, 0, 5, 5), page_number=0)
+    tableau_extractor.iter_windows.return_value = iter([[(0, image)]])
+    tableau_extractor.detect_window.return_value = [[table]]
+
+    result = processor.process_document(pdf_path)
+
+    assert result.page_count == 1
+    tableau_extractor.iter_windows.assert_called_once_with(pdf_path, [0])
+    processor.ocr_extractor.extract_text_from_tables.assert_called_once_with([table])
+
+def test_text_layer_can_be_disabled(processor, tableau_extractor, test_config, tmp_path):
+    test_config.text_layer.enabled = False
+    pdf_path = write_text_pdf(tmp_path / 'statement.pdf', [STATEMENT_PAGE])
+
+    result = processor.process_document(pdf_path)
+
+    tableau_extractor.iter_windows.assert_called_once_with(pdf_path, None)
+    assert result.transactions == []
+
+
+def test_page_shard_only_processes_its_pages(processor, tableau_extractor, tmp_path):
+    pdf_path = write_text_pdf(tmp_path / 'statement.pdf', [STATEMENT_PAGE, [], STATEMENT_PAGE])
+
+    result = processor.process_document(pdf_path, pages=range(1, 3))
+
+    assert result.page_count == 2
+    tableau_extractor.iter_windows.assert_called_once_with(pdf_path, [1])
+    assert len(result.transactions) == 2
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_rendering_failure_fails_the_document(processor, tableau_extractor, test_config, tmp_path, pipelined):
+    test_config.pipeline.enabled = pipelined
+    pdf_path = write_text_pdf(tmp_path / 'statement.pdf', [[], []])
+    image = np.zeros((5, 5, 3))
+
+    def windows(pdf_path, pages):
+        yield [(0, image)]
+        raise RuntimeError("render failed")
+
+    tableau_extractor.iter_windows.side_effect = windows
+    tableau_extractor.detect_window.return_value = [[]]
+
+    result = processor.process_document(pdf_path)
+
+    assert result.error == "render failed"
+    assert result.transactions == []
@@ -0,0 +1,143 @@
+import threading
+from itertools import islice
+
+import numpy as np
+import pypdfium2 as pdfium
+import pytest
+from unittest.mock import patch
+
+from services.tableau.pdf_processor import PDFProcessor
+from services.tableau.rasterizer import (
+    PdfiumRasterizer,
+    PopplerRasterizer,
+    _get_executor,
+    _pdfium_lock,
+    create_rasterizer,
+)
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    """Blank 3-page A4 PDF"""
+    pdf = pdfium.PdfDocument.new()
+    for _ in range(3):
+        pdf.new_page(595, 842)
+    path = tmp_path / 'statement.pdf'
+    pdf.save(str(path))
+    pdf.close()
+    return path
+
+
+def test_create_rasterizer_selects_backend(test_config):
+    test_config.rasterizer.backend = 'pdfium'
+    assert isinstance(create_rasterizer(test_config.rasterizer), PdfiumRasterizer)
+
+    test_config.rasterizer.backend = 'poppler'
+    assert isinstance(create_rasterizer(test_config.rasterizer), PopplerRasterizer)
+
+    test_config.rasterizer.backend = 'unknown'
+    with pytest.raises(ValueError):
+        create_rasterizer(test_config.rasterizer)
+
+
+def test_pdfium_renders_bgr_pages_at_dpi(test_config, pdf_path):
+    test_config.rasterizer.dpi = 72
+    rasterizer = PdfiumRasterizer(test_config.rasterizer)
+
+    images = rasterizer.render_pages(pdf_path, 1, 3)
+
+    assert rasterizer.page_count(pdf_path) == 3
+    assert len(images) == 3
+    assert images[0].shape == (842, 595, 3)
+    assert images[0].dtype == np.uint8
+    assert (images[0] == 255).all()
+
+
+def test_pdfium_grayscale_keeps_three_channels(test_config, pdf_path):
+    test_config.rasterizer.dpi = 36
+    test_config.rasterizer.grayscale = True
+
+    images = PdfiumRasterizer(test_config.rasterizer).render_pages(pdf_path, 2, 2)
+
+    assert images[0].ndim == 3 and images[0].shape[2] == 3
+
+
+def test_parallel_rendering_keeps_page_order(test_config):
+    test_config.rasterizer.workers = 2
+    pages = {page: np.full((2, 2, 3), page, dtype=np.uint8) for page in range(1, 6)}
+
+    with patch('services.tableau.rasterizer.convert_from_path',
+               side_effect=lambda path, dpi, first_page, last_page, grayscale:
+               [pages[page] for page in range(first_page, last_page + 1)]):
+        images = PopplerRasterizer(test_config.rasterizer).render_pages('statement.pdf', 1, 5)
+
+    assert [int(image[0, 0, 0]) for image in images] == [1, 2, 3, 4, 5]
+
+
+def test_pdfium_parallel_rendering(test_config, pdf_path):
+    test_config.rasterizer.dpi = 36
+    test_config.rasterizer.workers = 2
+
+    images = PdfiumRasterizer(test_config.rasterizer).render_pages(pdf_path, 1, 3)
+
+    assert len(images) == 3
+
+
+def test_iter_images_renders_page_ranges(test_config):
+    processor = PDFProcessor(test_config)
+
+    with patch.object(processor.rasterizer, 'page_count', return_value=5), \
+            patch.object(processor.rasterizer, 'render_pages',
+                         side_effect=lambda path, first, last: [np.zeros((2, 2, 3))] * (last - first + 1)) as render:
+        images = list(processor.iter_images('statement.pdf', window=2))
+
+    assert [page_num for page_num, _ in images] == [0, 1, 2, 3, 4]
+    assert [call.args[1:] for call in render.call_args_list] == [(1, 2), (3, 4), (5, 5)]
+
+
+def test_iter_images_renders_selected_pages(test_config):
+    processor = PDFProcessor(test_config)
+
+    with patch.object(processor.rasterizer, 'render_pages',
+                      side_effect=lambda path, first, last: [np.zeros((2, 2, 3))] * (last - first + 1)) as render:
+        images = list(processor.iter_images('statement.pdf', window=3, pages=[0, 2, 3, 4, 7]))
+
+    assert [page_num for page_num, _ in images] == [0, 2, 3, 4, 7]
+    assert [call.args[1:] for call in render.call_args_list] == [(1, 1), (3, 4), (5, 5), (8, 8)]
+
+
+def test_iter_images_raises_when_a_window_fails(test_config):
+    processor = PDFProcessor(test_config)
+
+    def render(path, first, last):
+        if first > 2:
+            raise RuntimeError("render failed")
+        return [np.zeros((2, 2, 3))] * (last - first + 1)
+
+    with patch.object(processor.rasterizer, 'page_count', return_value=4), \
+            patch.object(processor.rasterizer, 'render_pages', side_effect=render):
+        images = processor.iter_images('statement.pdf', window=2)
+        assert [page_num for page_num, _ in islice(images, 2)] == [0, 1]
+        with pytest.raises(RuntimeError):
+            next(images)
+
+
+def test_render_processes_are_spawned_not_forked():
+    # Les workers de jobs ont des threads : un fork pourrait copier un verrou tenu
+    executor = _get_executor("process", 3)
+
+    assert executor._mp_context.get_start_method() == "spawn"
+
+
+def test_pdfium_page_count_waits_for_other_pdfium_calls(test_config, pdf_path):
+    # Appelé par le processus de l'API depuis plusieurs threads, pdfium n'étant pas thread-safe
+    counts = []
+    with _pdfium_lock:
+        thread = threading.Thread(target=lambda: counts.append(PdfiumRasterizer(test_config.rasterizer)
+                                                                .page_count(pdf_path)))
+        thread.start()
+        thread.join(timeout=0.2)
+        assert thread.is_alive() and counts == []
+    thread.join(timeout=5)
+
+    assert counts == [3]
@@ -0,0 +1,56 @@
+import gc
+
+import numpy as np
+import pypdfium2 as pdfium
+import pytest
+
+from services.tableau.rasterizer import PdfiumRasterizer
+from services.tableau.shared_pages import PageDescriptor, SharedPagePool
+
+
+@pytest.fixture
+def page_pool():
+    pool = SharedPagePool(slot_count=2, slot_bytes=1024)
+    yield pool
+    gc.collect()
+    pool.close()
+
+
+def test_slot_is_released_with_its_last_view(page_pool):
+    slots = page_pool.acquire(2)
+    descriptor = PageDescriptor(slot=slots[0], shape=(4, 4, 3), dtype='|u1', page_number=1)
+    image = page_pool.view(descriptor)
+    image[:] = 7
+    crop = image[1:3, 1:3]
+
+    del image
+    gc.collect()
+    assert page_pool.acquire(1, timeout=0) is None
+
+    assert crop.sum() == 7 * 12
+    del crop
+    gc.collect()
+    assert page_pool.acquire(1, timeout=0) == [slots[0]]
+
+
+def test_acquire_more_slots_than_the_pool_fails(page_pool):
+    assert page_pool.acquire(3) is None
+
+
+def test_process_rendering_through_shared_memory_matches_pickling(test_config, tmp_path):
+    pdf = pdfium.PdfDocument.new()
+    for size in (300, 400, 500):
+        pdf.new_page(size, size)
+    pdf_path = tmp_path / 'pages.pdf'
+    pdf.save(str(pdf_path))
+    pdf.close()
+    test_config.rasterizer.workers = 2
+
+    test_config.rasterizer.shared_memory = False
+    pickled = PdfiumRasterizer(test_config.rasterizer).render_pages(pdf_path, 1, 3)
+    test_config.rasterizer.shared_memory = True
+    shared = PdfiumRasterizer(test_config.rasterizer).render_pages(pdf_path, 1, 3)
+
+    assert [image.shape for image in shared] == [image.shape for image in pickled]
+    assert all(np.array_equal(a, b) for a, b in zip(shared, pickled))
+    assert not shared[0].flags.owndata
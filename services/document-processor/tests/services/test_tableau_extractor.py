@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+
+from services.cache import PageCache
+from services.tableau.extractor import TableauExtractor
+from services.tableau.models import TableBox
+from services.tableau.pdf_processor import PDFProcessor
+
+
+@pytest.fixture
+def model_handler():
+    handler = Mock()
+    handler.detect_tables_batch.side_effect = lambda images: [[TableBox(0, 0, 5, 5)] for _ in images]
+    return handler
+
+
+def _pages(count):
+    return [np.full((10, 10, 3), i, dtype=np.uint8) for i in range(count)]
+
+
+def test_iter_document_yields_windows(test_config, model_handler):
+    test_config.document.page_window = 2
+    extractor = TableauExtractor(test_config, model_handler=model_handler)
+
+    with patch.object(PDFProcessor, 'iter_images', return_value=iter(enumerate(_pages(5)))) as iter_images:
+        windows = list(extractor.iter_document('statement.pdf'))
+
+    iter_images.assert_called_once_with('statement.pdf', window=2, pages=None)
+    assert [len(window) for window in windows] == [2, 2, 1]
+    assert [len(call.args[0]) for call in model_handler.detect_tables_batch.call_args_list] == [2, 2, 1]
+    page_numbers = [tables[0].page_number for window in windows for tables in window]
+    assert page_numbers == [0, 1, 2, 3, 4]
+
+
+def test_iter_document_renders_pages_lazily(test_config, model_handler):
+    test_config.document.page_window = 1
+    extractor = TableauExtractor(test_config, model_handler=model_handler)
+    rendered = []
+
+    def render(*args, **kwargs):
+        for page_num, page in enumerate(_pages(3)):
+            rendered.append(page_num)
+            yield page_num, page
+
+    with patch.object(PDFProcessor, 'iter_images', side_effect=render):
+        windows = extractor.iter_document('statement.pdf')
+        next(windows)
+        assert rendered == [0]
+        next(windows)
+        assert rendered == [0, 1]
+
+
+def test_process_document_returns_tables_per_page(test_config, model_handler):
+    extractor = TableauExtractor(test_config, model_handler=model_handler)
+
+    with patch.object(PDFProcessor, 'iter_images', return_value=iter(enumerate(_pages(3)))):
+        tables = extractor.process_document('statement.pdf')
+
+    assert len(tables) == 3
+
+
+def test_iter_document_reuses_cached_detections(test_config, model_handler):
+    extractor = TableauExtractor(test_config, model_handler=model_handler, page_cache=PageCache(test_config))
+
+    for _ in range(2):
+        with patch.object(PDFProcessor, 'iter_images', return_value=iter(enumerate(_pages(3)))):
+            windows = list(extractor.iter_document('statement.pdf'))
+
+    assert model_handler.detect_tables_batch.call_count == 1
+    tables = [table for window in windows for page in window for table in page]
+    assert [table.coordinates for table in tables] == [TableBox(0, 0, 5, 5)] * 3
+    assert all(table.page_hash for table in tables)
+
+
+def test_failed_detection_is_not_cached(test_config, model_handler):
+    page_cache = PageCache(test_config)
+    extractor = TableauExtractor(test_config, model_handler=model_handler, page_cache=page_cache)
+    model_handler.detect_tables_batch.side_effect = RuntimeError("CUDA out of memory")
+
+    with patch.object(PDFProcessor, 'iter_images', return_value=iter(enumerate(_pages(2)))):
+        with pytest.raises(RuntimeError):
+            list(extractor.iter_document('statement.pdf'))
+
+    assert all(page_cache.get_detections(page_cache.page_hash(page)) is None for page in _pages(2))
@@ -0,0 +1,55 @@
+from tests.conftest import write_text_pdf
+from services.ocr.text_layer import TextLayerExtractor
+
+STATEMENT_PAGE = [
+    (40, 100, "DATE"), (150, 100, "LIBELLE"), (400, 100, "DEBIT"), (480, 100, "CREDIT"),
+    (40, 130, "02.01"), (150, 130, "PAIEMENT CB CARREFOUR"), (400, 130, "42,50"),
+    (40, 150, "05.01"), (150, 150, "VIREMENT SALAIRE"), (480, 150, "2500,00"),
+]
+# Texte ajouté par-dessus un scan : en-tête de la banque et numéro de page
+SCAN_OVERLAY = [(40, 30, "BANQUE EXEMPLE - Releve de compte"), (500, 820, "Page 1/2")]
+FULL_PAGE = (0, 0, 595, 842)
+
+
+def test_extract_document_reads_words_in_pixels(test_config, tmp_path):
+    pdf_path = write_text_pdf(tmp_path / 'statement.pdf', [STATEMENT_PAGE, []])
+
+    pages = TextLayerExtractor(test_config).extract_document(pdf_path)
+
+    assert len(pages) == 2
+    assert pages[1] is None
+    scale = test_config.rasterizer.dpi / 72
+    assert pages[0].box == [0, 0, int(595 * scale), int(842 * scale)]
+
+    words = {word.text: word for word in pages[0].words}
+    assert {"PAIEMENT", "CB", "CARREFOUR", "42,50"} <= set(words)
+    debit = words["DEBIT"].bbox
+    assert abs(debit.x1 - 400 * scale) < 3
+    assert debit.y1 < 100 * scale < debit.y2
+
+
+def test_pages_below_min_chars_need_ocr(test_config, tmp_path):
+    test_config.text_layer.min_chars = 1000
+    pdf_path = write_text_pdf(tmp_path / 'statement.pdf', [STATEMENT_PAGE])
+
+    assert TextLayerExtractor(test_config).extract_document(pdf_path) == [None]
+
+
+def test_scanned_page_with_text_overlay_needs_ocr(test_config, tmp_path):
+    pdf_path = write_text_pdf(tmp_path / 'statement.pdf', [SCAN_OVERLAY, SCAN_OVERLAY + STATEMENT_PAGE],
+                              images={0: FULL_PAGE, 1: FULL_PAGE})
+
+    pages = TextLayerExtractor(test_config).extract_document(pdf_path)
+
+    # Scan avec un simple en-tête : OCR ; scan avec les lignes du relevé en texte (PDF cherchable) : texte
+    assert pages[0] is None
+    assert "CARREFOUR" in {word.text for word in pages[1].words}
+
+
+def test_small_images_do_not_make_a_scan(test_config, tmp_path):
+    # Logo de la banque sur une page native sans transaction (conditions générales...)
+    pdf_path = write_text_pdf(tmp_path / 'statement.pdf', [SCAN_OVERLAY], images={0: (40, 40, 80, 40)})
+
+    [page] = TextLayerExtractor(test_config).extract_document(pdf_path)
+
+    assert page is not None
@@ -16,6 +16,8 @@ class DocumentProcessingResult(BaseModel):
     processing_time: float
     transactions: List[Dict]
     error: Optional[str] = None
+    # Temps par étage et par page, temps CPU et pic mémoire, tels que renvoyés par le document processor
+    timings: Optional[Dict] = None
 
 class TransactionAnalysisResult(BaseModel):
     processing_time: float
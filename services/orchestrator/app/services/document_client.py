@@ -48,13 +48,15 @@ class DocumentProcessorClient:
                 response.raise_for_status()
 
             result = response.json()
-            log.info(f"Document processed successfully: {result}")
+            log.info("Document processed successfully: {} transactions", len(result.get('transactions', [])))
+            log.debug("Document processor response: {}", result)
             
             return DocumentProcessingResult(
                 page_count=result.get('page_count', 0),
                 processing_time=result.get('processing_time', 0.0),
                 transactions=result.get('transactions', []),
-                error=result.get('error')
+                error=result.get('error'),
+                timings=result.get('timings')
             )
 
         except httpx.HTTPError as e:
@@ -46,7 +46,7 @@ class TransactionAnalyzerClient:
                 "transactions": transactions,
                 "preferences": None
             }
-            log.debug(f"Payload: {payload}")
+            log.debug("Payload: {}", payload)
 
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 response = await client.post(endpoint, json=payload)